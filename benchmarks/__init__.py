@@ -0,0 +1,2 @@
+# Benchmarks package for Wind Tunnel Controller
+# Run headlessly with: python -m benchmarks
@@ -0,0 +1,487 @@
+"""
+Wind Tunnel Benchmark Suite
+Headless throughput and allocation benchmarks for the hot paths
+Results are saved as JSON and compared against a stored baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from logic.simulator import WindTunnelSimulator
+from logic.acquisition import AcquisitionLoop, SampleBlock
+from logic.controller import AirspeedHold
+from logic.alarms import AlarmEngine, ThresholdRule, build_default_rules
+from logic.statistics import ChannelStatistics
+from logic.spectrum import SpectrumAnalyzer
+from logic.calibration import CalibrationStage, SensorCalibration
+from logic.derived import DerivedChannelGraph, build_default_channels
+from logic.capture import TriggeredCapture, EdgeTrigger
+from logic.alignment import TimeAligner, HOLD
+from logic.telemetry import TelemetryBus, DROP_NEWEST
+from logic.blockstore import BlockStoreWriter, BlockStoreReader
+from gui.geometry import progress_arc_points, band_arc_points, cached_progress_arc_points
+from gui.particles import ParticleField
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Radii (pixels) the gauge geometry is timed at
+GAUGE_RADII = (50, 100, 200, 400)
+
+# Registered benchmark cases: (name, unit, setup) where setup() returns
+# a zero-argument callable performing one operation ("tick")
+BENCHMARKS = []
+
+
+def benchmark(name, unit='ops'):
+    """Register a benchmark case"""
+    def register(setup):
+        BENCHMARKS.append((name, unit, setup))
+        return setup
+    return register
+
+
+def quiet_simulator():
+    """Create a running simulator without the console chatter"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulator = WindTunnelSimulator()
+        simulator.start_simulation()
+    return simulator
+
+
+# --- Simulator cases -------------------------------------------------------
+
+@benchmark('simulator.get_all_data', unit='samples')
+def bench_get_all_data():
+    return quiet_simulator().get_all_data
+
+
+@benchmark('simulator.get_all_data.stopped', unit='samples')
+def bench_get_all_data_stopped():
+    simulator = quiet_simulator()
+    simulator.is_running = False
+    return simulator.get_all_data
+
+
+@benchmark('acquisition.tick.airspeed_hold', unit='samples')
+def bench_acquisition_tick():
+    simulator = quiet_simulator()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loop = AcquisitionLoop(simulator, rate_hz=100.0)
+        hold = AirspeedHold(simulator, rate_hz=100.0)
+        hold.engage(30, unit='mph')
+    loop.add_task(hold.update, hold.rate_hz)
+    clock = [0.0]
+
+    def tick():
+        clock[0] += loop.period
+        loop.tick(clock[0])
+    return tick
+
+
+@benchmark('acquisition.tick.calibrated', unit='samples')
+def bench_acquisition_tick_calibrated():
+    # As above with three calibrated channels: blocks are corrected in one
+    # vectorized pass, the latest sample only when the hold task reads it
+    simulator = quiet_simulator()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loop = AcquisitionLoop(simulator, rate_hz=100.0)
+        hold = AirspeedHold(simulator, rate_hz=50.0)
+        hold.engage(30, unit='mph')
+    loop.set_calibration(calibration_stage())
+    loop.add_task(hold.update, hold.rate_hz)
+    clock = [0.0]
+
+    def tick():
+        clock[0] += loop.period
+        loop.tick(clock[0])
+    return tick
+
+
+def simulator_block(block_size=10):
+    """One SampleBlock of live simulator data"""
+    simulator = quiet_simulator()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loop = AcquisitionLoop(simulator, rate_hz=100.0, block_size=block_size)
+    blocks = []
+    loop.add_block_processor(blocks.append)
+    for i in range(loop.block_size):
+        loop.tick(i * loop.period)
+    return blocks[0]
+
+
+@benchmark('alarms.process_block.12_rules', unit='blocks')
+def bench_alarm_engine():
+    # A dozen threshold rules over 10-sample blocks of live simulator data
+    rules = build_default_rules()
+    while len(rules) < 12:
+        rules.append(ThresholdRule(f'lift_{len(rules)}', 'lift_force', high=8.0,
+                                   hysteresis=0.2, on_delay=0.5))
+    engine = AlarmEngine(rules)
+    engine.listeners = []
+    block = simulator_block()
+    return lambda: engine.process_block(block)
+
+
+@benchmark('statistics.process_block', unit='blocks')
+def bench_statistics():
+    statistics = ChannelStatistics(rate_hz=100.0, window_seconds=10.0)
+    block = simulator_block()
+    return lambda: statistics.process_block(block)
+
+
+@benchmark('spectrum.process_block.hop', unit='hops')
+def bench_spectrum():
+    # One block per hop, so every call runs the windowed FFT
+    analyzer = SpectrumAnalyzer(rate_hz=100.0, segment=256, overlap=0.5)
+    block = simulator_block(block_size=analyzer.hop)
+    return lambda: analyzer.process_block(block)
+
+
+@benchmark('telemetry.publish.4_subscribers', unit='blocks')
+def bench_telemetry_publish():
+    # Inline, decimated and channel-subset subscribers; queues stay full
+    bus = TelemetryBus()
+    bus.subscribe('inline', callback=lambda block: None)
+    bus.subscribe('display', channels=('airspeed_mph', 'lift_force'), decimation=10, maxsize=1)
+    bus.subscribe('stream', decimation=2, maxsize=4)
+    bus.subscribe('logger', channels=('timestamp', 'lift_force', 'drag_force'),
+                  maxsize=4, policy=DROP_NEWEST)
+    block = simulator_block()
+    return lambda: bus.publish(block)
+
+
+@benchmark('derived.evaluate.2_subscribed', unit='samples')
+def bench_derived_evaluate():
+    # Fresh timestamp per call so the memo never short-circuits
+    graph = DerivedChannelGraph(build_default_channels())
+    graph.subscribe('lift_coefficient', 'lift_drag_ratio')
+    sample = dict(quiet_simulator().get_all_data())
+    counter = iter(range(1 << 62))
+
+    def tick():
+        sample['timestamp'] = next(counter)
+        graph.evaluate(sample)
+    return tick
+
+
+@benchmark('derived.evaluate_block.all', unit='blocks')
+def bench_derived_block():
+    graph = DerivedChannelGraph(build_default_channels())
+    names = list(graph.channels)
+    block = simulator_block()
+    return lambda: graph.evaluate_block(block, names)
+
+
+def calibration_stage():
+    """One calibration of each curve type, pressure temperature-compensated"""
+    return CalibrationStage([
+        SensorCalibration('lift_force', 'polynomial', coefficients=[0.001, 1.02, 0.05]),
+        SensorCalibration('drag_force', 'piecewise', raw=[0, 5, 10], value=[0, 5.1, 10.3]),
+        SensorCalibration('pressure_dynamic', 'linear', offset=0.4, span=1.001,
+                          temperature_channel='air_temperature', zero_tempco=0.02,
+                          span_tempco=1e-4),
+    ])
+
+
+@benchmark('calibration.apply_sample.3_channels', unit='samples')
+def bench_calibration_sample():
+    stage = calibration_stage()
+    sample = dict(quiet_simulator().get_all_data())
+    return lambda: stage.apply_sample(dict(sample))
+
+
+@benchmark('calibration.apply_block.3_channels', unit='blocks')
+def bench_calibration_block():
+    # Calibrated in place, so each call works on a fresh copy of the raw block
+    stage = calibration_stage()
+    block = simulator_block()
+    return lambda: stage.apply_block(SampleBlock(block.channels, block.index, block.data.copy()))
+
+
+@benchmark('capture.process_block.armed', unit='blocks')
+def bench_capture_armed():
+    # Pre-trigger ring fill plus an edge search that never fires
+    capture = TriggeredCapture(tempfile.mkdtemp(), rate_hz=100.0)
+    capture.arm(EdgeTrigger('angle_of_attack', 90.0))
+    block = simulator_block()
+    return lambda: capture.process_block(block)
+
+
+def multirate_aligner():
+    """Aligner fed like the simulated pressure, balance and tachometer sensors"""
+    aligner = TimeAligner(rate_hz=100.0)
+    aligner.add_stream('pressure', ('pressure_static', 'pressure_dynamic',
+                                    'airspeed_mph', 'airspeed_ms'))
+    aligner.add_stream('balance', ('lift_force', 'drag_force', 'angle_of_attack'))
+    aligner.add_stream('tachometer', ('fan_output',), method=HOLD)
+    state = {'time': 0.0}
+
+    def feed(seconds):
+        # 50 Hz pressure, 200 Hz balance, 10 Hz tachometer
+        start = state['time']
+        for name, rate, width in (('pressure', 50, 4), ('balance', 200, 3), ('tachometer', 10, 1)):
+            for t in np.arange(np.ceil(start * rate), np.ceil((start + seconds) * rate)) / rate:
+                aligner.push(name, t, [t] * width)
+        state['time'] = start + seconds
+        return state['time']
+    return aligner, feed
+
+
+@benchmark('alignment.align.100ms', unit='blocks')
+def bench_alignment_block():
+    # Ten grid points per call, as for a block, after 100 ms of sensor data
+    aligner, feed = multirate_aligner()
+
+    def align():
+        aligner.align(feed(0.1), max_points=20)
+    return align
+
+
+@benchmark('alignment.resample.1_point', unit='samples')
+def bench_alignment_point():
+    # One grid point, as AlignedSource takes per acquisition tick
+    aligner, feed = multirate_aligner()
+    feed(0.5)
+    times = np.array([0.25])
+    return lambda: aligner.resample(times)
+
+
+def simulator_rows(count, rate_hz=100.0):
+    """count rows of simulator data with evenly spaced timestamps"""
+    simulator = quiet_simulator()
+    channels = [name for name, value in simulator.get_all_data().items()
+                if isinstance(value, (int, float))]
+    samples = (simulator.get_all_data() for _ in range(count))
+    rows = np.array([[sample[name] for name in channels] for sample in samples],
+                    dtype=np.float64)
+    rows[:, channels.index('timestamp')] = np.arange(count) / rate_hz
+    return channels, rows
+
+
+@benchmark('blockstore.write_block.1024', unit='blocks')
+def bench_blockstore_write():
+    channels, rows = simulator_rows(1024)
+    path = os.path.join(tempfile.mkdtemp(), 'bench.wtb')
+    writer = BlockStoreWriter(path, channels, block_rows=1024)
+    return lambda: writer.write(rows)
+
+
+@benchmark('blockstore.read_range.2s', unit='seeks')
+def bench_blockstore_seek():
+    channels, rows = simulator_rows(20480)
+    path = os.path.join(tempfile.mkdtemp(), 'bench.wtb')
+    writer = BlockStoreWriter(path, channels, block_rows=1024)
+    writer.write(rows)
+    writer.close()
+    reader = BlockStoreReader(path)
+    return lambda: reader.read_range(100.0, 102.0)
+
+
+# --- Gauge geometry cases --------------------------------------------------
+
+def _register_gauge_cases():
+    """One case per radius for each gauge's arc-point generation"""
+    for radius in GAUGE_RADII:
+        def circular_setup(radius=radius):
+            # Full-scale value is the worst case: one segment per degree
+            return lambda: progress_arc_points(400, 240, radius * 0.9, 1.0)
+
+        def speed_setup(radius=radius):
+            def bands():
+                band_arc_points(400, 240, radius, 180, 0, 59)
+                band_arc_points(400, 240, radius, 180, 59, 120)
+                band_arc_points(400, 240, radius, 180, 120, 180)
+            return bands
+
+        def mini_setup(radius=radius):
+            # Overview mini gauges share one unit-circle table
+            return lambda: cached_progress_arc_points(400, 240, radius * 0.9, 1.0)
+
+        benchmark(f'gauge.circular.arc.r{radius}', unit='arcs')(circular_setup)
+        benchmark(f'gauge.mini.cached_arc.r{radius}', unit='arcs')(mini_setup)
+        benchmark(f'gauge.speed.bands.r{radius}', unit='frames')(speed_setup)
+
+
+_register_gauge_cases()
+
+
+@benchmark('flow.step.4000_particles', unit='frames')
+def bench_flow_step():
+    # Dial-sized field at full capacity; the Mesh upload itself needs a GL context
+    field = ParticleField(4000)
+    field.resize(240, 300, 96, origin=(120, 150))
+    return lambda: field.step(1 / 30, 300.0, math.radians(8))
+
+
+# --- Harness ---------------------------------------------------------------
+
+def time_operation(operation, min_time=0.2, repeats=5):
+    """Return the best observed operations per second over several repeats"""
+    # Calibrate the loop count so each repeat runs for about min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 4 or loops >= 1 << 24:
+            break
+        loops *= 4
+    loops = max(1, int(loops * (min_time / max(elapsed, 1e-9))))
+
+    best = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        elapsed = time.perf_counter() - start
+        best = max(best, loops / max(elapsed, 1e-12))
+    return best
+
+
+def measure_allocations(operation, ticks=200):
+    """Average peak bytes allocated and net blocks retained per tick"""
+    operation()  # warm caches outside the measurement
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        blocks_before = sys.getallocatedblocks()
+        for _ in range(ticks):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - current
+        blocks_after = sys.getallocatedblocks()
+    finally:
+        tracemalloc.stop()
+    return peak_total / ticks, (blocks_after - blocks_before) / ticks
+
+
+def run_suite(name_filter=None, min_time=0.2, repeats=5):
+    """Run all registered benchmarks and return the results dict"""
+    results = {}
+    for name, unit, setup in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        operation = setup()
+        ops_per_sec = time_operation(operation, min_time, repeats)
+        alloc_bytes, alloc_blocks = measure_allocations(operation)
+        results[name] = {
+            'unit': unit,
+            'ops_per_sec': ops_per_sec,
+            'mean_us': 1e6 / ops_per_sec if ops_per_sec else 0.0,
+            'alloc_bytes_per_tick': alloc_bytes,
+            'retained_blocks_per_tick': alloc_blocks,
+        }
+        print(f"{name:<40} {ops_per_sec:>14,.0f} {unit}/s "
+              f"{1e6 / ops_per_sec:>10.2f} us  {alloc_bytes:>9.0f} B/tick")
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=0.15, alloc_threshold=0.25):
+    """
+    Compare results against a baseline
+
+    Returns a list of human-readable regression descriptions. Throughput
+    may drop by `threshold` and per-tick allocations may grow by
+    `alloc_threshold` (fractions) before a case counts as regressed.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+
+        floor = reference['ops_per_sec'] * (1 - threshold)
+        if result['ops_per_sec'] < floor:
+            change = 1 - result['ops_per_sec'] / reference['ops_per_sec']
+            regressions.append(f"{name}: throughput down {change:.0%} "
+                               f"({result['ops_per_sec']:,.0f} vs "
+                               f"{reference['ops_per_sec']:,.0f} {result['unit']}/s)")
+
+        # Small absolute slack so near-zero allocation cases don't flap
+        ceiling = reference['alloc_bytes_per_tick'] * (1 + alloc_threshold) + 64
+        if result['alloc_bytes_per_tick'] > ceiling:
+            regressions.append(f"{name}: allocations up "
+                               f"({result['alloc_bytes_per_tick']:.0f} vs "
+                               f"{reference['alloc_bytes_per_tick']:.0f} B/tick)")
+    return regressions
+
+
+def environment_info():
+    """Describe the machine the results were taken on"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main(argv=None):
+    """Command line entry point, returns the process exit code"""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Wind tunnel simulator and gauge geometry benchmarks')
+    parser.add_argument('--output', help='write results JSON to this path')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='allowed throughput drop as a fraction (default 0.15)')
+    parser.add_argument('--alloc-threshold', type=float, default=0.25,
+                        help='allowed allocation growth as a fraction (default 0.25)')
+    parser.add_argument('--filter', help='only run cases whose name contains this')
+    parser.add_argument('--quick', action='store_true',
+                        help='shorter timing runs for a fast smoke check')
+    args = parser.parse_args(argv)
+
+    print("Wind Tunnel Benchmarks")
+    print("=" * 60)
+    if args.quick:
+        results = run_suite(args.filter, min_time=0.05, repeats=2)
+    else:
+        results = run_suite(args.filter)
+    report = {'environment': environment_info(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found - run with --save-baseline on the target device")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline.get('results', {}),
+                                      args.threshold, args.alloc_threshold)
+    print("=" * 60)
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {args.baseline}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print(f"No regressions against {args.baseline}")
+    return 0
@@ -13,15 +13,88 @@ from kivymd.uix.card import MDCard
 from kivymd.uix.toolbar import MDTopAppBar
 from kivymd.uix.progressbar import MDProgressBar
 from kivymd.uix.chip import MDChip
+from kivymd.uix.dialog import MDDialog
+from kivymd.toast import toast
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Line, Ellipse, Rectangle, PushMatrix, PopMatrix, Rotate
+from kivy.uix.floatlayout import FloatLayout
+from kivy.graphics import (Color, Line, Ellipse, Rectangle, PushMatrix, PopMatrix, Rotate,
+                           Fbo, ClearColor, ClearBuffers)
 from kivy.core.text import Label as CoreLabel
-from kivy.metrics import dp
+from kivy.metrics import dp, sp
 from kivy.clock import Clock
 from kivy.app import App
 import math
+import os
+import time
 
-class MaterialCircularGauge(Widget):
+from logic.recorder import RunReader, list_runs
+from logic.eventlog import get_logger, fields
+from logic.capture import AlarmTrigger, EdgeTrigger, StepTrigger
+from gui.readout import NumericReadout
+from gui.spectrum import SpectrumView
+from gui.flow import FlowOverlay
+from gui.layout import LayoutSource, ConstructionTimer
+from gui.dialogs import open_text_dialog, reopen_dialog
+from gui.geometry import progress_arc_points, band_arc_points
+
+log = get_logger('dashboard')
+
+class CachedGaugeWidget(Widget):
+    """
+    Base for gauges whose static layers are cached in an Fbo texture
+    The background artwork is rendered once and only re-rendered when the
+    size changes; moving the widget just moves the textured quad. Each
+    frame then only touches the dynamic instructions (arc, needle).
+    """
+    
+    # Extra space around the widget so artwork drawn slightly outside
+    # its bounds (e.g. titles above the dial) is not clipped
+    static_margin = dp(32)
+    
+    def init_layers(self):
+        """Create the cached static quad followed by the dynamic layer"""
+        with self.canvas:
+            self.static_fbo = Fbo(size=(1, 1))
+            Color(1, 1, 1, 1)
+            self.static_rect = Rectangle(texture=self.static_fbo.texture, size=(0, 0))
+        self.static_stale = False  # Artwork changed; redraw even at the same size
+        self.create_dynamic_layer()
+        self.bind(size=self.update_static_layer, pos=self.update_static_layer)
+    
+    def create_dynamic_layer(self):
+        """Create per-frame canvas instructions"""
+    
+    def draw_static_layer(self, center_x, center_y, radius):
+        """Draw static artwork into the Fbo (Fbo-local coordinates)"""
+    
+    def gauge_radius(self):
+        return min(self.size[0], self.size[1]) * 0.35
+    
+    def update_static_layer(self, *args):
+        """Re-render the cached layer on resize, reposition it on move"""
+        if self.size[0] <= 0 or self.size[1] <= 0:
+            return
+        
+        margin = self.static_margin
+        fbo_size = (int(self.size[0] + 2 * margin), int(self.size[1] + 2 * margin))
+        if tuple(self.static_fbo.size) != fbo_size or self.static_stale:
+            self.static_stale = False
+            self.static_fbo.size = fbo_size
+            self.static_fbo.clear()
+            with self.static_fbo:
+                ClearColor(0, 0, 0, 0)
+                ClearBuffers()
+                self.draw_static_layer(fbo_size[0] / 2, fbo_size[1] / 2, self.gauge_radius())
+            self.static_rect.texture = self.static_fbo.texture
+            self.static_rect.size = fbo_size
+        
+        self.static_rect.pos = (int(self.pos[0] - margin), int(self.pos[1] - margin))
+        self.update_gauge()
+    
+    def update_gauge(self, *args):
+        """Update the dynamic layer"""
+
+class MaterialCircularGauge(CachedGaugeWidget):
     """
     Material Design circular gauge widget
     Optimized for touchscreen visibility
@@ -42,132 +115,131 @@ class MaterialCircularGauge(Widget):
         self.track_color = (0.3, 0.3, 0.3, 0.3)
         self.bg_color = (0.1, 0.1, 0.1, 0.8)
         
-        # Create gauge
-        self.bind(size=self.update_gauge, pos=self.update_gauge)
-        Clock.schedule_interval(self.animate_gauge, 1/60.0)
+        # Create gauge (animation is only scheduled while the value moves)
+        self.init_layers()
+        self.animation_event = None
         
         # Create labels
         self.create_labels()
         Clock.schedule_once(self.update_gauge, 0.1)
     
     def create_labels(self):
-        """Create labels for value display"""
-        # Value label - Make it white and larger
-        self.value_label = MDLabel(
-            text=f"{self.current_val:.1f}",
-            theme_text_color="Custom",
-            text_color=(1, 1, 1, 1),  # White text
+        """Create the value readout"""
+        # Value readout - White and larger, drawn from the shared glyph atlas
+        self.value_readout = NumericReadout(
             font_style="H5",
+            decimals=1,
+            color=(1, 1, 1, 1),  # White text
             size_hint=(None, None),
             height=dp(40),
-            width=dp(120),
-            halign="center"
+            width=dp(120)
         )
-        self.add_widget(self.value_label)
+        self.add_widget(self.value_readout)
+    
+    def create_dynamic_layer(self):
+        """Progress arc - the only geometry that changes per frame"""
+        with self.canvas:
+            self.arc_color = Color(*self.gauge_color)
+            self.arc_line = Line(points=[], width=dp(12))
+    
+    def draw_static_layer(self, center_x, center_y, radius):
+        """Background, track and title"""
+        # Background circle
+        Color(*self.bg_color)
+        Ellipse(pos=(center_x - radius, center_y - radius), 
+               size=(radius * 2, radius * 2))
+        
+        # Track circle
+        Color(*self.track_color)
+        Line(circle=(center_x, center_y, radius * 0.9), width=dp(8))
+        
+        # Title - White text above the dial
+        if self.title:
+            font_name, font_size = App.get_running_app().theme_cls.font_styles["Subtitle2"][:2]
+            title = CoreLabel(text=self.title, font_name=font_name,
+                              font_size=sp(font_size), color=(1, 1, 1, 1))
+            title.refresh()
+            Color(1, 1, 1, 1)
+            Rectangle(texture=title.texture, size=title.texture.size,
+                      pos=(center_x - title.texture.width / 2,
+                           center_y + radius + dp(15) - title.texture.height / 2))
         
-        # Unit label - Make it light gray and visible
+        # Unit - Light gray text below the value, never changes
         if self.unit:
-            self.unit_label = MDLabel(
-                text=self.unit,
-                theme_text_color="Custom",
-                text_color=(0.8, 0.8, 0.8, 1),  # Light gray text
-                font_style="Caption",
-                size_hint=(None, None),
-                height=dp(20),
-                width=dp(80),
-                halign="center"
-            )
-            self.add_widget(self.unit_label)
-        
-        # Title label - Make it white and visible
-        if self.title:
-            self.title_label = MDLabel(
-                text=self.title,
-                theme_text_color="Custom",
-                text_color=(1, 1, 1, 1),  # White text
-                font_style="Subtitle2",
-                size_hint=(None, None),
-                height=dp(24),
-                width=dp(120),
-                halign="center"
-            )
-            self.add_widget(self.title_label)
+            font_name, font_size = App.get_running_app().theme_cls.font_styles["Caption"][:2]
+            unit = CoreLabel(text=self.unit, font_name=font_name,
+                             font_size=sp(font_size), color=(1, 1, 1, 1))
+            unit.refresh()
+            Color(0.8, 0.8, 0.8, 1)
+            Rectangle(texture=unit.texture, size=unit.texture.size,
+                      pos=(center_x - unit.texture.width / 2,
+                           center_y - dp(25) - unit.texture.height / 2))
     
     def update_gauge(self, *args):
-        """Update gauge graphics"""
-        self.canvas.clear()
-        
+        """Update progress arc and value label"""
         if self.size[0] <= 0 or self.size[1] <= 0:
             return
             
         center_x = self.pos[0] + self.size[0] / 2
         center_y = self.pos[1] + self.size[1] / 2
-        radius = min(self.size[0], self.size[1]) * 0.35  # Good size for touchscreen
+        radius = self.gauge_radius()
         
         if radius <= 0:
             return
         
-        with self.canvas:
-            # Background circle
-            Color(*self.bg_color)
-            Ellipse(pos=(center_x - radius, center_y - radius), 
-                   size=(radius * 2, radius * 2))
-            
-            # Track circle
-            Color(*self.track_color)
-            Line(circle=(center_x, center_y, radius * 0.9), width=dp(8))
-            
-            # Progress arc
-            if self.max_val != self.min_val:
-                value_percentage = (self.current_val - self.min_val) / (self.max_val - self.min_val)
-                value_percentage = max(0, min(1, value_percentage))
-                
-                # Draw arc
-                Color(*self.gauge_color)
-                start_angle = 135
-                sweep_angle = 270 * value_percentage
-                
-                # Create arc points
-                arc_points = []
-                steps = max(int(sweep_angle), 1)
-                for i in range(steps + 1):
-                    angle = math.radians(start_angle + (sweep_angle * i / steps))
-                    x = center_x + (radius * 0.9) * math.cos(angle)
-                    y = center_y + (radius * 0.9) * math.sin(angle)
-                    arc_points.extend([x, y])
-                
-                if len(arc_points) > 2:
-                    Line(points=arc_points, width=dp(12))
+        # Progress arc
+        arc_points = []
+        if self.max_val != self.min_val:
+            value_percentage = (self.current_val - self.min_val) / (self.max_val - self.min_val)
+            value_percentage = max(0, min(1, value_percentage))
+            arc_points = progress_arc_points(center_x, center_y,
+                                             radius * 0.9, value_percentage)
+        self.arc_line.points = arc_points if len(arc_points) > 2 else []
         
         # Update label positions
         self.update_label_positions(center_x, center_y, radius)
     
     def update_label_positions(self, center_x, center_y, radius):
         """Update label positions"""
-        if hasattr(self, 'value_label'):
-            self.value_label.text = f"{self.current_val:.1f}"
-            self.value_label.center_x = center_x
-            self.value_label.center_y = center_y
-        
-        if hasattr(self, 'unit_label'):
-            self.unit_label.center_x = center_x
-            self.unit_label.center_y = center_y - dp(25)
-        
-        if hasattr(self, 'title_label'):
-            self.title_label.center_x = center_x
-            self.title_label.center_y = center_y + radius + dp(15)
+        if hasattr(self, 'value_readout'):
+            self.value_readout.set_value(self.current_val)
+            self.value_readout.center = (center_x, center_y)
+    
+    @property
+    def is_animating(self):
+        return self.animation_event is not None
     
     def animate_gauge(self, dt):
-        """Smooth animation"""
+        """Smooth animation; unschedules itself once the value settles"""
         if abs(self.current_val - self.target_val) > 0.1:
             self.current_val += (self.target_val - self.current_val) * 0.15
             self.update_gauge()
+            return True
+        self.animation_event = None
+        return False
+    
+    def configure(self, min_val, max_val, gauge_color, title, unit):
+        """Restyle for another channel; the cached artwork is redrawn"""
+        if self.animation_event is not None:
+            self.animation_event.cancel()
+            self.animation_event = None
+        self.min_val = min_val
+        self.max_val = max_val
+        self.current_val = self.target_val = min_val
+        self.gauge_color = gauge_color
+        self.arc_color.rgba = (*gauge_color, 1)[:4]
+        self.title = title
+        self.unit = unit
+        self.static_stale = True
+        self.update_static_layer()
     
     def update_value(self, value):
         """Update target value"""
         self.target_val = max(self.min_val, min(self.max_val, value))
+        if self.animation_event is None and abs(self.current_val - self.target_val) > 0.1:
+            self.animation_event = Clock.schedule_interval(self.animate_gauge, 1/60.0)
 
-class MaterialSpeedGauge(Widget):
+class MaterialSpeedGauge(CachedGaugeWidget):
     """
     Material Design speed gauge with colored bands
     """
@@ -176,103 +248,203 @@ class MaterialSpeedGauge(Widget):
         super().__init__(**kwargs)
         self.current_speed = 0
         self.max_speed = 60  # MPH
-        self.bind(size=self.update_gauge, pos=self.update_gauge)
+        self.init_layers()
         
-        # Create speed label - Make it white and visible
-        self.speed_label = MDLabel(
-            text="0.0 MPH",
-            theme_text_color="Custom",
-            text_color=(1, 1, 1, 1),  # White text
+        # Create speed readout - White and visible
+        self.speed_readout = NumericReadout(
             font_style="H4",
+            decimals=1,
+            unit=" MPH",
+            color=(1, 1, 1, 1),  # White text
             size_hint=(None, None),
             height=dp(48),
-            width=dp(150),
-            halign="center"
+            width=dp(150)
         )
-        self.add_widget(self.speed_label)
-        
+        self.add_widget(self.speed_readout)
+    
+    def gauge_radius(self):
+        return min(self.size[0], self.size[1]) * 0.4
+    
+    def create_dynamic_layer(self):
+        """Speed marker - line and dot"""
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self.marker_line = Line(points=[], width=dp(4))
+            Color(1, 1, 0, 1)
+            self.marker_dot = Ellipse(size=(dp(12), dp(12)))
+    
+    def draw_static_layer(self, center_x, center_y, radius):
+        """Background and colored speed bands"""
+        # Background
+        Color(0.1, 0.1, 0.1, 0.8)
+        Ellipse(pos=(center_x - radius, center_y - radius), 
+               size=(radius * 2, radius * 2))
+        
+        # Speed bands
+        start_angle = 180
+        sweep_angle = 180
+        line_width = dp(20)
+        
+        # Blue band (0-20 MPH)
+        Color(0.3, 0.6, 1.0, 0.8)
+        blue_points = band_arc_points(center_x, center_y, radius, start_angle,
+                                      0, int(sweep_angle * 0.33))
+        if len(blue_points) > 2:
+            Line(points=blue_points, width=line_width)
+        
+        # Green band (20-40 MPH)
+        Color(0.3, 0.8, 0.3, 0.8)
+        green_points = band_arc_points(center_x, center_y, radius, start_angle,
+                                       int(sweep_angle * 0.33), int(sweep_angle * 0.67))
+        if len(green_points) > 2:
+            Line(points=green_points, width=line_width)
+        
+        # Red band (40-60 MPH)
+        Color(1.0, 0.4, 0.4, 0.8)
+        red_points = band_arc_points(center_x, center_y, radius, start_angle,
+                                     int(sweep_angle * 0.67), int(sweep_angle))
+        if len(red_points) > 2:
+            Line(points=red_points, width=line_width)
+    
     def update_gauge(self, *args):
-        """Draw speed gauge with colored bands"""
-        self.canvas.clear()
-        
+        """Move the speed marker and update the label"""
         if self.size[0] <= 0 or self.size[1] <= 0:
             return
             
         center_x = self.pos[0] + self.size[0] / 2
         center_y = self.pos[1] + self.size[1] / 2
-        radius = min(self.size[0], self.size[1]) * 0.4
+        radius = self.gauge_radius()
         
         if radius <= 0:
             return
         
-        with self.canvas:
-            # Background
-            Color(0.1, 0.1, 0.1, 0.8)
-            Ellipse(pos=(center_x - radius, center_y - radius), 
-                   size=(radius * 2, radius * 2))
-            
-            # Speed bands
-            start_angle = 180
-            sweep_angle = 180
-            line_width = dp(20)
-            
-            # Blue band (0-20 MPH)
-            Color(0.3, 0.6, 1.0, 0.8)
-            blue_points = []
-            for i in range(int(sweep_angle * 0.33) + 1):
-                angle = math.radians(start_angle + i)
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                blue_points.extend([x, y])
-            if len(blue_points) > 2:
-                Line(points=blue_points, width=line_width)
-            
-            # Green band (20-40 MPH)
-            Color(0.3, 0.8, 0.3, 0.8)
-            green_points = []
-            for i in range(int(sweep_angle * 0.33), int(sweep_angle * 0.67) + 1):
-                angle = math.radians(start_angle + i)
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                green_points.extend([x, y])
-            if len(green_points) > 2:
-                Line(points=green_points, width=line_width)
-            
-            # Red band (40-60 MPH)
-            Color(1.0, 0.4, 0.4, 0.8)
-            red_points = []
-            for i in range(int(sweep_angle * 0.67), int(sweep_angle) + 1):
-                angle = math.radians(start_angle + i)
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                red_points.extend([x, y])
-            if len(red_points) > 2:
-                Line(points=red_points, width=line_width)
-            
-            # Speed indicator
-            speed_percentage = min(self.current_speed / self.max_speed, 1.0)
-            marker_angle = math.radians(start_angle + sweep_angle * speed_percentage)
-            
-            # Marker line
-            Color(1, 1, 1, 1)
-            marker_x = center_x + radius * math.cos(marker_angle)
-            marker_y = center_y + radius * math.sin(marker_angle)
-            Line(points=[center_x, center_y, marker_x, marker_y], width=dp(4))
-            
-            # Marker dot
-            Color(1, 1, 0, 1)
-            Ellipse(pos=(marker_x - dp(6), marker_y - dp(6)), size=(dp(12), dp(12)))
-        
-        # Update speed label
-        if hasattr(self, 'speed_label'):
-            self.speed_label.text = f"{self.current_speed:.1f} MPH"
-            self.speed_label.center_x = center_x
-            self.speed_label.center_y = center_y - radius/4
+        # Speed indicator
+        start_angle = 180
+        sweep_angle = 180
+        speed_percentage = min(self.current_speed / self.max_speed, 1.0)
+        marker_angle = math.radians(start_angle + sweep_angle * speed_percentage)
+        
+        marker_x = center_x + radius * math.cos(marker_angle)
+        marker_y = center_y + radius * math.sin(marker_angle)
+        self.marker_line.points = [center_x, center_y, marker_x, marker_y]
+        self.marker_dot.pos = (marker_x - dp(6), marker_y - dp(6))
+        
+        # Update speed readout
+        if hasattr(self, 'speed_readout'):
+            self.speed_readout.set_value(self.current_speed)
+            self.speed_readout.center = (center_x, center_y - radius/4)
     
     def update_speed(self, speed):
-        """Update displayed speed"""
+        """Update displayed speed; returns True if the readout changed"""
         self.current_speed = speed
+        previous = self.speed_readout.text
         self.update_gauge()
+        return self.speed_readout.text != previous
+
+class RepeatIconButton(MDIconButton):
+    """
+    Icon button that auto-repeats while held
+    Dispatches on_repeat(multiplier) on press, then again after
+    repeat_delay at a shortening interval. The step multiplier grows
+    the longer the button is held.
+    """
+    
+    repeat_delay = 0.4
+    repeat_interval = 0.2
+    min_repeat_interval = 0.05
+    
+    def __init__(self, **kwargs):
+        self.register_event_type('on_repeat')
+        super().__init__(**kwargs)
+        self.repeat_event = None
+        self.repeat_count = 0
+        self.bind(on_press=self.start_repeat, state=self.on_state_change)
+    
+    def start_repeat(self, *args):
+        self.stop_repeat()
+        self.repeat_count = 0
+        self.dispatch('on_repeat', 1)
+        self.repeat_event = Clock.schedule_once(self.repeat, self.repeat_delay)
+    
+    def stop_repeat(self):
+        if self.repeat_event:
+            self.repeat_event.cancel()
+            self.repeat_event = None
+    
+    def on_state_change(self, instance, state):
+        # Released anywhere, including after sliding off the button
+        if state == 'normal':
+            self.stop_repeat()
+    
+    def repeat(self, dt):
+        self.repeat_count += 1
+        self.dispatch('on_repeat', self.step_multiplier())
+        interval = max(self.min_repeat_interval, self.repeat_interval * 0.85 ** self.repeat_count)
+        self.repeat_event = Clock.schedule_once(self.repeat, interval)
+    
+    def step_multiplier(self):
+        """Accelerate: single steps at first, then x2, then x5"""
+        if self.repeat_count < 10:
+            return 1
+        if self.repeat_count < 25:
+            return 2
+        return 5
+    
+    def on_repeat(self, multiplier):
+        pass
+
+# Widget class for each gauge kind in a layout spec
+GAUGE_CLASSES = {
+    'circular': MaterialCircularGauge,
+}
+
+class GaugePool:
+    """
+    Detached gauges kept for reuse
+    When a dashboard re-applies its layout, the old gauges come back here
+    and are handed out again restyled, rather than building new widgets
+    with their cached artwork layers.
+    """
+    
+    def __init__(self, limit=16):
+        self.limit = limit  # Free gauges kept per kind
+        self.free = {}
+        self.created = 0
+        self.reused = 0
+    
+    def acquire(self, spec):
+        """A gauge for a GaugeSpec, pooled if one is free"""
+        free = self.free.get(spec.kind)
+        if free:
+            gauge = free.pop()
+            gauge.configure(spec.min_val, spec.max_val, spec.color, spec.title, spec.unit)
+            self.reused += 1
+            return gauge
+        self.created += 1
+        return GAUGE_CLASSES[spec.kind](min_val=spec.min_val, max_val=spec.max_val,
+                                        gauge_color=spec.color, title=spec.title,
+                                        unit=spec.unit)
+    
+    def release(self, gauge, kind):
+        """Detach a gauge and keep it for the next acquire"""
+        if gauge.parent is not None:
+            gauge.parent.remove_widget(gauge)
+        free = self.free.setdefault(kind, [])
+        if len(free) < self.limit:
+            free.append(gauge)
+
+# Channels listed in the statistics dialog: (key, label, unit)
+STATS_CHANNELS = [
+    ('airspeed_mph', "Airspeed", "MPH"),
+    ('pressure_static', "Static P", "hPa"),
+    ('pressure_dynamic', "Dynamic P", "hPa"),
+    ('lift_force', "Lift", "N"),
+    ('drag_force', "Drag", "N"),
+    ('fan_output', "Fan out", "%"),
+]
+
+# Frame rate the flow streaks shed particles to hold (a Raspberry Pi manages ~30)
+FLOW_TARGET_FPS = 30
 
 class MaterialDashboardScreen(MDScreen):
     """
@@ -280,20 +452,65 @@ class MaterialDashboardScreen(MDScreen):
     Optimized for 800x480 touchscreen
     """
     
-    def __init__(self, simulator, **kwargs):
+    def __init__(self, simulator, acquisition=None, airspeed_hold=None,
+                 alarm_engine=None, statistics=None, recorder=None, exporter=None,
+                 reports=None,
+                 governor=None, event_log=None, commands=None, spectrum=None, derived=None,
+                 tare=None, capture=None, live_export=None, layout=None, gauge_pool=None,
+                 tunnel_name=None, back_screen='mode_screen', **kwargs):
+        kwargs.setdefault('name', 'dashboard')
         super().__init__(**kwargs)
-        self.name = 'dashboard'
+        self.tunnel_name = tunnel_name  # Set when several tunnels are hosted
+        self.back_screen = back_screen
         self.simulator = simulator
+        self.acquisition = acquisition  # Sampling thread (optional)
+        self.airspeed_hold = airspeed_hold  # Closed-loop controller (optional)
+        self.alarm_engine = alarm_engine  # Threshold alarms (optional)
+        self.alarm_shown = False
+        self.statistics = statistics  # Running channel statistics (optional)
+        self.stats_dialog = None
+        self.recorder = recorder  # Run recording (optional)
+        self.exporter = exporter  # Background run export (optional)
+        self.reports = reports  # Polar report generator (optional)
+        self.governor = governor  # Adaptive frame-rate governor (optional)
+        self.event_log = event_log  # Recent structured events (optional)
+        self.events_dialog = None
+        self.commands = commands  # Coalescing setpoint queue (optional)
+        self.spectrum = spectrum  # Force channel spectra (optional)
+        self.spectrum_dialog = None
+        self.spectrum_event = None
+        self.derived = derived  # Derived aerodynamic channels (optional)
+        self.tare = tare  # Sensor zero routine (optional)
+        self.last_tare_state = 'idle'
+        self.capture = capture  # Triggered capture (optional)
+        self.capture_dialog = None
+        self.last_capture_count = 0
+        self.layout_source = layout or LayoutSource()  # Gauge panels (declarative)
+        self.layout = None
+        self.layout_gauges = []  # (GaugeSpec, gauge) as built
+        self.gauge_pool = gauge_pool or GaugePool()
+        self.subscribed_derived = ()
+        self.live_export = live_export  # Live session streaming (optional)
+        self.live_export_button = None
+        self.export_dialog = None
+        self.export_run_dir = None
+        self.last_export_status = 'idle'
+        self.report_dialog = None
+        self.report_run_dir = None
+        self.last_report_status = 'idle'
         
         # Create layout
         self.create_layout()
         
         # Update timer
         self.update_event = None
-        print("📊 Material Design dashboard created - 800×480 optimized")
+        log.debug("Dashboard created for %s", tunnel_name or "the tunnel")
     
     def create_layout(self):
         """Create Material Design dashboard layout"""
+        self.construction = ConstructionTimer()
+        measure = self.construction.measure
+        
         # Main container
         main_layout = MDBoxLayout(
             orientation='vertical',
@@ -302,10 +519,11 @@ class MaterialDashboardScreen(MDScreen):
         )
         
         # Top toolbar
-        toolbar = self.create_toolbar()
-        toolbar.size_hint_y = None
-        toolbar.height = dp(56)
-        main_layout.add_widget(toolbar)
+        with measure('toolbar'):
+            toolbar = self.create_toolbar()
+            toolbar.size_hint_y = None
+            toolbar.height = dp(56)
+            main_layout.add_widget(toolbar)
         
         # Main content area
         content_layout = MDBoxLayout(
@@ -315,38 +533,52 @@ class MaterialDashboardScreen(MDScreen):
         )
         
         # Left panel - Speed gauge
-        left_panel = self.create_left_panel()
-        left_panel.size_hint_x = 0.3
-        content_layout.add_widget(left_panel)
+        with measure('left_panel'):
+            left_panel = self.create_left_panel()
+            left_panel.size_hint_x = 0.3
+            content_layout.add_widget(left_panel)
         
-        # Center panel - Gauges
+        # Center panel - Gauges (from the layout)
         center_panel = self.create_center_panel()
         center_panel.size_hint_x = 0.45
         content_layout.add_widget(center_panel)
         
-        # Right panel - Controls
-        right_panel = self.create_right_panel()
-        right_panel.size_hint_x = 0.25
-        content_layout.add_widget(right_panel)
+        # Right panel - Layout panels over the system data
+        with measure('right_panel'):
+            right_panel = self.create_right_panel()
+            right_panel.size_hint_x = 0.25
+            content_layout.add_widget(right_panel)
         
         main_layout.add_widget(content_layout)
         
         # Bottom controls
-        bottom_controls = self.create_bottom_controls()
-        bottom_controls.size_hint_y = None
-        bottom_controls.height = dp(64)
-        main_layout.add_widget(bottom_controls)
+        with measure('bottom_controls'):
+            bottom_controls = self.create_bottom_controls()
+            bottom_controls.size_hint_y = None
+            bottom_controls.height = dp(64)
+            main_layout.add_widget(bottom_controls)
         
         self.add_widget(main_layout)
+        
+        # Gauge panels last, each timed on its own
+        layout = self.layout_source.get()
+        self.apply_layout(layout, report=False)
+        self.construction.report(self.construction_label(), layout.budget_ms)
     
     def create_toolbar(self):
         """Create top toolbar"""
         toolbar = MDTopAppBar(
-            title="Wind Tunnel Control",
+            title=self.tunnel_name or "Wind Tunnel Control",
             left_action_items=[["menu", lambda x: None]],
             right_action_items=[
                 ["circle", lambda x: None],
-                ["information", lambda x: None]
+                ["file-export", lambda x: self.show_export_dialog()],
+                ["file-chart", lambda x: self.show_report_dialog()],
+                ["scale-balance", lambda x: self.start_tare()],
+                ["flash", lambda x: self.show_capture_dialog()],
+                ["chart-bell-curve", lambda x: self.show_spectrum()],
+                ["history", lambda x: self.show_event_log()],
+                ["information", lambda x: self.show_statistics()]
             ],
             elevation=dp(4)
         )
@@ -377,9 +609,14 @@ class MaterialDashboardScreen(MDScreen):
         )
         panel_layout.add_widget(title)
         
-        # Speed gauge
-        self.speed_gauge = MaterialSpeedGauge()
-        panel_layout.add_widget(self.speed_gauge)
+        # Speed gauge over the flow streaks
+        gauge_layout = FloatLayout()
+        self.flow_overlay = FlowOverlay(target_fps=self.get_flow_target_fps,
+                                        pos_hint={'x': 0, 'y': 0})
+        self.speed_gauge = MaterialSpeedGauge(pos_hint={'x': 0, 'y': 0})
+        gauge_layout.add_widget(self.flow_overlay)
+        gauge_layout.add_widget(self.speed_gauge)
+        panel_layout.add_widget(gauge_layout)
         
         # Fan controls
         fan_layout = MDBoxLayout(
@@ -409,22 +646,22 @@ class MaterialDashboardScreen(MDScreen):
             height=dp(40)
         )
         
-        fan_minus = MDIconButton(
+        fan_minus = RepeatIconButton(
             icon="minus",
             theme_icon_color="Custom",
             icon_color=(1, 1, 1, 1),
             md_bg_color=(0.9, 0.3, 0.3, 1)
         )
-        fan_minus.bind(on_press=self.decrease_fan_speed)
+        fan_minus.bind(on_repeat=self.decrease_fan_speed)
         fan_buttons.add_widget(fan_minus)
         
-        fan_plus = MDIconButton(
+        fan_plus = RepeatIconButton(
             icon="plus",
             theme_icon_color="Custom",
             icon_color=(1, 1, 1, 1),
             md_bg_color=(0.2, 0.8, 0.3, 1)
         )
-        fan_plus.bind(on_press=self.increase_fan_speed)
+        fan_plus.bind(on_repeat=self.increase_fan_speed)
         fan_buttons.add_widget(fan_plus)
         
         fan_layout.add_widget(fan_buttons)
@@ -434,108 +671,112 @@ class MaterialDashboardScreen(MDScreen):
         return card
     
     def create_center_panel(self):
-        """Create center panel with gauges"""
+        """Create center column for the layout's center panels"""
+        self.center_slot = MDBoxLayout(
+            orientation='vertical',
+            spacing=dp(8)
+        )
+        return self.center_slot
+    
+    def build_panel(self, panel):
+        """Card for a layout PanelSpec; its gauges come from the pool"""
         card = MDCard(
             elevation=dp(4),
             padding=dp(12),
-            radius=[dp(8)]
+            radius=[dp(8)],
+            size_hint_y=panel.size_hint
         )
         
-        gauges_grid = MDGridLayout(
-            cols=2,
+        panel_layout = MDBoxLayout(
+            orientation='vertical',
             spacing=dp(8)
         )
         
-        # Pressure gauges
-        self.static_pressure_gauge = MaterialCircularGauge(
-            min_val=1000, max_val=1030,
-            gauge_color=(0.2, 0.6, 1.0, 1),
-            title="STATIC P",
-            unit="hPa"
-        )
-        gauges_grid.add_widget(self.static_pressure_gauge)
+        # Panel title - Make it white and visible
+        if panel.title:
+            title = MDLabel(
+                text=panel.title,
+                theme_text_color="Custom",
+                text_color=(1, 1, 1, 1),  # White text
+                font_style="Subtitle1",
+                size_hint_y=None,
+                height=dp(24),
+                halign="center"
+            )
+            panel_layout.add_widget(title)
         
-        self.dynamic_pressure_gauge = MaterialCircularGauge(
-            min_val=1000, max_val=1030,
-            gauge_color=(1.0, 0.6, 0.2, 1),
-            title="DYNAMIC P",
-            unit="hPa"
-        )
-        gauges_grid.add_widget(self.dynamic_pressure_gauge)
-        
-        # Angle of Attack
-        self.aoa_gauge = MaterialCircularGauge(
-            min_val=-20, max_val=20,
-            gauge_color=(0.2, 0.8, 0.3, 1),
-            title="AOA",
-            unit="deg"
-        )
-        gauges_grid.add_widget(self.aoa_gauge)
-        
-        # Fan output
-        self.fan_output_gauge = MaterialCircularGauge(
-            min_val=0, max_val=100,
-            gauge_color=(0.2, 0.6, 1.0, 1),
-            title="FAN OUT",
-            unit="%"
+        gauges_grid = MDGridLayout(
+            cols=panel.cols,
+            spacing=dp(8)
         )
-        gauges_grid.add_widget(self.fan_output_gauge)
+        for spec in panel.gauges:
+            gauge = self.gauge_pool.acquire(spec)
+            gauges_grid.add_widget(gauge)
+            self.layout_gauges.append((spec, gauge))
+        panel_layout.add_widget(gauges_grid)
         
-        card.add_widget(gauges_grid)
+        card.add_widget(panel_layout)
         return card
     
+    def apply_layout(self, layout, report=True):
+        """Build the layout's panels, reusing the gauges of the previous one"""
+        if report:
+            self.construction = ConstructionTimer()
+        for spec, gauge in self.layout_gauges:
+            self.gauge_pool.release(gauge, spec.kind)
+        self.layout_gauges = []
+        self.center_slot.clear_widgets()
+        self.right_slot.clear_widgets()
+        
+        # A mistyped channel would leave its gauge frozen at min_val
+        unknown = layout.unknown_channels(self.known_channels())
+        if unknown:
+            log.warning("Layout gauges show unknown channels: %s", ", ".join(unknown),
+                        extra=fields(channels=unknown))
+        
+        for panel in layout.panels:
+            with self.construction.measure(f"panel:{panel.name}"):
+                slot = self.center_slot if panel.slot == 'center' else self.right_slot
+                slot.add_widget(self.build_panel(panel))
+        # Right-hand panels share the column with the system data card
+        self.right_slot.size_hint_y = sum(panel.size_hint for panel in layout.panels_in('right'))
+        self.layout = layout
+        if report:
+            self.construction.report(f"{self.construction_label()} layout", layout.budget_ms)
+    
+    def construction_label(self):
+        return f"Dashboard {self.tunnel_name}" if self.tunnel_name else "Dashboard"
+    
+    def known_channels(self):
+        """Channels a gauge can show: sampled, added by block stages, or derived"""
+        known = set(self.simulator.get_all_data())
+        if self.acquisition:
+            known.update(self.acquisition.get_latest())
+            known.update(self.acquisition.stage_channels)
+        if self.derived:
+            known.update(self.derived.channels)
+        return known
+    
+    def derived_channels(self):
+        """Derived channels to compute while shown: Cl, L/D and any the layout shows"""
+        names = ['lift_coefficient', 'lift_drag_ratio']
+        names += [spec.channel for spec, _ in self.layout_gauges
+                  if spec.channel in self.derived.channels and spec.channel not in names]
+        return tuple(names)
+    
     def create_right_panel(self):
-        """Create right panel with forces and data"""
+        """Create right panel with layout panels (forces) and data"""
         panel_layout = MDBoxLayout(
             orientation='vertical',
             spacing=dp(8)
         )
         
-        # Forces card
-        forces_card = MDCard(
-            elevation=dp(4),
-            padding=dp(12),
-            radius=[dp(8)],
-            size_hint_y=0.6
-        )
-        
-        forces_layout = MDBoxLayout(
+        # Layout panels (forces by default), filled in by apply_layout
+        self.right_slot = MDBoxLayout(
             orientation='vertical',
             spacing=dp(8)
         )
-        
-        # Forces title - Make it white and visible
-        forces_title = MDLabel(
-            text="FORCES",
-            theme_text_color="Custom",
-            text_color=(1, 1, 1, 1),  # White text
-            font_style="Subtitle1",
-            size_hint_y=None,
-            height=dp(24),
-            halign="center"
-        )
-        forces_layout.add_widget(forces_title)
-        
-        # Lift gauge
-        self.lift_gauge = MaterialCircularGauge(
-            min_val=-2, max_val=8,
-            gauge_color=(0.2, 0.8, 0.3, 1),
-            title="LIFT",
-            unit="N"
-        )
-        forces_layout.add_widget(self.lift_gauge)
-        
-        # Drag gauge
-        self.drag_gauge = MaterialCircularGauge(
-            min_val=0, max_val=3,
-            gauge_color=(1.0, 0.3, 0.3, 1),
-            title="DRAG",
-            unit="N"
-        )
-        forces_layout.add_widget(self.drag_gauge)
-        
-        forces_card.add_widget(forces_layout)
-        panel_layout.add_widget(forces_card)
+        panel_layout.add_widget(self.right_slot)
         
         # System data card
         data_card = MDCard(
@@ -563,16 +804,39 @@ class MaterialDashboardScreen(MDScreen):
         data_layout.add_widget(data_title)
         
         # Runtime - Make it light gray and visible
-        self.runtime_label = MDLabel(
-            text="Runtime: 0.0s",
-            theme_text_color="Custom",
-            text_color=(0.8, 0.8, 0.8, 1),  # Light gray text
+        self.runtime_readout = NumericReadout(
             font_style="Body2",
+            decimals=1,
+            prefix="Runtime: ",
+            unit="s",
+            color=(0.8, 0.8, 0.8, 1),  # Light gray text
             size_hint_y=None,
-            height=dp(20),
-            halign="center"
+            height=dp(20)
         )
-        data_layout.add_widget(self.runtime_label)
+        data_layout.add_widget(self.runtime_readout)
+        
+        # Aerodynamic coefficients - only computed while shown
+        if self.derived:
+            coefficients_layout = MDBoxLayout(
+                orientation='horizontal',
+                size_hint_y=None,
+                height=dp(20)
+            )
+            self.cl_readout = NumericReadout(
+                font_style="Body2",
+                decimals=2,
+                prefix="Cl ",
+                color=(0.8, 0.8, 0.8, 1)
+            )
+            coefficients_layout.add_widget(self.cl_readout)
+            self.ld_readout = NumericReadout(
+                font_style="Body2",
+                decimals=1,
+                prefix="L/D ",
+                color=(0.8, 0.8, 0.8, 1)
+            )
+            coefficients_layout.add_widget(self.ld_readout)
+            data_layout.add_widget(coefficients_layout)
         
         # Status chip
         self.status_chip = MDChip(
@@ -583,6 +847,24 @@ class MaterialDashboardScreen(MDScreen):
         )
         data_layout.add_widget(self.status_chip)
         
+        # Export progress - only visible while an export runs
+        self.export_progress = MDProgressBar(
+            value=0,
+            size_hint_y=None,
+            height=dp(4),
+            opacity=0
+        )
+        data_layout.add_widget(self.export_progress)
+        
+        # Report progress - only visible while a report is being built
+        self.report_progress = MDProgressBar(
+            value=0,
+            size_hint_y=None,
+            height=dp(4),
+            opacity=0
+        )
+        data_layout.add_widget(self.report_progress)
+        
         data_card.add_widget(data_layout)
         panel_layout.add_widget(data_card)
         
@@ -618,6 +900,30 @@ class MaterialDashboardScreen(MDScreen):
         reset_button.bind(on_press=self.reset_simulation)
         controls_layout.add_widget(reset_button)
         
+        # Airspeed hold button
+        if self.airspeed_hold:
+            self.hold_button = MDRaisedButton(
+                text="HOLD",
+                icon="target",
+                md_bg_color=(0.4, 0.4, 0.4, 1),
+                size_hint_x=0.25,
+                font_size=dp(16)
+            )
+            self.hold_button.bind(on_press=self.toggle_airspeed_hold)
+            controls_layout.add_widget(self.hold_button)
+        
+        # Record button
+        if self.recorder:
+            self.record_button = MDRaisedButton(
+                text="REC",
+                icon="record",
+                md_bg_color=(0.4, 0.4, 0.4, 1),
+                size_hint_x=0.2,
+                font_size=dp(16)
+            )
+            self.record_button.bind(on_press=self.toggle_recording)
+            controls_layout.add_widget(self.record_button)
+        
         # Spacer
         spacer = Widget()
         controls_layout.add_widget(spacer)
@@ -635,19 +941,345 @@ class MaterialDashboardScreen(MDScreen):
         
         return controls_layout
     
-    def increase_fan_speed(self, button):
-        """Increase fan speed"""
-        self.simulator.adjust_fan_speed(5)
-        self.update_fan_display()
+    def show_spectrum(self):
+        """Show live lift/drag spectra and their dominant frequencies"""
+        if not self.spectrum:
+            return
+        
+        if self.spectrum_dialog is None:
+            # Built once and reopened (see gui.dialogs)
+            view = SpectrumView(
+                self.spectrum,
+                {'lift_force': (0.3, 0.8, 0.3, 1), 'drag_force': (1.0, 0.4, 0.4, 1)},
+                size_hint_y=None,
+                height=dp(220)
+            )
+            self.spectrum_dialog = MDDialog(
+                title="FORCE SPECTRUM",
+                type="custom",
+                content_cls=view,
+                buttons=[MDRaisedButton(text="CLOSE", on_release=lambda x: self.spectrum_dialog.dismiss())]
+            )
+            self.spectrum_dialog.bind(on_dismiss=self.stop_spectrum_updates)
+        elif self.spectrum_event:
+            return  # Already showing
+        
+        def refresh(dt):
+            self.spectrum_dialog.content_cls.refresh()
+            self.spectrum_dialog.title = self.spectrum_title()
+        
+        refresh(0)
+        self.spectrum_event = Clock.schedule_interval(refresh, 0.5)
+        reopen_dialog(self.spectrum_dialog)
+    
+    def stop_spectrum_updates(self, *args):
+        if self.spectrum_event:
+            self.spectrum_event.cancel()
+            self.spectrum_event = None
+    
+    def spectrum_title(self):
+        """Dominant frequencies, e.g. 'LIFT 12.1 Hz • DRAG 3.9 Hz'"""
+        parts = []
+        for channel, label in (('lift_force', "LIFT"), ('drag_force', "DRAG")):
+            dominant = self.spectrum.get_dominant(channel)
+            parts.append(f"{label} {dominant:.1f} Hz" if dominant is not None else f"{label} --")
+        return "  •  ".join(parts)
+    
+    def show_statistics(self):
+        """Show run and windowed statistics in a dialog"""
+        if not self.statistics:
+            return
+        
+        lines = []
+        for key, label, unit in STATS_CHANNELS:
+            run = self.statistics.get_summary(key)
+            window = self.statistics.get_window_summary(key)
+            if not run or not window:
+                continue
+            lines.append(f"{label}: {run['mean']:.2f} ± {run['std']:.2f} {unit}  "
+                         f"[{run['min']:.2f} .. {run['max']:.2f}]  rms {run['rms']:.2f}")
+            lines.append(f"    last {self.statistics.window_seconds:.0f}s: "
+                         f"{window['mean']:.2f} ± {window['std']:.2f}  "
+                         f"[{window['min']:.2f} .. {window['max']:.2f}]")
+        if lines:
+            lines.insert(0, f"Samples: {self.statistics.count}")
+        else:
+            lines.append("No samples yet - start the simulation")
+        
+        if self.commands:
+            for name, label in (('fan_speed', "Fan"), ('airspeed_setpoint', "Setpoint")):
+                stats = self.commands.get_stats(name)
+                if stats['applied']:
+                    lines.append(f"{label} commands: {stats['applied']} sent, "
+                                 f"{stats['coalesced']} coalesced, "
+                                 f"latency {stats['mean_latency'] * 1000:.1f} ms avg / "
+                                 f"{stats['max_latency'] * 1000:.1f} ms max")
+        
+        if self.acquisition:
+            jitter = self.acquisition.get_timing()['jitter']
+            if jitter['count']:
+                lines.append(f"Sampling jitter: {jitter['rms_us']:.0f} µs rms, "
+                             f"{jitter['max_abs_us']:.0f} µs max  "
+                             f"(interval {jitter['min_interval_ms']:.2f} .. "
+                             f"{jitter['max_interval_ms']:.2f} ms)")
+        
+        report = self.governor.get_report() if self.governor else None
+        if report:
+            lines.append(f"Display: {report['fps']:.1f} fps ({report['level']}), "
+                         f"CPU {report['cpu_seconds_per_minute']:.1f} s/min")
+        
+        self.stats_dialog = open_text_dialog(self.stats_dialog, "RUN STATISTICS", "\n".join(lines))
     
-    def decrease_fan_speed(self, button):
-        """Decrease fan speed"""
-        self.simulator.adjust_fan_speed(-5)
+    def show_event_log(self):
+        """Show the most recent events from the structured event log"""
+        if not self.event_log:
+            return
+        
+        lines = []
+        for event in self.event_log.recent(12):
+            line = (f"{time.strftime('%H:%M:%S', time.localtime(event['time']))} "
+                    f"{event['level'][0]} {event['source']}: {event['message']}")
+            if event['suppressed']:
+                line += f"  (+{event['suppressed']} similar)"
+            lines.append(line)
+        stats = self.event_log.get_stats()
+        if stats['dropped']:
+            lines.append(f"{stats['dropped']} events dropped while the writer was busy")
+        
+        self.events_dialog = open_text_dialog(self.events_dialog, "RECENT EVENTS",
+                                              "\n".join(lines) or "No events yet")
+    
+    def toggle_recording(self, button):
+        """Start/stop recording the run to disk"""
+        if self.recorder.is_recording:
+            self.recorder.stop()
+            self.record_button.text = "REC"
+            self.record_button.md_bg_color = (0.4, 0.4, 0.4, 1)
+        else:
+            metadata = {
+                'fan_speed': self.simulator.fan_speed,
+                'angle_of_attack': self.simulator.angle_of_attack
+            }
+            if self.tunnel_name:
+                metadata['tunnel'] = self.tunnel_name
+            self.recorder.start(metadata)
+            self.record_button.text = "REC ●"
+            self.record_button.md_bg_color = (0.9, 0.3, 0.3, 1)
+    
+    def show_export_dialog(self):
+        """Ask which format to export the latest recorded run to, or stream live"""
+        if not self.exporter or not self.recorder:
+            return
+        
+        runs = list_runs(self.recorder.runs_dir)
+        self.export_run_dir = runs[0] if runs else None
+        buttons = None
+        if self.export_dialog is None:
+            buttons = [
+                MDRaisedButton(text=fmt.upper(),
+                               on_release=lambda x, fmt=fmt: self.start_export(self.export_run_dir, fmt))
+                for fmt in ('csv', 'parquet', 'hdf5')
+            ]
+            if self.live_export:
+                self.live_export_button = MDRaisedButton(
+                    on_release=lambda x: self.toggle_live_export())
+                buttons.append(self.live_export_button)
+        if self.live_export_button:
+            self.live_export_button.text = "STOP LIVE" if self.live_export.is_active else "LIVE CSV"
+        
+        if self.export_run_dir:
+            text = f"Export run {os.path.basename(self.export_run_dir)} to:"
+        else:
+            text = "No recorded runs - press REC first"
+        if self.live_export and self.live_export.is_active:
+            text += f"\nStreaming live to {os.path.basename(self.live_export.exporter.path)}"
+        self.export_dialog = open_text_dialog(self.export_dialog, "EXPORT RUN", text, buttons)
+    
+    def start_export(self, run_dir, fmt):
+        """Kick off a background export"""
+        if run_dir is None:
+            toast("No recorded runs - press REC first")
+            return
+        if self.exporter.is_busy:
+            toast("Export already running")
+            return
+        if self.export_dialog:
+            self.export_dialog.dismiss()
+        reader = RunReader(run_dir)
+        path = os.path.join(run_dir, reader.run_id)
+        self.exporter.export(reader, path, fmt, derived=self.derived)
+    
+    def toggle_live_export(self):
+        """Start streaming the live session to CSV, or stop the running stream"""
+        if self.export_dialog:
+            self.export_dialog.dismiss()
+        if self.live_export.is_active:
+            exporter = self.live_export.stop()
+            dropped = f", {exporter.chunks_dropped} chunks dropped" if exporter.chunks_dropped else ""
+            toast(f"Live export saved: {exporter.samples_written} samples{dropped}")
+        else:
+            exporter = self.live_export.start('csv')
+            toast(f"Streaming live to {os.path.basename(exporter.path)}")
+    
+    def update_export_display(self):
+        """Mirror background export progress on the progress bar"""
+        progress, status, message = self.exporter.get_state()
+        if status == 'running':
+            self.export_progress.opacity = 1
+            self.export_progress.value = progress * 100
+        elif status != self.last_export_status:
+            self.export_progress.opacity = 0
+            toast(message)
+        self.last_export_status = status
+    
+    def show_report_dialog(self):
+        """Ask which format to build the latest recorded run's polar report in"""
+        if not self.reports or not self.recorder:
+            return
+        if self.reports.is_busy:
+            toast("Report already being built")
+            return
+        
+        runs = list_runs(self.recorder.runs_dir)
+        if not runs:
+            toast("No recorded runs - press REC first")
+            return
+        
+        self.report_run_dir = runs[0]
+        buttons = None
+        if self.report_dialog is None:
+            buttons = [
+                MDRaisedButton(text=fmt.upper(),
+                               on_release=lambda x, fmt=fmt: self.start_report(self.report_run_dir, fmt))
+                for fmt in ('png', 'pdf')
+            ]
+        self.report_dialog = open_text_dialog(
+            self.report_dialog, "POLAR REPORT",
+            f"Build the polar report for run {os.path.basename(self.report_run_dir)} as:", buttons)
+    
+    def start_report(self, run_dir, fmt):
+        """Kick off a report in the worker process"""
+        if self.report_dialog:
+            self.report_dialog.dismiss()
+        self.reports.generate(run_dir, fmt)
+    
+    def update_report_display(self):
+        """Mirror report progress on its progress bar"""
+        progress, status, message = self.reports.get_state()
+        if status == 'running':
+            self.report_progress.opacity = 1
+            self.report_progress.value = progress * 100
+        elif status != self.last_report_status:
+            self.report_progress.opacity = 0
+            toast(message)
+        self.last_report_status = status
+    
+    def start_tare(self):
+        """Zero the balance and pressure sensors (fan must be at 0)"""
+        if not self.tare:
+            return
+        self.tare.start(self.simulator.fan_speed)
+        toast(self.tare.get_state()[1])
+    
+    def update_tare_display(self):
+        """Report the outcome of a running tare"""
+        state, message = self.tare.get_state()
+        if state != self.last_tare_state and state in ('done', 'failed'):
+            toast(message)
+        self.last_tare_state = state
+    
+    def show_capture_dialog(self):
+        """Arm a triggered capture from one of the preset triggers"""
+        if not self.capture:
+            return
+        buttons = None
+        if self.capture_dialog is None:
+            presets = (
+                ("STALL", lambda: AlarmTrigger('stall')),
+                ("AOA 15°", lambda: EdgeTrigger('angle_of_attack', 15, slope='rising')),
+                ("FAN STEP", lambda: StepTrigger('fan_speed', 5)),
+            )
+            buttons = [MDRaisedButton(text=label,
+                                      on_release=lambda x, make=make: self.arm_capture(make()))
+                       for label, make in presets]
+            buttons.append(MDRaisedButton(text="DISARM", on_release=lambda x: self.arm_capture(None)))
+        
+        status = self.capture.get_status()
+        lines = [f"State: {status['state']}" +
+                 (f" on {status['trigger']}" if status['trigger'] else ""),
+                 f"Captures: {status['captures']}  (2 s before, 3 s after the trigger)"]
+        if status['last_run_id']:
+            lines.append(f"Last saved as run {status['last_run_id']}")
+        self.capture_dialog = open_text_dialog(self.capture_dialog, "TRIGGERED CAPTURE",
+                                               "\n".join(lines), buttons)
+    
+    def arm_capture(self, trigger):
+        """Arm the capture on trigger (None disarms)"""
+        if trigger is None:
+            self.capture.disarm()
+            toast("Capture disarmed")
+        else:
+            self.capture.arm(trigger, pre_seconds=2.0, post_seconds=3.0)
+            toast(f"Armed: {trigger.describe()}")
+        self.capture_dialog.dismiss()
+    
+    def update_capture_display(self):
+        """Report captures finished since the last update"""
+        count = self.capture.capture_count
+        if count != self.last_capture_count:
+            self.last_capture_count = count
+            toast("Capture complete - saving run")
+    
+    def increase_fan_speed(self, button, multiplier=1):
+        """Increase fan speed (or airspeed setpoint while holding)"""
+        self.step_fan(multiplier)
+    
+    def decrease_fan_speed(self, button, multiplier=1):
+        """Decrease fan speed (or airspeed setpoint while holding)"""
+        self.step_fan(-multiplier)
+    
+    def step_fan(self, steps):
+        """Move the fan (5% steps) or the airspeed setpoint (1 MPH steps)"""
+        if self.airspeed_hold and self.airspeed_hold.enabled:
+            if self.commands:
+                self.commands.adjust('airspeed_setpoint', steps, self.airspeed_hold.setpoint_mph)
+            else:
+                self.airspeed_hold.adjust_setpoint(steps, unit='mph')
+        else:
+            if self.commands:
+                self.commands.adjust('fan_speed', 5 * steps, self.simulator.fan_speed)
+            else:
+                self.simulator.adjust_fan_speed(5 * steps)
         self.update_fan_display()
     
     def update_fan_display(self):
-        """Update fan speed display"""
-        self.fan_speed_label.text = f"{self.simulator.fan_speed}%"
+        """Update fan speed display (showing queued setpoints immediately)"""
+        if self.airspeed_hold and self.airspeed_hold.enabled:
+            setpoint = self.commands.get_target('airspeed_setpoint') if self.commands else None
+            if setpoint is None:
+                setpoint = self.airspeed_hold.setpoint_mph
+            self.fan_speed_label.text = f"SET {setpoint:.0f} MPH"
+        else:
+            fan_speed = self.commands.get_target('fan_speed') if self.commands else None
+            if fan_speed is None:
+                fan_speed = self.simulator.fan_speed
+            self.fan_speed_label.text = f"{fan_speed:.0f}%"
+    
+    def toggle_airspeed_hold(self, button):
+        """Engage/disengage closed-loop airspeed hold"""
+        if self.commands:
+            # Queued setpoints belong to the mode being left
+            self.commands.cancel('fan_speed')
+            self.commands.cancel('airspeed_setpoint')
+        if self.airspeed_hold.enabled:
+            self.airspeed_hold.disengage()
+            self.hold_button.md_bg_color = (0.4, 0.4, 0.4, 1)
+        else:
+            # Hold the current airspeed, rounded to a whole MPH
+            data = self.get_latest_data()
+            self.airspeed_hold.engage(round(data['airspeed_mph']), unit='mph')
+            self.hold_button.md_bg_color = (0.2, 0.6, 1.0, 1)
+        self.update_fan_display()
     
     def toggle_simulation(self, button):
         """Toggle simulation start/stop"""
@@ -656,69 +1288,146 @@ class MaterialDashboardScreen(MDScreen):
             self.start_stop_button.text = "START"
             self.start_stop_button.icon = "play"
             self.start_stop_button.md_bg_color = (0.2, 0.8, 0.3, 1)
-            self.status_chip.text = "STOPPED"
-            self.status_chip.md_bg_color = (0.9, 0.3, 0.3, 1)
         else:
             self.simulator.start_simulation()
+            if self.statistics:
+                self.statistics.reset()
             self.start_stop_button.text = "STOP"
             self.start_stop_button.icon = "stop"
             self.start_stop_button.md_bg_color = (0.9, 0.3, 0.3, 1)
+        self.show_run_status()
+    
+    def show_run_status(self):
+        """Show RUNNING/STOPPED on the status chip"""
+        if self.simulator.is_running:
             self.status_chip.text = "RUNNING"
             self.status_chip.md_bg_color = (0.2, 0.8, 0.3, 1)
+        else:
+            self.status_chip.text = "STOPPED"
+            self.status_chip.md_bg_color = (0.9, 0.3, 0.3, 1)
+    
+    def update_alarm_display(self):
+        """Show the most severe active alarm on the status chip"""
+        self.alarm_engine.drain_events()
+        active = self.alarm_engine.get_active_alarms()
+        if active:
+            top = active[0]
+            self.status_chip.text = top.rule.label
+            if top.rule.severity == 'critical':
+                self.status_chip.md_bg_color = (0.9, 0.3, 0.3, 1)
+            else:
+                self.status_chip.md_bg_color = (1.0, 0.6, 0.2, 1)
+            self.alarm_shown = True
+        elif self.alarm_shown:
+            # Alarms cleared - go back to the run status
+            self.show_run_status()
+            self.alarm_shown = False
     
     def reset_simulation(self, button):
         """Reset simulation"""
+        if self.airspeed_hold and self.airspeed_hold.enabled:
+            self.toggle_airspeed_hold(button)
+        if self.commands:
+            self.commands.cancel('fan_speed')
         self.simulator.reset_simulation()
+        if self.statistics:
+            self.statistics.reset()
         self.update_fan_display()
         self.status_chip.text = "RESET"
         self.status_chip.md_bg_color = (1.0, 0.6, 0.2, 1)
     
     def go_back(self, button):
-        """Go back to mode selection"""
-        self.manager.current = 'mode_screen'
+        """Go back to mode selection (or the tunnel overview)"""
+        self.manager.current = self.back_screen
+    
+    def get_flow_target_fps(self):
+        """Frame rate the flow streaks must not drag the display below"""
+        if self.governor:
+            return min(self.governor.get_fps_cap(), FLOW_TARGET_FPS)
+        return FLOW_TARGET_FPS
     
     def on_enter(self):
         """Called when screen becomes active"""
-        self.update_event = Clock.schedule_interval(self.update_data, 0.1)
+        # Entered twice without leaving (e.g. re-selected) keeps one timer
+        if self.update_event is None:
+            # The built panels are kept between visits unless the layout changed
+            layout = self.layout_source.get()
+            if layout is not self.layout:
+                self.apply_layout(layout)
+            self.update_event = Clock.schedule_interval(self.update_data, 0.1)
+            self.flow_overlay.start()
+            if self.derived:
+                self.subscribed_derived = self.derived_channels()
+                self.derived.subscribe(*self.subscribed_derived)
         
         # Start simulation automatically
         self.simulator.start_simulation()
+        if self.statistics:
+            self.statistics.reset()
         self.start_stop_button.text = "STOP"
         self.start_stop_button.icon = "stop"
         self.start_stop_button.md_bg_color = (0.9, 0.3, 0.3, 1)
-        self.status_chip.text = "RUNNING"
-        self.status_chip.md_bg_color = (0.2, 0.8, 0.3, 1)
+        self.show_run_status()
         
-        print("📊 Material Design dashboard started")
+        log.debug("Dashboard active")
     
     def on_leave(self):
         """Called when leaving screen"""
         if self.update_event:
             self.update_event.cancel()
             self.update_event = None
-        print("👋 Dashboard stopped")
+            self.flow_overlay.stop()
+            if self.derived:
+                self.derived.unsubscribe(*self.subscribed_derived)
+        log.debug("Dashboard left")
+    
+    def get_latest_data(self):
+        """Latest sample from the acquisition loop, or poll the simulator"""
+        if self.acquisition and self.acquisition.is_active:
+            return self.acquisition.get_latest()
+        return self.simulator.get_all_data()
     
     def update_data(self, dt):
         """Update all displays with fresh data"""
-        data = self.simulator.get_all_data()
+        data = self.get_latest_data()
         
         # Update speed gauge
-        self.speed_gauge.update_speed(data['airspeed_mph'])
+        speed_changed = self.speed_gauge.update_speed(data['airspeed_mph'])
+        self.flow_overlay.set_flow(data['airspeed_ms'], data['angle_of_attack'])
+        
+        # Update layout gauges (derived channels are computed only while shown)
+        derived = self.derived.evaluate(data) if self.derived else {}
+        for spec, gauge in self.layout_gauges:
+            value = data.get(spec.channel, derived.get(spec.channel))
+            if value is not None:
+                gauge.update_value(value)
+        
+        # Update displays
+        self.runtime_readout.set_value(data["runtime"])
+        if self.derived:
+            self.cl_readout.set_value(derived['lift_coefficient'])
+            self.ld_readout.set_value(derived['lift_drag_ratio'])
+        self.update_fan_display()
         
-        # Update pressure gauges
-        self.static_pressure_gauge.update_value(data['pressure_static'])
-        self.dynamic_pressure_gauge.update_value(data['pressure_dynamic'])
+        # Let the governor know whether any gauge or the flow streaks visibly moved
+        if self.governor:
+            self.governor.notify_data(speed_changed or self.flow_overlay.is_moving or any(
+                gauge.is_animating for _, gauge in self.layout_gauges))
         
-        # Update angle of attack
-        self.aoa_gauge.update_value(data['angle_of_attack'])
+        # Update alarms
+        if self.alarm_engine:
+            self.update_alarm_display()
         
-        # Update forces
-        self.lift_gauge.update_value(data['lift_force'])
-        self.drag_gauge.update_value(data['drag_force'])
+        # Update export progress
+        if self.exporter:
+            self.update_export_display() 
+        if self.reports:
+            self.update_report_display()
         
-        # Update fan output
-        self.fan_output_gauge.update_value(data['fan_output'])
+        # Report tare completion
+        if self.tare:
+            self.update_tare_display()
         
-        # Update displays
-        self.runtime_label.text = f'Runtime: {data["runtime"]:.1f}s'
-        self.fan_speed_label.text = f"{self.simulator.fan_speed}%" 
\ No newline at end of file
+        # Report triggered captures
+        if self.capture:
+            self.update_capture_display()
\ No newline at end of file
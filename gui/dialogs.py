@@ -0,0 +1,36 @@
+"""
+Reusable Dialogs
+KivyMD dialogs leave kv bindings behind when discarded, so screens keep
+one dialog per purpose and only swap its contents
+"""
+
+from kivymd.uix.button import MDRaisedButton
+from kivymd.uix.dialog import MDDialog
+
+def open_text_dialog(dialog, title, text, buttons=None):
+    """
+    Show title/text in dialog, creating it (with a CLOSE button) if None
+    Returns the dialog for the caller to keep; opening one that is
+    already showing just updates its text.
+    """
+    if dialog is None:
+        close_button = MDRaisedButton(text="CLOSE")
+        dialog = MDDialog(title=title, text=text, buttons=(buttons or []) + [close_button])
+        close_button.bind(on_release=lambda x: dialog.dismiss())
+    else:
+        dialog.title = title
+        dialog.text = text
+    if dialog.parent is None:
+        reopen_dialog(dialog)
+    return dialog
+
+def reopen_dialog(dialog):
+    """Open a kept dialog without piling up ModalView's per-open bindings"""
+    # ModalView.open() fbinds these on every call and never unbinds them.
+    # _align_center is private to ModalView: checked against Kivy 2.3.1,
+    # hence the <2.4 pin in requirements.txt. Recheck this when raising it.
+    align_center = getattr(dialog, '_align_center', None)
+    if align_center is not None:
+        dialog.funbind('center', align_center)
+        dialog.funbind('size', align_center)
+    dialog.open()
@@ -0,0 +1,112 @@
+"""
+Flow Visualization Overlay
+Particles streaming around the airspeed dial, advected with NumPy
+All particles are drawn by one Mesh whose vertex buffer is updated in place
+"""
+
+import math
+import time
+
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Mesh
+from kivy.clock import Clock
+
+from gui.particles import ParticleField
+
+# Particle travel per m/s of airspeed, as a fraction of the widget width per second
+SPEED_SCALE = 0.05
+
+class FlowOverlay(Widget):
+    """
+    Animated flow streaks for the dashboard
+    set_flow() feeds the live airspeed (m/s) and angle of attack. Runs
+    every frame between start() and stop(); the particle count adapts
+    between min_particles and the field capacity so the measured cost of
+    advecting and uploading stays within budget_share of a frame at
+    target_fps (a number or a callable, e.g. the governor's current cap).
+    """
+
+    def __init__(self, capacity=4000, min_particles=250, target_fps=30.0,
+                 budget_share=0.25, color=(0.6, 0.8, 1.0, 0.35), radius_ratio=0.4,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.field = ParticleField(capacity)
+        self.min_particles = min(min_particles, capacity)
+        self.target_fps = target_fps
+        self.budget_share = budget_share
+        self.radius_ratio = radius_ratio  # Obstacle radius as a fraction of min(size)
+        self.airspeed_ms = 0.0
+        self.angle = 0.0
+        self.work_time = None  # Smoothed cost of one step + upload (s)
+        self.next_adapt = 0.0
+        self.update_event = None
+        with self.canvas:
+            Color(*color)
+            self.mesh = Mesh(mode='lines', fmt=[(b'vPosition', 2, 'float'),
+                                                (b'vTexCoords0', 2, 'float')],
+                             vertices=self.field.vertices,
+                             indices=self.field.indices[:2 * self.field.count])
+        self.bind(size=self.on_layout, pos=self.on_layout)
+        self.on_layout()
+
+    def on_layout(self, *args):
+        self.field.resize(self.width, self.height, min(self.size) * self.radius_ratio,
+                          origin=self.center)
+        self.redraw()
+
+    def set_flow(self, airspeed_ms, angle_of_attack):
+        self.airspeed_ms = airspeed_ms
+        self.angle = math.radians(angle_of_attack)
+
+    def start(self):
+        if self.update_event is None:
+            self.work_time = None
+            self.update_event = Clock.schedule_interval(self.update, 0)
+
+    def stop(self):
+        if self.update_event is not None:
+            self.update_event.cancel()
+            self.update_event = None
+
+    @property
+    def is_moving(self):
+        """True while the streaks animate (the display must keep its frame rate)"""
+        return self.update_event is not None and self.airspeed_ms > 0
+
+    def get_target_fps(self):
+        return self.target_fps() if callable(self.target_fps) else self.target_fps
+
+    def update(self, dt):
+        """Per-frame: advect and upload, then adapt the particle count"""
+        if dt <= 0:
+            return
+        speed = self.airspeed_ms * SPEED_SCALE * self.width
+        if speed <= 0.0:
+            return  # Nothing moves; keep the last frame
+        started = time.perf_counter()
+        self.field.step(min(dt, 0.1), speed, self.angle)
+        self.redraw()
+        self.adapt(time.perf_counter() - started, dt)
+
+    def adapt(self, cost, dt):
+        """Shed particles when their work overruns the budget, add them back when there's headroom"""
+        # Measured cost, not dt: a capped (e.g. idle) frame rate isn't headroom
+        self.work_time = cost if self.work_time is None else self.work_time * 0.9 + cost * 0.1
+        self.next_adapt -= dt
+        if self.next_adapt > 0:
+            return
+        self.next_adapt = 1.0
+        budget = self.budget_share / self.get_target_fps()
+        field = self.field
+        if self.work_time > budget and field.count > self.min_particles:
+            field.count = max(self.min_particles, int(field.count * 0.8))
+        elif self.work_time < budget * 0.7 and field.count < field.capacity:
+            field.count = min(field.capacity, int(field.count * 1.1) + 1)
+        else:
+            return
+        self.mesh.indices = field.indices[:2 * field.count]
+
+    def redraw(self):
+        """Flag the vertex buffer as changed"""
+        # Same buffer, reassigned so Kivy re-uploads it
+        self.mesh.vertices = self.field.vertices
@@ -0,0 +1,70 @@
+"""
+Gauge Geometry Helpers
+Pure-Python point generation shared by the dashboard gauges
+Kept free of Kivy imports so it can be benchmarked headlessly
+"""
+
+import functools
+import math
+
+
+def arc_points(center_x, center_y, radius, start_angle, sweep_angle, steps):
+    """
+    Build a flat [x0, y0, x1, y1, ...] point list along a circular arc
+
+    Angles are in degrees. The arc is split into `steps` segments, so the
+    returned list holds steps + 1 points.
+    """
+    points = []
+    steps = max(int(steps), 1)
+    for i in range(steps + 1):
+        angle = math.radians(start_angle + (sweep_angle * i / steps))
+        points.extend([center_x + radius * math.cos(angle),
+                       center_y + radius * math.sin(angle)])
+    return points
+
+
+def progress_arc_points(center_x, center_y, radius, percentage,
+                        start_angle=135, total_sweep=270):
+    """Arc for a circular progress gauge, one segment per degree of sweep"""
+    sweep_angle = total_sweep * percentage
+    return arc_points(center_x, center_y, radius, start_angle, sweep_angle,
+                      max(int(sweep_angle), 1))
+
+
+def band_arc_points(center_x, center_y, radius, start_angle, from_deg, to_deg):
+    """Arc for a colored band covering whole degrees from_deg..to_deg"""
+    sweep = to_deg - from_deg
+    return arc_points(center_x, center_y, radius, start_angle + from_deg,
+                      sweep, sweep)
+
+
+@functools.lru_cache(maxsize=16)
+def unit_arc_table(start_angle, total_sweep):
+    """
+    Unit-circle (cos, sin) pairs at every whole degree of an arc
+
+    Shared by every gauge drawing the same arc, so repeated redraws only
+    scale and offset precomputed values instead of calling cos/sin.
+    """
+    return tuple((math.cos(math.radians(start_angle + degree)),
+                  math.sin(math.radians(start_angle + degree)))
+                 for degree in range(int(total_sweep) + 1))
+
+
+def cached_progress_arc_points(center_x, center_y, radius, percentage,
+                               start_angle=135, total_sweep=270):
+    """progress_arc_points using the shared unit_arc_table"""
+    table = unit_arc_table(start_angle, total_sweep)
+    sweep_angle = total_sweep * max(0.0, min(1.0, percentage))
+    whole = int(sweep_angle)
+    points = []
+    for cos_a, sin_a in table[:whole + 1]:
+        points.append(center_x + radius * cos_a)
+        points.append(center_y + radius * sin_a)
+    if sweep_angle > whole or whole == 0:
+        # Exact end point for the fractional last degree
+        angle = math.radians(start_angle + max(sweep_angle, 1))
+        points.append(center_x + radius * math.cos(angle))
+        points.append(center_y + radius * math.sin(angle))
+    return points
@@ -0,0 +1,134 @@
+"""
+Adaptive Frame-Rate Governor
+Lowers the Kivy frame rate while the display is idle to save power
+Snaps back to full rate on touch or data change
+"""
+
+import time
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+from logic.eventlog import get_logger, fields
+
+log = get_logger('governor')
+
+# Frame-rate cap for each level, most to least active
+LEVEL_FPS = {
+    'active': 60,
+    'reduced': 20,
+    'idle': 5,
+}
+LEVELS = tuple(LEVEL_FPS)
+
+class FrameRateGovernor:
+    """
+    Chooses a frame-rate cap from recent activity
+    - active:  recently touched, or data changing with someone at the screen
+    - reduced: data changing but nobody has touched the screen for a while
+    - idle:    simulation stopped or nothing visibly changing
+    Touches and data changes raise the level immediately; lowering waits
+    for the periodic evaluation. Achieved FPS and process CPU time are
+    reported once a minute.
+    """
+
+    def __init__(self, simulators, settle_seconds=3.0, unattended_seconds=120.0,
+                 report_seconds=60.0, level_fps=None):
+        # One or more data sources; idle only when none of them is running
+        self.simulators = simulators if isinstance(simulators, (list, tuple)) else [simulators]
+        self.settle_seconds = settle_seconds
+        self.unattended_seconds = unattended_seconds
+        self.report_seconds = report_seconds
+        self.level_fps = dict(LEVEL_FPS, **(level_fps or {}))
+        self.level = None
+        self.last_touch = time.monotonic()
+        self.last_change = self.last_touch
+        self.frames = 0
+        self.level_changes = 0
+        self.report = {}
+        self.evaluate_event = None
+        self.report_event = None
+        self._report_start = None
+
+    def start(self):
+        """Hook window input/flips and begin governing"""
+        Window.bind(on_motion=self.on_input, on_key_down=self.on_input, on_flip=self.count_frame)
+        self.evaluate_event = Clock.schedule_interval(self.evaluate, 0.5)
+        self.report_event = Clock.schedule_interval(self.log_report, self.report_seconds)
+        self._report_start = (time.monotonic(), time.process_time(), 0)
+        self.set_level('active')
+
+    def stop(self):
+        """Restore full frame rate and unhook"""
+        for event in (self.evaluate_event, self.report_event):
+            if event:
+                event.cancel()
+        self.evaluate_event = self.report_event = None
+        Window.unbind(on_motion=self.on_input, on_key_down=self.on_input, on_flip=self.count_frame)
+        self.set_level('active')
+
+    def on_input(self, *args):
+        """Any touch, mouse or key event wakes the display (never consumes it)"""
+        self.last_touch = time.monotonic()
+        if self.level != 'active':
+            self.set_level('active')
+
+    def notify_data(self, changed):
+        """Called per UI update with whether anything visibly changed"""
+        if not changed:
+            return
+        now = time.monotonic()
+        self.last_change = now
+        level = self.choose_level(now)
+        if LEVELS.index(level) < LEVELS.index(self.level):
+            self.set_level(level)
+
+    def choose_level(self, now):
+        if now - self.last_touch < self.settle_seconds:
+            return 'active'
+        running = any(simulator.is_running for simulator in self.simulators)
+        if not running or now - self.last_change >= self.settle_seconds:
+            return 'idle'
+        if now - self.last_touch >= self.unattended_seconds:
+            return 'reduced'
+        return 'active'
+
+    def evaluate(self, dt):
+        level = self.choose_level(time.monotonic())
+        if level != self.level:
+            self.set_level(level)
+
+    def set_level(self, level):
+        if level != self.level:
+            self.level_changes += 1
+        self.level = level
+        # Kivy has no public setter for the running frame cap; the clock
+        # reads _max_fps (initialised from graphics.maxfps) every frame
+        Clock._max_fps = float(self.level_fps[level])
+
+    def get_fps_cap(self):
+        """Frame-rate cap of the current level"""
+        return self.level_fps[self.level or LEVELS[0]]
+
+    def count_frame(self, *args):
+        self.frames += 1
+
+    def log_report(self, dt):
+        """Summarize achieved FPS and CPU use since the last report"""
+        now, cpu = time.monotonic(), time.process_time()
+        start, start_cpu, start_frames = self._report_start
+        elapsed = max(now - start, 1e-6)
+        self.report = {
+            'fps': (self.frames - start_frames) / elapsed,
+            'cpu_seconds_per_minute': (cpu - start_cpu) * 60.0 / elapsed,
+            'level': self.level,
+            'level_changes': self.level_changes,
+        }
+        self._report_start = (now, cpu, self.frames)
+        self.level_changes = 0
+        log.info("Display: %.1f fps (%s), CPU %.1f s/min", self.report['fps'], self.level,
+                 self.report['cpu_seconds_per_minute'], extra=fields(**self.report))
+
+    def get_report(self):
+        """Latest per-minute report (empty until the first minute passes)"""
+        return dict(self.report)
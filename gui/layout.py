@@ -0,0 +1,203 @@
+"""
+Declarative Dashboard Layout
+Gauge panels described as data, validated once and built by the dashboard
+Kept free of Kivy imports so layouts can be checked headlessly
+"""
+
+import contextlib
+import json
+import os
+import time
+
+from logic.eventlog import get_logger, fields
+
+log = get_logger('layout')
+
+GAUGE_KINDS = ('circular',)
+
+# Where a panel goes: the center column, or above the system data card
+SLOTS = ('center', 'right')
+
+class GaugeSpec:
+    """One gauge: the channel it shows, its type, scale and styling"""
+
+    def __init__(self, channel, title="", unit="", min_val=0, max_val=100,
+                 color=(0.2, 0.6, 1.0, 1), kind='circular'):
+        self.channel = channel
+        self.title = title
+        self.unit = unit
+        self.min_val = min_val
+        self.max_val = max_val
+        self.color = tuple(color)
+        self.kind = kind
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+    def to_dict(self):
+        return {'channel': self.channel, 'title': self.title, 'unit': self.unit,
+                'min_val': self.min_val, 'max_val': self.max_val,
+                'color': list(self.color), 'kind': self.kind}
+
+    def problems(self):
+        """Reasons this gauge can't be built (empty when valid)"""
+        problems = []
+        if not self.channel:
+            problems.append("gauge without a channel")
+        if self.kind not in GAUGE_KINDS:
+            problems.append(f"{self.channel}: unknown gauge kind '{self.kind}'")
+        if not self.min_val < self.max_val:
+            problems.append(f"{self.channel}: range {self.min_val}..{self.max_val} is empty")
+        if len(self.color) not in (3, 4) or not all(0 <= c <= 1 for c in self.color):
+            problems.append(f"{self.channel}: color must be 3 or 4 components in 0..1")
+        return problems
+
+class PanelSpec:
+    """A card of gauges in a grid, optionally titled"""
+
+    def __init__(self, name, gauges, title="", cols=1, slot='center', size_hint=1.0):
+        self.name = name
+        self.gauges = list(gauges)
+        self.title = title
+        self.cols = cols
+        self.slot = slot
+        self.size_hint = size_hint  # Share of its slot's height
+
+    @classmethod
+    def from_dict(cls, values):
+        values = dict(values)
+        values['gauges'] = [GaugeSpec.from_dict(gauge) for gauge in values.get('gauges', [])]
+        return cls(**values)
+
+    def to_dict(self):
+        return {'name': self.name, 'title': self.title, 'cols': self.cols, 'slot': self.slot,
+                'size_hint': self.size_hint,
+                'gauges': [gauge.to_dict() for gauge in self.gauges]}
+
+class DashboardLayout:
+    """
+    The dashboard's gauge panels plus a construction time budget
+    validate() runs once per layout object; building a dashboard from an
+    already validated layout skips the checks.
+    """
+
+    def __init__(self, panels, budget_ms=250.0):
+        self.panels = list(panels)
+        self.budget_ms = budget_ms  # Warn when building a dashboard takes longer
+        self.validated = False
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls([PanelSpec.from_dict(panel) for panel in values.get('panels', [])],
+                   budget_ms=values.get('budget_ms', 250.0))
+
+    def to_dict(self):
+        return {'budget_ms': self.budget_ms, 'panels': [panel.to_dict() for panel in self.panels]}
+
+    @property
+    def gauges(self):
+        return [gauge for panel in self.panels for gauge in panel.gauges]
+
+    def panels_in(self, slot):
+        return [panel for panel in self.panels if panel.slot == slot]
+
+    def unknown_channels(self, known):
+        """Gauge channels not in known, in layout order"""
+        return [gauge.channel for gauge in self.gauges if gauge.channel not in known]
+
+    def validate(self):
+        """Raise ValueError listing every problem; returns the layout"""
+        if self.validated:
+            return self
+        problems = []
+        names = set()
+        for panel in self.panels:
+            if panel.name in names:
+                problems.append(f"duplicate panel '{panel.name}'")
+            names.add(panel.name)
+            if panel.slot not in SLOTS:
+                problems.append(f"panel '{panel.name}': unknown slot '{panel.slot}'")
+            if not isinstance(panel.cols, int) or panel.cols < 1:
+                problems.append(f"panel '{panel.name}': cols must be a positive integer")
+            if not panel.gauges:
+                problems.append(f"panel '{panel.name}' has no gauges")
+            for gauge in panel.gauges:
+                problems += gauge.problems()
+        if problems:
+            raise ValueError("Invalid dashboard layout: " + "; ".join(problems))
+        self.validated = True
+        return self
+
+def build_default_layout():
+    """Pressure, angle of attack and fan output in the center; forces on the right"""
+    return DashboardLayout([
+        PanelSpec('gauges', cols=2, gauges=[
+            GaugeSpec('pressure_static', "STATIC P", "hPa", 1000, 1030, (0.2, 0.6, 1.0, 1)),
+            GaugeSpec('pressure_dynamic', "DYNAMIC P", "hPa", 1000, 1030, (1.0, 0.6, 0.2, 1)),
+            GaugeSpec('angle_of_attack', "AOA", "deg", -20, 20, (0.2, 0.8, 0.3, 1)),
+            GaugeSpec('fan_output', "FAN OUT", "%", 0, 100, (0.2, 0.6, 1.0, 1)),
+        ]),
+        PanelSpec('forces', title="FORCES", slot='right', size_hint=0.6, gauges=[
+            GaugeSpec('lift_force', "LIFT", "N", -2, 8, (0.2, 0.8, 0.3, 1)),
+            GaugeSpec('drag_force', "DRAG", "N", 0, 3, (1.0, 0.3, 0.3, 1)),
+        ]),
+    ])
+
+class LayoutSource:
+    """
+    Supplies the dashboard layout, validated once per change
+    Without a path it is the built-in default. With one, the JSON file is
+    re-read only when its modification time changes, so a layout can be
+    tuned while the app runs; an invalid file is logged and the last good
+    layout kept.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.mtime = None
+        self.layout = build_default_layout().validate()
+        self.get()
+
+    def get(self):
+        if not self.path:
+            return self.layout
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime != self.mtime:
+                self.mtime = mtime
+                with open(self.path) as f:
+                    self.layout = DashboardLayout.from_dict(json.load(f)).validate()
+                log.info("Dashboard layout loaded from %s", self.path)
+        except (OSError, ValueError, TypeError) as e:
+            log.error("Dashboard layout %s not used: %s", self.path, e)
+        return self.layout
+
+class ConstructionTimer:
+    """Wall time spent building each part of a screen, in milliseconds"""
+
+    def __init__(self):
+        self.times = {}
+
+    @contextlib.contextmanager
+    def measure(self, part):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000.0
+            self.times[part] = self.times.get(part, 0.0) + elapsed
+
+    @property
+    def total(self):
+        return sum(self.times.values())
+
+    def report(self, screen, budget_ms=None):
+        """Log the per-part times, as a warning when over budget"""
+        parts = ", ".join(f"{part} {ms:.0f}" for part, ms in self.times.items())
+        over = budget_ms is not None and self.total > budget_ms
+        (log.warning if over else log.info)(
+            "%s built in %.0f ms%s (%s)", screen, self.total,
+            f", over the {budget_ms:.0f} ms budget" if over else "", parts,
+            extra=fields(screen=screen, total_ms=round(self.total, 1),
+                         **{f"{part}_ms": round(ms, 1) for part, ms in self.times.items()}))
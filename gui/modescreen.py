@@ -13,20 +13,25 @@ from kivymd.uix.toolbar import MDTopAppBar
 from kivy.metrics import dp
 from kivy.app import App
 
+from logic.eventlog import get_logger
+
+log = get_logger('modescreen')
+
 class MaterialModeScreen(MDScreen):
     """
     Material Design mode selection screen
     Optimized for 7" touchscreen (800x480)
     """
     
-    def __init__(self, **kwargs):
+    def __init__(self, simulation_screen='dashboard', **kwargs):
         super().__init__(**kwargs)
         self.name = 'mode_screen'
+        self.simulation_screen = simulation_screen  # Dashboard, or the multi-tunnel overview
         
         # Create the layout
         self.create_layout()
         
-        print("📱 Material Design mode screen created - 800×480 optimized")
+        log.debug("Mode screen created")
     
     def create_layout(self):
         """Create the Material Design layout"""
@@ -135,7 +140,7 @@ class MaterialModeScreen(MDScreen):
         
         buttons_layout = MDBoxLayout(
             orientation='vertical',
-            spacing=dp(16),
+            spacing=dp(12),
             adaptive_height=True
         )
         
@@ -147,13 +152,28 @@ class MaterialModeScreen(MDScreen):
             icon_color=(1, 1, 1, 1),
             md_bg_color=(0.2, 0.8, 0.3, 1),  # Green
             size_hint_y=None,
-            height=dp(64),
+            height=dp(52),
             font_size=dp(18),
             elevation=dp(8)
         )
         simulation_button.bind(on_press=self.start_simulation)
         buttons_layout.add_widget(simulation_button)
         
+        # Run Browser Button
+        browser_button = MDRaisedButton(
+            text="RUN BROWSER",
+            icon="database-search",
+            theme_icon_color="Custom",
+            icon_color=(1, 1, 1, 1),
+            md_bg_color=(0.2, 0.6, 1.0, 1),  # Blue
+            size_hint_y=None,
+            height=dp(52),
+            font_size=dp(18),
+            elevation=dp(8)
+        )
+        browser_button.bind(on_press=self.open_run_browser)
+        buttons_layout.add_widget(browser_button)
+        
         # Exit Button
         exit_button = MDRaisedButton(
             text="EXIT APPLICATION",
@@ -162,7 +182,7 @@ class MaterialModeScreen(MDScreen):
             icon_color=(1, 1, 1, 1),
             md_bg_color=(0.9, 0.3, 0.3, 1),  # Red
             size_hint_y=None,
-            height=dp(64),
+            height=dp(52),
             font_size=dp(18),
             elevation=dp(8)
         )
@@ -208,18 +228,23 @@ class MaterialModeScreen(MDScreen):
     
     def start_simulation(self, button):
         """Start simulation mode"""
-        print("📊 User selected Simulation Mode")
-        self.manager.current = 'dashboard'
+        log.info("User selected Simulation Mode")
+        self.manager.current = self.simulation_screen
+    
+    def open_run_browser(self, button):
+        """Open the recorded run browser"""
+        log.info("User selected Run Browser")
+        self.manager.current = 'run_browser'
     
     def exit_app(self, button):
         """Exit the application"""
-        print("🚪 User selected Exit")
+        log.info("User selected Exit")
         App.get_running_app().stop()
     
     def on_enter(self):
         """Called when entering the screen"""
-        print("🏠 Material Design mode selection active")
+        log.debug("Mode selection active")
     
     def on_leave(self):
         """Called when leaving the screen"""
-        print("👋 Leaving mode selection screen") 
\ No newline at end of file
+        log.debug("Leaving mode selection screen")
\ No newline at end of file
@@ -0,0 +1,248 @@
+"""
+Material Design Tunnel Overview Screen
+Compact mini gauges for every hosted tunnel; tap one for its dashboard
+Optimized for 800x480 touchscreen with up to eight tunnels
+"""
+
+from collections import OrderedDict
+
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.gridlayout import MDGridLayout
+from kivymd.uix.label import MDLabel
+from kivymd.uix.card import MDCard
+from kivymd.uix.toolbar import MDTopAppBar
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Line, Ellipse, Rectangle, Fbo, ClearColor, ClearBuffers
+from kivy.metrics import dp
+from kivy.clock import Clock
+
+from logic.eventlog import get_logger
+from gui.readout import NumericReadout
+from gui.geometry import cached_progress_arc_points
+
+log = get_logger('overview')
+
+# Tile background by tunnel state
+TILE_COLORS = {
+    'running': (0.12, 0.12, 0.12, 1),
+    'stopped': (0.2, 0.2, 0.2, 1),
+    'alarm': (0.45, 0.1, 0.1, 1),
+}
+
+class MiniTunnelGauge(Widget):
+    """
+    Compact airspeed arc for one tunnel
+    The dial artwork is rendered once per size into an Fbo whose texture
+    every mini gauge of that size shares; the arc is built from the shared
+    unit-circle table in gui.geometry. Only the most recently used sizes
+    are kept, so layout passes and window resizes don't pile up textures.
+    """
+
+    MAX_STATIC_LAYERS = 4
+    _static_layers = OrderedDict()  # (width, height) -> Fbo, least recently used first
+
+    def __init__(self, max_speed=60.0, arc_color=(0.2, 0.6, 1.0, 1), **kwargs):
+        super().__init__(**kwargs)
+        self.max_speed = max_speed
+        self.speed = 0.0
+
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self.static_rect = Rectangle(size=(0, 0))
+            Color(*arc_color)
+            self.arc_line = Line(points=[], width=dp(6))
+
+        self.speed_readout = NumericReadout(
+            font_style="H6",
+            decimals=1,
+            size_hint=(None, None),
+            size=(dp(80), dp(28))
+        )
+        self.add_widget(self.speed_readout)
+        self.bind(pos=self.update_layout, size=self.update_layout)
+
+    @classmethod
+    def static_layer(cls, size):
+        """Shared dial texture for a gauge size, rendered on first use"""
+        layers = cls._static_layers
+        if size in layers:
+            layers.move_to_end(size)
+        else:
+            fbo = Fbo(size=size)
+            radius = min(size) * 0.42
+            center_x, center_y = size[0] / 2, size[1] / 2
+            with fbo:
+                ClearColor(0, 0, 0, 0)
+                ClearBuffers()
+                Color(0.1, 0.1, 0.1, 0.8)
+                Ellipse(pos=(center_x - radius, center_y - radius), size=(radius * 2, radius * 2))
+                Color(0.3, 0.3, 0.3, 0.3)
+                Line(circle=(center_x, center_y, radius * 0.85), width=dp(4))
+            fbo.draw()
+            layers[size] = fbo
+            while len(layers) > cls.MAX_STATIC_LAYERS:
+                # Gauges still showing an evicted size re-fetch on their next layout
+                layers.popitem(last=False)
+        return layers[size]
+
+    def update_layout(self, *args):
+        if self.width <= 0 or self.height <= 0:
+            return
+        size = (int(self.width), int(self.height))
+        fbo = self.static_layer(size)
+        self.static_rect.texture = fbo.texture
+        self.static_rect.size = size
+        self.static_rect.pos = (int(self.x), int(self.y))
+        self.speed_readout.center = self.center
+        self.update_arc()
+
+    def update_arc(self):
+        radius = min(self.size) * 0.42 * 0.85
+        points = cached_progress_arc_points(self.center_x, self.center_y, radius,
+                                             self.speed / self.max_speed)
+        self.arc_line.points = points if self.speed > 0 else []
+
+    def set_speed(self, speed):
+        """Returns True if the displayed value changed"""
+        previous = self.speed_readout.text
+        self.speed_readout.set_value(speed)
+        changed = self.speed_readout.text != previous
+        if changed:
+            self.speed = speed
+            self.update_arc()
+        return changed
+
+class TunnelTile(MDCard):
+    """One tunnel: name, mini airspeed gauge, AoA and lift readouts"""
+
+    def __init__(self, tunnel, **kwargs):
+        super().__init__(
+            orientation='vertical',
+            padding=dp(6),
+            spacing=dp(2),
+            radius=[dp(8)],
+            elevation=dp(2),
+            md_bg_color=TILE_COLORS['stopped'],
+            **kwargs
+        )
+        self.tunnel = tunnel
+        self.tunnel_state = None
+
+        self.add_widget(MDLabel(
+            text=tunnel.name.upper(),
+            theme_text_color="Custom",
+            text_color=(1, 1, 1, 1),  # White text
+            font_style="Subtitle2",
+            size_hint_y=None,
+            height=dp(20),
+            halign="center"
+        ))
+
+        self.gauge = MiniTunnelGauge()
+        self.add_widget(self.gauge)
+
+        readouts = MDBoxLayout(orientation='horizontal', size_hint_y=None, height=dp(18))
+        self.aoa_readout = NumericReadout(font_style="Caption", decimals=1,
+                                          prefix="AoA ", unit="°", color=(0.8, 0.8, 0.8, 1))
+        readouts.add_widget(self.aoa_readout)
+        self.lift_readout = NumericReadout(font_style="Caption", decimals=2,
+                                           prefix="L ", unit=" N", color=(0.8, 0.8, 0.8, 1))
+        readouts.add_widget(self.lift_readout)
+        self.add_widget(readouts)
+
+    def refresh(self):
+        """Pull the tunnel's latest sample; returns True if anything changed"""
+        data = self.tunnel.get_latest()
+        changed = self.gauge.set_speed(data['airspeed_mph'])
+        self.aoa_readout.set_value(data['angle_of_attack'])
+        self.lift_readout.set_value(data['lift_force'])
+
+        if self.tunnel.has_alarm:
+            state = 'alarm'
+        elif self.tunnel.simulator.is_running:
+            state = 'running'
+        else:
+            state = 'stopped'
+        if state != self.tunnel_state:
+            # Only touch the card's canvas when the state actually flips
+            self.tunnel_state = state
+            self.md_bg_color = TILE_COLORS[state]
+            changed = True
+        return changed
+
+class MaterialOverviewScreen(MDScreen):
+    """
+    Material Design multi-tunnel overview
+    One timer refreshes every tile; tapping a tile opens that tunnel's
+    dashboard through the on_select(index) callback.
+    """
+
+    def __init__(self, tunnels, on_select, governor=None, **kwargs):
+        super().__init__(**kwargs)
+        self.name = 'overview'
+        self.tunnels = tunnels
+        self.on_select = on_select
+        self.governor = governor
+        self.update_event = None
+
+        self.create_layout()
+
+        log.debug("Tunnel overview created - %d tunnels", len(tunnels))
+
+    def create_layout(self):
+        """Create overview layout"""
+        main_layout = MDBoxLayout(
+            orientation='vertical',
+            spacing=dp(8),
+            padding=dp(12)
+        )
+
+        # Top toolbar
+        toolbar = MDTopAppBar(
+            title="Tunnel Overview",
+            left_action_items=[["arrow-left", lambda x: self.go_back(x)]],
+            elevation=dp(4)
+        )
+        toolbar.size_hint_y = None
+        toolbar.height = dp(56)
+        main_layout.add_widget(toolbar)
+
+        # Tiles, four per row on the 800 px wide screen
+        grid = MDGridLayout(
+            cols=min(4, max(1, len(self.tunnels))),
+            spacing=dp(8)
+        )
+        self.tiles = []
+        for index, tunnel in enumerate(self.tunnels):
+            tile = TunnelTile(tunnel, on_release=lambda x, index=index: self.on_select(index))
+            self.tiles.append(tile)
+            grid.add_widget(tile)
+        main_layout.add_widget(grid)
+
+        self.add_widget(main_layout)
+
+    def update_tiles(self, dt):
+        """Refresh every tile from its tunnel"""
+        changed = False
+        for tile in self.tiles:
+            changed = tile.refresh() or changed
+        if self.governor:
+            self.governor.notify_data(changed)
+
+    def go_back(self, button):
+        """Go back to mode selection"""
+        self.manager.current = 'mode_screen'
+
+    def on_enter(self):
+        """Called when screen becomes active"""
+        self.update_tiles(0)
+        if self.update_event is None:
+            self.update_event = Clock.schedule_interval(self.update_tiles, 0.2)
+        log.debug("Tunnel overview active")
+
+    def on_leave(self):
+        """Called when leaving screen"""
+        if self.update_event:
+            self.update_event.cancel()
+            self.update_event = None
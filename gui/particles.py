@@ -0,0 +1,98 @@
+"""
+Flow Particle Field
+NumPy advection behind the dashboard's flow overlay
+Kept free of Kivy imports so it can be benchmarked headlessly
+"""
+
+import math
+
+import numpy as np
+
+# Streak length: the distance a particle covers in this many seconds
+TRAIL_SECONDS = 0.08
+
+class ParticleField:
+    """
+    Particles advected through potential flow around a cylinder
+    The free stream comes from the left, turned by the angle of attack,
+    and parts around a cylinder of `radius` at the origin (the dial).
+    Positions are pixels relative to the center (origin). Each particle is
+    written as a two-vertex streak into a float32 vertex array that a
+    Mesh uses directly, so no per-frame Python lists are built.
+    """
+
+    def __init__(self, capacity=4000, seed=0):
+        self.capacity = capacity
+        self.count = capacity
+        self.random = np.random.default_rng(seed)
+        self.positions = np.zeros((capacity, 2))
+        self.ages = np.zeros(capacity)
+        self.lifetimes = self.random.uniform(1.0, 3.0, capacity)
+        self.half_size = np.ones(2)
+        self.radius = 0.0
+        self.origin = np.zeros(2)  # Where the center sits in drawing coordinates
+        # x, y, u, v per vertex; two vertices (tail, head) per particle
+        self.vertices = np.zeros(capacity * 2 * 4, dtype=np.float32)
+        self.indices = np.arange(capacity * 2, dtype=np.uint16)
+        self._streaks = self.vertices.reshape(capacity, 2, 4)
+
+    def resize(self, width, height, radius, origin=(0.0, 0.0)):
+        """New domain size and position; particles are scattered afresh"""
+        self.half_size = np.array([width / 2, height / 2])
+        self.radius = radius
+        self.origin = np.array(origin, dtype=float)
+        self.respawn(np.ones(self.capacity, dtype=bool))
+        self.ages[:] = self.random.uniform(0, 1, self.capacity) * self.lifetimes
+        self.write_streaks(self.positions, np.zeros_like(self.positions))
+
+    def respawn(self, mask):
+        """Scatter the masked particles uniformly outside the cylinder"""
+        count = int(mask.sum())
+        if count == 0:
+            return
+        points = self.random.uniform(-1, 1, (count, 2)) * self.half_size
+        # Points landing inside the cylinder are pushed out to its rim
+        distance = np.hypot(points[:, 0], points[:, 1])
+        inside = distance < self.radius
+        if inside.any():
+            points[inside] *= (self.radius * 1.02 / np.maximum(distance[inside], 1e-6))[:, None]
+        self.positions[mask] = points
+        self.ages[mask] = 0.0
+
+    def velocity(self, points, speed, angle):
+        """Flow velocity (pixels/s) at points for free-stream speed and angle (radians)"""
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        # Rotate into the free-stream frame
+        x = points[:, 0] * cos_a + points[:, 1] * sin_a
+        y = points[:, 1] * cos_a - points[:, 0] * sin_a
+        r2 = np.maximum(x * x + y * y, 1e-6)
+        k = self.radius * self.radius / (r2 * r2)
+        u = speed * (1.0 - k * (x * x - y * y))
+        v = -speed * 2.0 * k * x * y
+        # And back
+        return np.column_stack((u * cos_a - v * sin_a, u * sin_a + v * cos_a))
+
+    def step(self, dt, speed, angle):
+        """Advance active particles dt seconds and rewrite their streaks"""
+        n = self.count
+        positions = self.positions[:n]
+        velocity = self.velocity(positions, speed, angle)
+        positions += velocity * dt
+        self.ages[:n] += dt
+
+        outside = np.any(np.abs(positions) > self.half_size, axis=1)
+        inside = (positions[:, 0] ** 2 + positions[:, 1] ** 2) < self.radius ** 2
+        expired = self.ages[:n] > self.lifetimes[:n]
+        respawn = np.zeros(self.capacity, dtype=bool)
+        respawn[:n] = outside | inside | expired
+        if respawn.any():
+            self.respawn(respawn)
+            velocity[respawn[:n]] = 0.0
+
+        self.write_streaks(positions, velocity)
+
+    def write_streaks(self, positions, velocity):
+        """Tail and head vertices of the first len(positions) particles"""
+        n = len(positions)
+        self._streaks[:n, 1, :2] = positions + self.origin
+        self._streaks[:n, 0, :2] = self._streaks[:n, 1, :2] - velocity * TRAIL_SECONDS
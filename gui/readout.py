@@ -0,0 +1,149 @@
+"""
+Glyph Atlas Numeric Readouts
+Values drawn as textured quads from a shared pre-rasterized glyph atlas
+Updating a readout moves a few quads instead of re-rendering text
+"""
+
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Rectangle, InstructionGroup
+from kivy.core.text import Label as CoreLabel
+from kivy.metrics import sp
+from kivy.app import App
+
+# Characters a formatted float can contain (including nan/inf)
+NUMERIC_GLYPHS = "0123456789+-.naif"
+
+# Gap between atlas entries so neighbouring glyphs never bleed into each other
+ATLAS_SEPARATOR = "   "
+
+
+class GlyphAtlas:
+    """
+    One texture holding the numeric glyphs plus whole prefix/unit strings
+    The atlas is a single rendered line; each entry is a full-height
+    region of it, located from the font's own text extents.
+    """
+
+    _atlases = {}
+
+    @classmethod
+    def for_font_style(cls, font_style):
+        """Shared atlas for a KivyMD font style (e.g. 'H5')"""
+        if font_style not in cls._atlases:
+            font_name, font_size = App.get_running_app().theme_cls.font_styles[font_style][:2]
+            cls._atlases[font_style] = cls(font_name, sp(font_size))
+        return cls._atlases[font_style]
+
+    def __init__(self, font_name, font_size):
+        self.font_name = font_name
+        self.font_size = font_size
+        self.entries = list(NUMERIC_GLYPHS)
+        self.regions = {}
+        self.version = 0
+        self.texture = None
+        self.height = 0
+
+    def add_token(self, text):
+        """Register a multi-character string (unit, prefix) as one entry"""
+        if text and text not in self.entries:
+            self.entries.append(text)
+            self.texture = None  # Rebuilt on next use
+
+    def build(self):
+        """Rasterize every entry into a single texture"""
+        label = CoreLabel(text=ATLAS_SEPARATOR.join(self.entries),
+                          font_name=self.font_name, font_size=self.font_size)
+        label.refresh()
+        self.texture = label.texture
+        self.height = self.texture.height
+
+        measure = CoreLabel(font_name=self.font_name, font_size=self.font_size)
+        self.regions = {}
+        for i, entry in enumerate(self.entries):
+            x = measure.get_extents(ATLAS_SEPARATOR.join(self.entries[:i]) + ATLAS_SEPARATOR)[0] if i else 0
+            width = measure.get_extents(entry)[0]
+            self.regions[entry] = self.texture.get_region(x, 0, width, self.height)
+        self.version += 1
+
+    def region(self, entry):
+        """Texture region for an entry, or None if it is not in the atlas"""
+        if self.texture is None:
+            self.build()
+        return self.regions.get(entry)
+
+
+class NumericReadout(Widget):
+    """
+    Numeric display drawn from a GlyphAtlas
+    Shows prefix + value (fixed decimals) + unit. Setting the same
+    formatted text again costs nothing; a new value only reassigns the
+    textures and positions of the existing quads.
+    """
+
+    def __init__(self, font_style="H5", decimals=1, prefix="", unit="",
+                 color=(1, 1, 1, 1), halign="center", **kwargs):
+        super().__init__(**kwargs)
+        self.atlas = GlyphAtlas.for_font_style(font_style)
+        self.decimals = decimals
+        self.prefix = prefix
+        self.unit = unit
+        self.halign = halign
+        self.atlas.add_token(prefix)
+        self.atlas.add_token(unit)
+
+        self.text = None
+        self.tokens = []
+        self.atlas_version = None
+        self.quads = []
+
+        with self.canvas:
+            self.color = Color(*color)
+            self.glyph_group = InstructionGroup()
+
+        self.bind(pos=self.layout_glyphs, size=self.layout_glyphs)
+        self.set_text(f"{0:.{decimals}f}")
+
+    def set_value(self, value):
+        """Show a new value; only re-lays quads when the text changes"""
+        text = f"{value:.{self.decimals}f}"
+        if text == self.text and self.atlas_version == self.atlas.version:
+            return
+        self.set_text(text)
+        self.layout_glyphs()
+
+    def set_text(self, text):
+        """Set the numeric text without laying out (done on next layout)"""
+        self.text = text
+        self.tokens = ([self.prefix] if self.prefix else []) + list(text) + ([self.unit] if self.unit else [])
+
+    def layout_glyphs(self, *args):
+        """Assign atlas regions and positions to the quads"""
+        regions = [self.atlas.region(token) for token in self.tokens]
+        regions = [region for region in regions if region is not None]
+        self.atlas_version = self.atlas.version
+
+        while len(self.quads) < len(regions):
+            quad = Rectangle(size=(0, 0))
+            self.glyph_group.add(quad)
+            self.quads.append(quad)
+
+        # Computed from pos/size: the cached center/right aliases may not
+        # be refreshed yet while the pos binding fires
+        x, y = self.pos
+        width, height = self.size
+        total_width = sum(region.width for region in regions)
+        if self.halign == "right":
+            x += width - total_width
+        elif self.halign != "left":
+            x += (width - total_width) / 2
+        y += (height - self.atlas.height) / 2
+
+        for i, quad in enumerate(self.quads):
+            if i < len(regions):
+                region = regions[i]
+                quad.texture = region
+                quad.pos = (int(x), int(y))
+                quad.size = region.size
+                x += region.width
+            else:
+                quad.size = (0, 0)
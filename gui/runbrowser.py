@@ -0,0 +1,172 @@
+"""
+Material Design Run Browser Screen
+Searches recorded runs through the SQLite run catalog
+Optimized for 800x480 touchscreen
+"""
+
+import time
+
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.button import MDRaisedButton
+from kivymd.uix.label import MDLabel
+from kivymd.uix.card import MDCard
+from kivymd.uix.toolbar import MDTopAppBar
+from kivymd.uix.textfield import MDTextField
+from kivymd.uix.list import MDList, ThreeLineListItem
+from kivy.uix.scrollview import ScrollView
+from kivy.metrics import dp
+
+from logic.eventlog import get_logger
+from gui.dialogs import open_text_dialog
+
+log = get_logger('runbrowser')
+
+class MaterialRunBrowserScreen(MDScreen):
+    """
+    Material Design run browser
+    Filters by AoA range and peak lift using indexed catalog queries only
+    """
+
+    def __init__(self, catalog, **kwargs):
+        super().__init__(**kwargs)
+        self.name = 'run_browser'
+        self.catalog = catalog
+        self.details_dialog = None
+
+        # Create layout
+        self.create_layout()
+
+        log.debug("Run browser created")
+
+    def create_layout(self):
+        """Create run browser layout"""
+        main_layout = MDBoxLayout(
+            orientation='vertical',
+            spacing=dp(8),
+            padding=dp(12)
+        )
+
+        # Top toolbar
+        toolbar = MDTopAppBar(
+            title="Run Browser",
+            left_action_items=[["arrow-left", lambda x: self.go_back(x)]],
+            elevation=dp(4)
+        )
+        toolbar.size_hint_y = None
+        toolbar.height = dp(56)
+        main_layout.add_widget(toolbar)
+
+        # Filters
+        main_layout.add_widget(self.create_filter_card())
+
+        # Result count
+        self.result_label = MDLabel(
+            text="",
+            theme_text_color="Custom",
+            text_color=(0.8, 0.8, 0.8, 1),  # Light gray text
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(20),
+            halign="left"
+        )
+        main_layout.add_widget(self.result_label)
+
+        # Results list
+        scroll = ScrollView()
+        self.results_list = MDList()
+        scroll.add_widget(self.results_list)
+        main_layout.add_widget(scroll)
+
+        self.add_widget(main_layout)
+
+    def create_filter_card(self):
+        """Create filter fields and search button"""
+        card = MDCard(
+            elevation=dp(4),
+            padding=[dp(12), dp(4)],
+            radius=[dp(8)],
+            size_hint_y=None,
+            height=dp(72)
+        )
+
+        filter_layout = MDBoxLayout(
+            orientation='horizontal',
+            spacing=dp(12)
+        )
+
+        self.aoa_from_field = MDTextField(hint_text="AoA from (°)", input_filter='float')
+        filter_layout.add_widget(self.aoa_from_field)
+
+        self.aoa_to_field = MDTextField(hint_text="AoA to (°)", input_filter='float')
+        filter_layout.add_widget(self.aoa_to_field)
+
+        self.lift_field = MDTextField(hint_text="Peak lift above (N)", input_filter='float')
+        filter_layout.add_widget(self.lift_field)
+
+        search_button = MDRaisedButton(
+            text="SEARCH",
+            icon="magnify",
+            md_bg_color=(0.2, 0.6, 1.0, 1),
+            font_size=dp(16),
+            pos_hint={'center_y': 0.5}
+        )
+        search_button.bind(on_press=self.search)
+        filter_layout.add_widget(search_button)
+
+        card.add_widget(filter_layout)
+        return card
+
+    def read_field(self, field):
+        """Float value of a filter field, or None when empty"""
+        try:
+            return float(field.text) if field.text.strip() else None
+        except ValueError:
+            return None
+
+    def search(self, *args):
+        """Run the catalog query and show the results"""
+        runs = self.catalog.search(
+            aoa_min=self.read_field(self.aoa_from_field),
+            aoa_max=self.read_field(self.aoa_to_field),
+            min_peak_lift=self.read_field(self.lift_field)
+        )
+
+        self.results_list.clear_widgets()
+        for run in runs:
+            item = ThreeLineListItem(
+                text=f"{run['run_id']}  •  {time.strftime('%d %b %H:%M', time.localtime(run['started'] or 0))}",
+                secondary_text=(f"AoA {self.fmt(run['aoa_min'])}..{self.fmt(run['aoa_max'])}°  •  "
+                                f"Fan {self.fmt(run['fan_min'], 0)}..{self.fmt(run['fan_max'], 0)}%"),
+                tertiary_text=(f"Peak lift {self.fmt(run['lift_max'])} N  •  "
+                               f"Max drag {self.fmt(run['drag_max'])} N  •  "
+                               f"{self.fmt(run['duration'])} s"),
+                on_release=lambda x, run=run: self.show_details(run)
+            )
+            self.results_list.add_widget(item)
+
+        self.result_label.text = f"{len(runs)} of {self.catalog.count()} runs"
+
+    def fmt(self, value, decimals=1):
+        """Format a possibly missing number"""
+        return "-" if value is None else f"{value:.{decimals}f}"
+
+    def show_details(self, run):
+        """Show one run's catalog entry"""
+        self.details_dialog = open_text_dialog(self.details_dialog, f"RUN {run['run_id']}", "\n".join([
+            f"Samples: {run['sample_count']}",
+            f"Duration: {self.fmt(run['duration'])} s",
+            f"Airspeed: max {self.fmt(run['airspeed_max'])} / mean {self.fmt(run['airspeed_mean'])} MPH",
+            f"Lift: {self.fmt(run['lift_min'])} .. {self.fmt(run['lift_max'])} N",
+            f"Max drag: {self.fmt(run['drag_max'])} N",
+            f"Path: {run['path']}"
+        ]))
+
+    def go_back(self, button):
+        """Go back to mode selection"""
+        self.manager.current = 'mode_screen'
+
+    def on_enter(self):
+        """Called when screen becomes active"""
+        self.search()
+        log.debug("Run browser active")
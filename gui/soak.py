@@ -0,0 +1,207 @@
+"""
+Accelerated Soak Test
+Cycles screens, simulation start/stop/reset, dialogs and extreme values
+many times faster than an operator would, tracking leaks as it goes
+"""
+
+import json
+import random
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.uix.screenmanager import NoTransition
+
+from logic.eventlog import get_logger, fields
+from logic.soak import SoakMonitor, read_rss_bytes, count_objects
+
+log = get_logger('soak')
+
+def count_group(group):
+    """Instructions in a canvas or instruction group, nested groups included"""
+    total = 0
+    for instruction in group.children:
+        total += 1
+        if hasattr(instruction, 'children'):
+            total += count_group(instruction)
+    return total
+
+def count_canvas_instructions(widget):
+    """Canvas instructions of a widget and all its descendants"""
+    total = 0
+    for child in widget.walk(restrict=True):
+        canvas = child.canvas
+        if canvas is None:
+            continue
+        total += count_group(canvas)
+        # before/after are created on first access; only count existing ones
+        if canvas.has_before:
+            total += count_group(canvas.before)
+        if canvas.has_after:
+            total += count_group(canvas.after)
+    return total
+
+class SoakTest:
+    """
+    Drives the running app through `cycles` accelerated usage cycles
+    Each Clock step performs one action; each cycle visits every screen,
+    starts, stops and resets the simulation, throws out-of-range values
+    at the gauges, opens and closes the dashboard dialogs and runs several
+    display updates back to back. Every `sample_every` cycles RSS, Python
+    objects, scheduled Clock events and canvas instructions are sampled;
+    at the end any that kept growing fail the test (app.soak_failed), as
+    does a run too short to judge growth (fewer than min_cycles).
+    """
+
+    def __init__(self, app, cycles=200, step_seconds=0.02, sample_every=10,
+                 updates_per_step=5, report_path=None, seed=0):
+        self.app = app
+        self.cycles = cycles
+        self.step_seconds = step_seconds
+        self.sample_every = sample_every
+        self.updates_per_step = updates_per_step  # Display refreshes per step
+        self.report_path = report_path
+        self.random = random.Random(seed)
+        self.monitor = SoakMonitor()
+        self.cycle = 0
+        self.actions = []
+        self.action_index = 0
+        self.step_event = None
+        self.saved_transition = None
+
+    @property
+    def min_cycles(self):
+        """Cycles needed for enough samples (one is taken at the start)"""
+        return (self.monitor.min_samples - 1) * self.sample_every
+
+    def start(self):
+        """Begin cycling on the Kivy clock"""
+        if self.cycles < self.min_cycles:
+            log.warning("Soak test of %d cycles is too short to judge growth and will fail; "
+                        "run at least %d", self.cycles, self.min_cycles)
+        manager = self.app.root
+        # Skip transition animations so a cycle takes milliseconds
+        self.saved_transition = manager.transition
+        manager.transition = NoTransition()
+        self.actions = self.build_cycle()
+        self.sample()
+        self.step_event = Clock.schedule_interval(self.step, self.step_seconds)
+        log.info("Soak test started: %d cycles of %d actions", self.cycles, len(self.actions))
+
+    def build_cycle(self):
+        """The actions making up one cycle, in order"""
+        actions = []
+        for index in range(len(self.app.tunnels)):
+            actions += [
+                lambda index=index: self.show_dashboard(index),
+                lambda: self.on_dashboard(lambda d: d.toggle_simulation(None)),
+                self.push_values,
+                self.refresh,
+                lambda: self.on_dashboard(lambda d: d.toggle_airspeed_hold(None)),
+                self.refresh,
+                lambda: self.on_dashboard(lambda d: d.toggle_airspeed_hold(None)),
+                lambda: self.on_dashboard(self.cycle_dialogs),
+                lambda: self.on_dashboard(lambda d: d.toggle_simulation(None)),
+                lambda: self.on_dashboard(lambda d: d.reset_simulation(None)),
+                self.refresh,
+            ]
+        actions += [lambda name=name: self.show_screen(name)
+                    for name in self.app.root.screen_names if not name.startswith('dashboard')]
+        return actions
+
+    def step(self, dt):
+        """Run the next action; sample and finish at cycle boundaries"""
+        if self.app.root.transition.is_active:
+            return  # Let the screen switch (and its on_enter) finish first
+        try:
+            self.actions[self.action_index]()
+        except Exception as e:
+            log.error("Soak action %d failed: %s", self.action_index, e)
+        self.action_index += 1
+        if self.action_index < len(self.actions):
+            return
+        self.action_index = 0
+        self.cycle += 1
+        if self.cycle % self.sample_every == 0:
+            self.sample()
+        if self.cycle >= self.cycles:
+            self.finish()
+            return False
+
+    def current_dashboard(self):
+        screen = self.app.root.current_screen
+        return screen if hasattr(screen, 'update_data') else None
+
+    def on_dashboard(self, action):
+        dashboard = self.current_dashboard()
+        if dashboard is not None:
+            action(dashboard)
+
+    def show_dashboard(self, index):
+        if len(self.app.tunnels) > 1:
+            self.app.open_tunnel(index)
+        else:
+            self.app.root.current = 'dashboard'
+
+    def show_screen(self, name):
+        self.app.root.current = name
+
+    def refresh(self):
+        """Several display updates back to back (time runs faster in a soak)"""
+        dashboard = self.current_dashboard()
+        if dashboard is None:
+            return
+        for _ in range(self.updates_per_step):
+            dashboard.update_data(0.1)
+
+    def push_values(self):
+        """Setpoints and gauge values across, and beyond, their ranges"""
+        dashboard = self.current_dashboard()
+        if dashboard is None:
+            return
+        uniform = self.random.uniform
+        dashboard.simulator.set_fan_speed(self.random.choice((0, 100, uniform(-20, 120))),
+                                          quiet=True)
+        dashboard.simulator.set_angle_of_attack(self.random.choice((-20, 20, uniform(-30, 30))))
+        dashboard.speed_gauge.update_speed(uniform(-10, 90))
+        for _, gauge in dashboard.layout_gauges:
+            span = gauge.max_val - gauge.min_val
+            gauge.update_value(uniform(gauge.min_val - span, gauge.max_val + span))
+
+    def cycle_dialogs(self, dashboard):
+        """Open and close each dashboard dialog"""
+        for show, attribute in ((dashboard.show_statistics, 'stats_dialog'),
+                                (dashboard.show_event_log, 'events_dialog'),
+                                (dashboard.show_spectrum, 'spectrum_dialog')):
+            show()
+            dialog = getattr(dashboard, attribute)
+            if dialog is not None:
+                dialog.dismiss(force=True)
+
+    def sample(self):
+        """Record one set of resource metrics"""
+        canvas = sum(count_canvas_instructions(screen) for screen in self.app.root.screens)
+        # Dialogs and toasts hang off the window, not the screen manager
+        canvas += sum(count_canvas_instructions(widget) for widget in Window.children
+                      if widget is not self.app.root)
+        self.monitor.record(cycle=self.cycle, rss_bytes=read_rss_bytes(),
+                            objects=count_objects(), clock_events=len(Clock.get_events()),
+                            canvas_instructions=canvas)
+
+    def finish(self):
+        """Report, then stop the app"""
+        self.app.root.transition = self.saved_transition
+        report = self.monitor.get_report()
+        report['cycles'] = self.cycle
+        if not report['enough_samples']:
+            # Inconclusive is not a pass
+            report['failures'].append(f"too short to judge growth: {self.cycle} cycles, "
+                                      f"at least {self.min_cycles} needed")
+        if self.report_path:
+            with open(self.report_path, 'w') as f:
+                json.dump(report, f, indent=2)
+        for failure in report['failures']:
+            log.error("Soak test: %s", failure)
+        log.info("Soak test finished after %d cycles (%.0f s)", self.cycle, report['elapsed'],
+                 extra=fields(failures=len(report['failures'])))
+        self.app.soak_failed = bool(report['failures'])
+        self.app.stop()
@@ -0,0 +1,67 @@
+"""
+Spectrum View Widget
+Log-scale Welch PSD plot fed by logic.spectrum.SpectrumAnalyzer
+Line instructions are created once; refreshes only replace their points
+"""
+
+import numpy as np
+
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Line, Rectangle
+from kivy.metrics import dp
+
+# Decades of PSD shown below the strongest bin
+DYNAMIC_RANGE_DECADES = 5.0
+
+class SpectrumView(Widget):
+    """
+    Plots the spectra of several channels on a shared log scale
+    colors maps channel name to an RGBA line color.
+    """
+
+    def __init__(self, analyzer, colors, **kwargs):
+        super().__init__(**kwargs)
+        self.analyzer = analyzer
+        self.lines = {}
+        with self.canvas:
+            Color(0.1, 0.1, 0.1, 0.8)
+            self.background = Rectangle()
+            Color(0.3, 0.3, 0.3, 1)
+            self.axis = Line(points=[], width=dp(1))
+            for channel, color in colors.items():
+                Color(*color)
+                self.lines[channel] = Line(points=[], width=dp(1.5))
+        self.bind(pos=self.refresh, size=self.refresh)
+
+    def refresh(self, *args):
+        """Redraw from the analyzer's current spectra"""
+        self.background.pos = self.pos
+        self.background.size = self.size
+        x0, y0 = self.x + dp(4), self.y + dp(4)
+        width, height = self.width - dp(8), self.height - dp(8)
+        self.axis.points = [x0, y0 + height, x0, y0, x0 + width, y0]
+        if width <= 0 or height <= 0:
+            return
+
+        spectra = {}
+        for channel in self.lines:
+            spectrum = self.analyzer.get_spectrum(channel)
+            if spectrum is not None:
+                frequencies, psd = spectrum
+                spectra[channel] = (frequencies, np.log10(np.maximum(psd, 1e-12)))
+        if not spectra:
+            for line in self.lines.values():
+                line.points = []
+            return
+
+        top = max(log_psd[1:].max() for _, log_psd in spectra.values())
+        bottom = top - DYNAMIC_RANGE_DECADES
+        for channel, line in self.lines.items():
+            if channel not in spectra:
+                line.points = []
+                continue
+            frequencies, log_psd = spectra[channel]
+            # DC bin skipped: the analyzer removes the mean
+            xs = x0 + frequencies[1:] / frequencies[-1] * width
+            ys = y0 + (np.clip(log_psd[1:], bottom, top) - bottom) / DYNAMIC_RANGE_DECADES * height
+            line.points = np.column_stack((xs, ys)).ravel().tolist()
@@ -0,0 +1,517 @@
+import contextlib
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+from logic.acquisition import AcquisitionLoop, SampleBlock
+from logic.calibration import CalibrationStage
+from logic.controller import AirspeedHold
+from logic.spectrum import SpectrumAnalyzer, DOMINANT_SUFFIX
+from logic.eventlog import get_logger
+from logic.sharedring import (SharedSampleRing, HEARTBEAT_NS, WRITER_PID, OVERRUNS,
+                              JITTER_COUNT, JITTER_RMS_NS, JITTER_MAX_NS,
+                              INTERVAL_MIN_NS, INTERVAL_MAX_NS)
+
+log = get_logger('acqprocess')
+
+# Source methods the GUI process may invoke in the acquisition process
+REMOTE_METHODS = ('set_fan_speed', 'set_angle_of_attack', 'start_simulation',
+                  'stop_simulation', 'reset_simulation')
+
+def numeric_channels(data):
+    """Channel names a sample dict contributes to blocks (and the ring)"""
+    return tuple(name for name, value in data.items() if isinstance(value, (int, float)))
+
+# Serializes main_script_hidden(): spawns come from the acquisition reader
+# and the report monitor threads, and each patches the shared __main__
+_main_script_lock = threading.Lock()
+
+@contextlib.contextmanager
+def main_script_hidden():
+    """
+    Keep spawn from re-running the GUI's __main__ script in the child
+    The worker needs nothing from it, and for main.py that would import
+    Kivy and open a second window. Held by one thread at a time.
+    """
+    with _main_script_lock:
+        main_module = sys.modules['__main__']
+        main_file = main_module.__dict__.pop('__file__', None)
+        main_spec = getattr(main_module, '__spec__', None)
+        main_module.__spec__ = None
+        try:
+            yield
+        finally:
+            main_module.__spec__ = main_spec
+            if main_file is not None:
+                main_module.__file__ = main_file
+
+class ProcessPipeline:
+    """
+    A tunnel's sample processing, built inside the acquisition process
+    Picklable recipe for the child: sensor calibration, the airspeed hold
+    as a task and the spectrum analyzer as a block stage, so the ring
+    carries calibrated readings plus the dominant-frequency channels and
+    the control loop never waits on the GUI's GIL. The GUI process keeps
+    the tare file and forwards new offsets; hold status and spectra come
+    back as results (see RemoteAirspeedHold, RemoteSpectrum).
+    """
+
+    def __init__(self, calibration_dir, tare_name, rate_hz=100.0, hold_rate_hz=50.0,
+                 spectrum_channels=('lift_force', 'drag_force'), segment=256, results_hz=5.0):
+        self.calibration_dir = calibration_dir
+        self.tare_name = tare_name
+        self.rate_hz = rate_hz
+        self.hold_rate_hz = hold_rate_hz
+        self.spectrum_channels = tuple(spectrum_channels)
+        self.segment = segment
+        self.results_hz = results_hz
+
+    @property
+    def channels(self):
+        """Channels the pipeline adds to every sample"""
+        return tuple(name + DOMINANT_SUFFIX for name in self.spectrum_channels)
+
+    def build(self, loop, source, publish):
+        """Wire the pipeline into the child's loop; returns its remote methods by name"""
+        calibration = CalibrationStage.from_directory(self.calibration_dir,
+                                                      tare_name=self.tare_name)
+        calibration.tare_path = None  # Loaded here, saved by the GUI process
+        loop.set_calibration(calibration)
+
+        hold = AirspeedHold(source, rate_hz=self.hold_rate_hz)
+        loop.add_task(hold.update, hold.rate_hz, name='airspeed_hold')
+
+        spectrum = SpectrumAnalyzer(rate_hz=self.rate_hz, channels=self.spectrum_channels,
+                                    segment=self.segment)
+        loop.add_block_stage(spectrum.annotate_block, spectrum.dominant_channels)
+
+        published = None  # Segment count of the last spectra sent
+
+        def publish_results(data, dt):
+            nonlocal published
+            publish('airspeed_hold', hold.get_status())
+            if spectrum.segments != published:
+                published = spectrum.segments
+                publish('spectrum', {
+                    'spectra': {name: (spectrum.get_spectrum(name) or (None, None))[1]
+                                for name in spectrum.channels},
+                    'dominant': {name: spectrum.get_dominant(name) for name in spectrum.channels},
+                })
+
+        loop.add_task(publish_results, self.results_hz, name='results')
+        return {
+            'airspeed_hold.engage': hold.engage,
+            'airspeed_hold.disengage': hold.disengage,
+            'airspeed_hold.set_setpoint': hold.set_setpoint,
+            'calibration.set_tare': calibration.set_tare,
+        }
+
+def acquisition_worker(ring_name, channels, source_factory, rate_hz, commands, stop_event,
+                       results, pipeline=None):
+    """Acquisition process body: sample and process the source into the shared ring"""
+    ring = SharedSampleRing.attach(ring_name)
+    source = source_factory()
+    loop = AcquisitionLoop(source, rate_hz=rate_hz, name="acquisition-worker")
+
+    # Results stay small (a few KB), so each is a single pipe write
+    def publish(name, payload):
+        results.put((name, payload))
+
+    handlers = {method: getattr(source, method) for method in REMOTE_METHODS}
+    if pipeline is not None:
+        handlers.update(pipeline.build(loop, source, publish))
+
+    def write_sample(data, dt):
+        ring.write([data.get(name, 0.0) for name in channels])
+
+    def apply_commands(data, dt):
+        while True:
+            try:
+                method, args, kwargs = commands.get_nowait()
+            except queue.Empty:
+                return
+            handler = handlers.get(method)
+            if handler is not None:
+                handler(*args, **kwargs)
+
+    def publish_status(data, dt):
+        timing = loop.get_timing()
+        jitter = timing['jitter']
+        status = {HEARTBEAT_NS: time.monotonic_ns(), OVERRUNS: timing['overruns'],
+                  JITTER_COUNT: jitter['count']}
+        if jitter['count']:
+            status.update({JITTER_RMS_NS: jitter['rms_us'] * 1000,
+                           JITTER_MAX_NS: jitter['max_abs_us'] * 1000,
+                           INTERVAL_MIN_NS: jitter['min_interval_ms'] * 1e6,
+                           INTERVAL_MAX_NS: jitter['max_interval_ms'] * 1e6})
+        ring.set_status(status)
+        publish('tasks', timing['tasks'])
+
+    loop.add_task(write_sample, rate_hz, name='shared_ring')
+    loop.add_task(apply_commands, 50.0, name='commands')
+    loop.add_task(publish_status, 5.0, name='status')
+    ring.set_status({WRITER_PID: os.getpid(), HEARTBEAT_NS: time.monotonic_ns()})
+    loop.start()
+    try:
+        stop_event.wait()
+    finally:
+        loop.stop()
+        ring.close()
+
+class RemoteSource:
+    """
+    Stand-in for a data source that lives in the acquisition process
+    Control calls are forwarded over the command queue and mirrored here,
+    so the UI reads back what it set straight away; readings come from
+    the shared ring. After a restart the mirrored state is replayed.
+    """
+
+    def __init__(self, process, current_data):
+        self.process = process
+        self.current_data = current_data
+        self.is_running = False
+        self.fan_speed = 50
+        self.angle_of_attack = 0
+
+    def set_fan_speed(self, speed, quiet=False):
+        self.fan_speed = max(0, min(100, speed))
+        self.process.send('set_fan_speed', self.fan_speed, quiet=quiet)
+
+    def adjust_fan_speed(self, delta):
+        self.set_fan_speed(self.fan_speed + delta)
+
+    def set_angle_of_attack(self, angle):
+        self.angle_of_attack = max(-20, min(20, angle))
+        self.process.send('set_angle_of_attack', self.angle_of_attack)
+
+    def start_simulation(self):
+        self.is_running = True
+        self.process.send('start_simulation')
+
+    def stop_simulation(self):
+        self.is_running = False
+        self.process.send('stop_simulation')
+
+    def reset_simulation(self):
+        self.fan_speed = 50
+        self.angle_of_attack = 0
+        self.process.send('reset_simulation')
+
+    def get_all_data(self):
+        """Latest sample read back from the shared ring"""
+        return self.process.get_latest()
+
+    def replay(self):
+        """Bring a freshly started acquisition process up to the mirrored state"""
+        self.process.send('set_fan_speed', self.fan_speed, quiet=True)
+        self.process.send('set_angle_of_attack', self.angle_of_attack)
+        if self.is_running:
+            self.process.send('start_simulation')
+
+class RemoteAirspeedHold(AirspeedHold):
+    """
+    Stand-in for the AirspeedHold running in the acquisition process
+    Engage and setpoint calls update this mirror, so the UI reads back
+    what it set straight away, and are forwarded; get_status() reports
+    the controller's last published state. Never run as a task here.
+    """
+
+    def __init__(self, process, rate_hz=50.0, **kwargs):
+        super().__init__(process.source, rate_hz=rate_hz, **kwargs)
+        self.process = process
+        self.remote_status = None
+        process.on_result('airspeed_hold', self.receive)
+        process.add_mirror(self)
+
+    def engage(self, setpoint, unit='ms'):
+        super().engage(setpoint, unit)
+        self.process.send('airspeed_hold.engage', self.setpoint_ms)
+
+    def disengage(self):
+        super().disengage()
+        self.process.send('airspeed_hold.disengage')
+
+    def set_setpoint(self, value, unit='ms'):
+        super().set_setpoint(value, unit)
+        self.process.send('airspeed_hold.set_setpoint', self.setpoint_ms)
+
+    def adjust_setpoint(self, delta, unit='ms'):
+        super().adjust_setpoint(delta, unit)
+        self.process.send('airspeed_hold.set_setpoint', self.setpoint_ms)
+
+    def receive(self, status):
+        with self.lock:
+            self.remote_status = status
+            holding = self.enabled and status['enabled']
+        if holding:
+            # The controller moves the fan; keep the mirrored fan speed in step
+            self.simulator.fan_speed = status['output']
+
+    def get_status(self):
+        with self.lock:
+            status = self.remote_status
+        return dict(status) if status is not None else super().get_status()
+
+    def replay(self):
+        """Re-engage a freshly started acquisition process"""
+        if self.enabled:
+            self.process.send('airspeed_hold.engage', self.setpoint_ms)
+
+class RemoteSpectrum:
+    """
+    Stand-in for the SpectrumAnalyzer running in the acquisition process
+    Holds the Welch spectra and dominant frequencies it last published,
+    for the spectrum dialog; the dominant frequencies are also ring
+    channels.
+    """
+
+    def __init__(self, process, rate_hz=100.0, channels=('lift_force', 'drag_force'),
+                 segment=256):
+        self.rate_hz = rate_hz
+        self.channels = tuple(channels)
+        self.dominant_channels = tuple(name + DOMINANT_SUFFIX for name in self.channels)
+        self.segment = segment
+        self.frequencies = np.fft.rfftfreq(segment, 1.0 / rate_hz)
+        self.lock = threading.Lock()
+        self.spectra = {}
+        self.dominant = dict.fromkeys(self.channels)
+        process.on_result('spectrum', self.receive)
+
+    def receive(self, payload):
+        with self.lock:
+            self.spectra = payload['spectra']
+            self.dominant = payload['dominant']
+
+    def get_spectrum(self, channel):
+        """(frequencies, Welch PSD) for a channel, or None before the first segment"""
+        with self.lock:
+            psd = self.spectra.get(channel)
+        return None if psd is None else (self.frequencies, psd)
+
+    def get_dominant(self, channel):
+        """Frequency (Hz) of the strongest non-DC component, or None"""
+        with self.lock:
+            return self.dominant.get(channel)
+
+    @property
+    def resolution_hz(self):
+        return self.rate_hz / self.segment
+
+class AcquisitionProcess(AcquisitionLoop):
+    """
+    AcquisitionLoop whose sampling and processing run in a separate process
+    The child process owns the data source and, given a ProcessPipeline,
+    calibrates, controls and analyses it there, writing each processed
+    sample at rate_hz into a SharedSampleRing, outside the GUI process's
+    GIL. In the GUI process a reader thread polls the ring every
+    1/poll_hz seconds: the newest row becomes the latest sample and feeds
+    the tasks, and once at least block_size new rows have arrived they
+    are copied out of the ring as one SampleBlock for the block
+    processors (the UI-facing consumers). No Python work is done per
+    sample. `source` is a RemoteSource forwarding control calls; results
+    the child publishes go to on_result() callbacks. A crashed or hung
+    child is restarted automatically.
+    """
+
+    def __init__(self, source_factory, rate_hz=100.0, block_size=10, name="acquisition",
+                 poll_hz=50.0, ring_seconds=10.0, heartbeat_timeout=3.0,
+                 startup_timeout=15.0, channels=None, pipeline=None):
+        self.source_factory = source_factory  # Picklable, e.g. WindTunnelSimulator
+        self.pipeline = pipeline
+        if channels is None:
+            # Learn the channel layout from a throwaway instance
+            channels = numeric_channels(source_factory().get_all_data())
+            if pipeline is not None:
+                channels += pipeline.channels
+        self.ring_channels = tuple(channels)
+        self.poll_hz = poll_hz
+        self.ring_capacity = int(rate_hz * ring_seconds)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_timeout = startup_timeout  # Spawn + imports are slow on a Pi
+        self.context = multiprocessing.get_context('spawn')
+        self.ring = None
+        self.worker = None
+        self.commands = None
+        self.worker_stop = None
+        self.results = None
+        self.result_handlers = {'tasks': self._receive_tasks}
+        self.mirrors = []  # Replayed into a restarted child, after the source
+        self.remote_tasks = {}
+        self.restarts = 0
+        self.lost_samples = 0
+        super().__init__(RemoteSource(self, dict.fromkeys(self.ring_channels, 0.0)),
+                         rate_hz=rate_hz, block_size=block_size, name=name)
+        if pipeline is not None:
+            self.stage_channels = pipeline.channels  # Added in the child
+
+    def on_result(self, name, callback):
+        """Call callback(payload) on the reader thread for each `name` result of the child"""
+        self.result_handlers[name] = callback
+
+    def add_mirror(self, mirror):
+        """Have mirror.replay() bring each restarted child up to its state"""
+        self.mirrors.append(mirror)
+
+    def send(self, method, *args, **kwargs):
+        """Forward a source call to the acquisition process (dropped if not running)"""
+        if self.commands is not None:
+            self.commands.put((method, args, kwargs))
+
+    def start(self):
+        """Create the shared ring, spawn the acquisition process and start reading"""
+        if self.is_active:
+            return
+        self.ring = SharedSampleRing.create(f"windtunnel-{os.getpid()}-{id(self):x}",
+                                            len(self.ring_channels), self.ring_capacity)
+        self._spawn()
+        super().start()
+
+    def stop(self, timeout=1.0):
+        """Stop reading, then stop the acquisition process and free the ring"""
+        super().stop(timeout)
+        self._stop_worker(timeout)
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def _spawn(self):
+        # Fresh queue each time: a child killed mid-get can leave the old one locked
+        self.commands = self.context.Queue()
+        self.results = self.context.Queue()
+        self.worker_stop = self.context.Event()
+        self.worker = self.context.Process(
+            target=acquisition_worker,
+            args=(self.ring.name, self.ring_channels, self.source_factory, self.rate_hz,
+                  self.commands, self.worker_stop, self.results, self.pipeline),
+            name=f"{self.name}-process", daemon=True)
+        with main_script_hidden():
+            self.worker.start()
+        self.ring.set_status({HEARTBEAT_NS: time.monotonic_ns()})
+        self.source.replay()
+        for mirror in self.mirrors:
+            mirror.replay()
+        log.info("Acquisition process for '%s' started (pid %d)", self.name, self.worker.pid)
+
+    def _stop_worker(self, timeout):
+        if self.worker is None:
+            return
+        self.worker_stop.set()
+        self.worker.join(timeout * 2)
+        if self.worker.is_alive():
+            self.worker.terminate()
+            self.worker.join(timeout)
+        self.worker = None
+        self.commands = None
+        self.results = None
+
+    def _check_worker(self):
+        """Restart the acquisition process if it died or stopped reporting"""
+        stale = (time.monotonic_ns() - self.ring.status(HEARTBEAT_NS)) * 1e-9
+        reporting = self.ring.status(WRITER_PID) == self.worker.pid
+        timeout = self.heartbeat_timeout if reporting else self.startup_timeout
+        if self.worker.is_alive() and stale < timeout:
+            return
+        if self.worker.is_alive():
+            log.error("Acquisition process for '%s' hung (%.1fs without status), restarting",
+                      self.name, stale)
+            self.worker.terminate()
+        else:
+            log.error("Acquisition process for '%s' exited (code %s), restarting",
+                      self.name, self.worker.exitcode)
+        self.worker.join(1.0)
+        self.ring.recover()
+        self.restarts += 1
+        self._spawn()
+
+    def get_timing(self):
+        """Loop timing as measured in the acquisition process, plus reader stats"""
+        timing = super().get_timing()
+        ring = self.ring
+        if ring is None:
+            return timing
+        count = ring.status(JITTER_COUNT)
+        timing['overruns'] = ring.status(OVERRUNS)
+        timing['jitter'] = {'count': count}
+        if count:
+            timing['jitter'].update({
+                'rms_us': ring.status(JITTER_RMS_NS) / 1000,
+                'max_abs_us': ring.status(JITTER_MAX_NS) / 1000,
+                'min_interval_ms': ring.status(INTERVAL_MIN_NS) / 1e6,
+                'max_interval_ms': ring.status(INTERVAL_MAX_NS) / 1e6,
+            })
+        with self.lock:
+            timing['tasks'].update(self.remote_tasks)
+        timing['process'] = {'pid': ring.status(WRITER_PID), 'restarts': self.restarts,
+                             'lost_samples': self.lost_samples, 'ring_retries': ring.retries}
+        return timing
+
+    def _run(self):
+        """Reader thread body: feed new ring samples through the pipeline"""
+        period = 1.0 / self.poll_hz
+        ring = self.ring
+        since = seen = ring.total
+        next_check = time.monotonic() + 1.0
+        with self.lock:
+            self.channels = self.ring_channels
+            self.channel_index = {name: i for i, name in enumerate(self.channels)}
+        while not self._stop_event.wait(period):
+            self._receive_results()
+            total = ring.total
+            if total != seen:
+                seen = total
+                if total - since >= self.block_size:
+                    rows, since, lost = ring.read_since(since)
+                    if len(rows):
+                        self._take_rows(time.perf_counter(), rows, lost)
+                else:
+                    row = ring.latest()
+                    if row is not None:
+                        self._take_rows(time.perf_counter(), row[np.newaxis], 0, block=False)
+
+            if time.monotonic() >= next_check:
+                next_check += 1.0
+                try:
+                    self._check_worker()
+                except Exception as e:
+                    log.error("Acquisition process check for '%s' failed: %s", self.name, e)
+
+    def _receive_results(self):
+        """Hand what the child published to the on_result() callbacks"""
+        results = self.results
+        while results is not None:
+            try:
+                name, payload = results.get_nowait()
+            except queue.Empty:
+                return
+            handler = self.result_handlers.get(name)
+            if handler is None:
+                continue
+            try:
+                handler(payload)
+            except Exception as e:
+                log.error("Result '%s' from the acquisition process failed: %s", name, e)
+
+    def _receive_tasks(self, tasks):
+        with self.lock:
+            self.remote_tasks = tasks
+
+    def _take_rows(self, now, rows, lost, block=True):
+        """Newest row -> latest sample and due tasks; all rows -> one block (if block)"""
+        with self.lock:
+            self.lost_samples += lost
+            self.latest = dict(zip(self.channels, rows[-1].tolist()))
+            self.latest.update(self.stage_values)
+            self._latest_raw = True
+            due = [task for task in self.tasks if task.next_due is None or now >= task.next_due]
+            data = self._calibrated_latest() if due else self.latest
+            if block:
+                self.sample_count += len(rows)
+                self.block_count += 1
+        self._run_tasks(due, now, data)
+        if block:
+            self._process_block(SampleBlock(self.channels, self.channel_index, rows))
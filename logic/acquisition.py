@@ -0,0 +1,366 @@
+import bisect
+import threading
+import time
+
+import numpy as np
+
+from logic.eventlog import get_logger
+
+log = get_logger('acquisition')
+
+class SampleBlock:
+    """
+    Column-oriented block of consecutive samples
+    block['lift_force'] returns a NumPy view of that channel
+    """
+
+    def __init__(self, channels, index, data):
+        self.channels = channels
+        self.index = index
+        self.data = data  # shape (n_samples, n_channels)
+
+    def __getitem__(self, channel):
+        return self.data[:, self.index[channel]]
+
+    def __contains__(self, channel):
+        return channel in self.index
+
+    def __len__(self):
+        return self.data.shape[0]
+
+class PeriodicTask:
+    """
+    A callback run by the acquisition loop at its own fixed rate
+    The callback receives the latest sample dict and the elapsed time
+    """
+
+    def __init__(self, callback, rate_hz, name=""):
+        self.callback = callback
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.name = name or getattr(callback, '__name__', 'task')
+        self.next_due = None
+        self.last_run = None
+        self.run_count = 0
+        self.overruns = 0
+        self.last_duration = 0.0
+
+class SamplingJitter:
+    """
+    Inter-arrival statistics for a fixed-rate sampler
+    Jitter is each sample's interval minus the nominal period, binned in
+    microseconds into a fixed histogram so recording costs O(1) per sample.
+    """
+
+    # Bin edges in microseconds; the outer bins are open-ended
+    BIN_EDGES_US = (-1000, -500, -200, -100, -50, -20, 20, 50, 100, 200, 500, 1000, 5000)
+
+    def __init__(self, period_ns):
+        self.period_ns = period_ns
+        self.reset()
+
+    def reset(self):
+        self.last_ns = None
+        self.count = 0
+        self.sum_us = 0.0
+        self.sum_sq_us = 0.0
+        self.max_abs_us = 0.0
+        self.min_interval_ns = None
+        self.max_interval_ns = None
+        self.histogram = [0] * (len(self.BIN_EDGES_US) + 1)
+
+    def record(self, now_ns):
+        """Record one sample arrival (integer nanoseconds)"""
+        last, self.last_ns = self.last_ns, now_ns
+        if last is None:
+            return
+        interval = now_ns - last
+        jitter_us = (interval - self.period_ns) / 1000.0
+        self.count += 1
+        self.sum_us += jitter_us
+        self.sum_sq_us += jitter_us * jitter_us
+        self.max_abs_us = max(self.max_abs_us, abs(jitter_us))
+        if self.min_interval_ns is None or interval < self.min_interval_ns:
+            self.min_interval_ns = interval
+        if self.max_interval_ns is None or interval > self.max_interval_ns:
+            self.max_interval_ns = interval
+        self.histogram[bisect.bisect_right(self.BIN_EDGES_US, jitter_us)] += 1
+
+    def restart(self):
+        """Forget the last arrival (after a pause or deliberate skip)"""
+        self.last_ns = None
+
+    def get_summary(self):
+        if not self.count:
+            return {'count': 0}
+        mean = self.sum_us / self.count
+        return {
+            'count': self.count,
+            'mean_us': mean,
+            'rms_us': (self.sum_sq_us / self.count) ** 0.5,
+            'std_us': max(self.sum_sq_us / self.count - mean * mean, 0.0) ** 0.5,
+            'max_abs_us': self.max_abs_us,
+            'min_interval_ms': self.min_interval_ns / 1e6,
+            'max_interval_ms': self.max_interval_ns / 1e6,
+            'bin_edges_us': self.BIN_EDGES_US,
+            'histogram': list(self.histogram),
+        }
+
+class AcquisitionLoop:
+    """
+    Fixed-rate sampling thread around a data source
+    - Samples the source on absolute perf_counter_ns deadlines
+    - Applies sensor calibration before anything else sees a sample:
+      vectorized over each block, and to the latest sample only on demand
+    - Measures per-sample jitter against the nominal period
+    - Runs periodic tasks (e.g. controllers) at their own rates
+    - Groups samples into blocks for vectorized block stages (which may
+      add channels) and block processors
+    - Keeps the latest sample for the UI, independent of frame rate
+    """
+
+    def __init__(self, source, rate_hz=100.0, block_size=10, name="acquisition"):
+        self.source = source
+        self.name = name  # Thread name (one loop per tunnel)
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.period_ns = round(1e9 / rate_hz)
+        self.block_size = block_size
+        self.tasks = []
+        self.block_processors = []
+        self.block_stages = []
+        self.stage_values = {}  # Newest values of channels added by block stages
+        self.stage_channels = ()  # Names of those channels, declared up front
+        self.calibration = None  # CalibrationStage, see set_calibration
+        self.lock = threading.RLock()
+        self.latest = dict(source.current_data)
+        self._latest_raw = False  # Latest sample not calibrated yet
+
+        # Timing statistics
+        self.sample_count = 0
+        self.overruns = 0
+        self.max_lateness = 0.0
+        self.block_count = 0
+        self.jitter = SamplingJitter(self.period_ns)
+
+        # Block buffer, allocated on the first sample once channels are known
+        self.channels = None
+        self.channel_index = None
+        self._block = None
+        self._block_fill = 0
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        log.info("Acquisition loop '%s' configured at %.0f Hz", name, rate_hz)
+
+    def add_task(self, callback, rate_hz, name=""):
+        """Run callback(data, dt) at rate_hz inside the acquisition thread"""
+        task = PeriodicTask(callback, min(rate_hz, self.rate_hz), name)
+        with self.lock:
+            self.tasks.append(task)
+        return task
+
+    def remove_task(self, task):
+        """Stop running a periodic task"""
+        with self.lock:
+            if task in self.tasks:
+                self.tasks.remove(task)
+
+    def add_block_processor(self, callback):
+        """Run callback(SampleBlock) each time a block of samples fills"""
+        with self.lock:
+            self.block_processors.append(callback)
+
+    def remove_block_processor(self, callback):
+        """Stop sending blocks to a processor"""
+        with self.lock:
+            if callback in self.block_processors:
+                self.block_processors.remove(callback)
+
+    def add_block_stage(self, stage, channels=()):
+        """
+        Run stage(block) -> block on each calibrated block before the processors
+        A stage may return a block with extra channels (named in channels);
+        their newest values are also merged into the latest sample.
+        """
+        with self.lock:
+            self.block_stages.append(stage)
+            self.stage_channels += tuple(channels)
+
+    def set_calibration(self, stage):
+        """Correct every sample with a CalibrationStage (None for raw readings)"""
+        with self.lock:
+            self.calibration = stage
+
+    @property
+    def is_active(self):
+        """True while the sampling thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the sampling thread"""
+        if self.is_active:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        log.info("Acquisition loop '%s' started", self.name)
+
+    def stop(self, timeout=1.0):
+        """Stop the sampling thread and wait for it to exit"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        log.info("Acquisition loop '%s' stopped", self.name)
+
+    def get_latest(self):
+        """Get a copy of the most recent (calibrated) sample"""
+        with self.lock:
+            return dict(self._calibrated_latest())
+
+    def get_timing(self):
+        """Get loop timing statistics"""
+        with self.lock:
+            return {
+                'rate_hz': self.rate_hz,
+                'sample_count': self.sample_count,
+                'overruns': self.overruns,
+                'max_lateness': self.max_lateness,
+                'tasks': {task.name: {'rate_hz': task.rate_hz,
+                                      'run_count': task.run_count,
+                                      'overruns': task.overruns,
+                                      'last_duration': task.last_duration}
+                          for task in self.tasks},
+                'jitter': self.jitter.get_summary()
+            }
+
+    def reset_timing(self):
+        """Clear overrun, lateness and jitter statistics"""
+        with self.lock:
+            self.overruns = 0
+            self.max_lateness = 0.0
+            self.jitter.reset()
+
+    def _run(self):
+        """Sampling thread body"""
+        # Integer nanosecond deadlines: no float drift over long runs
+        next_tick = time.perf_counter_ns()
+        self.jitter.restart()
+        while not self._stop_event.is_set():
+            now = time.perf_counter_ns()
+            if now < next_tick:
+                self._stop_event.wait((next_tick - now) * 1e-9)
+                continue
+
+            lateness = (now - next_tick) * 1e-9
+            with self.lock:
+                self.max_lateness = max(self.max_lateness, lateness)
+                self.jitter.record(now)
+
+            self.tick(now * 1e-9)
+
+            # Absolute deadlines keep the rate exact; if we fell more than
+            # a whole period behind, skip ahead instead of bursting
+            next_tick += self.period_ns
+            if time.perf_counter_ns() - next_tick > self.period_ns:
+                with self.lock:
+                    self.overruns += 1
+                    # The gap is already counted as an overrun
+                    self.jitter.restart()
+                next_tick = time.perf_counter_ns() + self.period_ns
+
+    def tick(self, now, data=None):
+        """Take one sample (or use the one given) and run any tasks that are due"""
+        with self.lock:
+            data = dict(self.source.get_all_data() if data is None else data)
+            self.latest = data
+            self._latest_raw = True
+            self.sample_count += 1
+            block = self._append_to_block(data)
+            data.update(self.stage_values)
+            due = [task for task in self.tasks if task.next_due is None or now >= task.next_due]
+            if due:
+                data = self._calibrated_latest()
+
+        self._run_tasks(due, now, data)
+        if block is not None:
+            self._process_block(block)
+
+    def _calibrated_latest(self):
+        """
+        The latest sample, calibrated the first time it is needed
+        Blocks hold raw readings and are calibrated a whole block at a
+        time, so only the samples tasks or the UI actually read are
+        corrected one by one. Caller holds the lock.
+        """
+        if self._latest_raw:
+            self._latest_raw = False
+            if self.calibration is not None:
+                self.calibration.apply_sample(self.latest)
+        return self.latest
+
+    def _run_tasks(self, tasks, now, data):
+        for task in tasks:
+            if task.next_due is None:
+                task.next_due = now
+                task.last_run = now
+
+            started = time.perf_counter()
+            try:
+                task.callback(data, now - task.last_run)
+            except Exception as e:
+                log.error("Acquisition task '%s' failed: %s", task.name, e)
+            task.last_duration = time.perf_counter() - started
+            task.last_run = now
+            task.run_count += 1
+
+            task.next_due += task.period
+            if now - task.next_due > task.period:
+                task.overruns += 1
+                task.next_due = now + task.period
+
+    def _process_block(self, block):
+        """Calibrate a block of raw samples in one vectorized pass, then hand it on"""
+        with self.lock:
+            calibration = self.calibration
+            stages = list(self.block_stages)
+            processors = list(self.block_processors)
+        if calibration is not None:
+            calibration.apply_block(block)
+        if stages:
+            channels = len(block.channels)
+            for stage in stages:
+                try:
+                    block = stage(block)
+                except Exception as e:
+                    log.error("Block stage '%s' failed: %s", getattr(stage, '__name__', stage), e)
+            if len(block.channels) > channels:
+                added = dict(zip(block.channels[channels:], block.data[-1, channels:].tolist()))
+                with self.lock:
+                    self.stage_values = added
+        for processor in processors:
+            try:
+                processor(block)
+            except Exception as e:
+                log.error("Block processor '%s' failed: %s",
+                          getattr(processor, '__name__', processor), e)
+
+    def _append_to_block(self, data):
+        """Store a sample in the block buffer, returning the block once full"""
+        if self.channels is None:
+            self.channels = tuple(name for name, value in data.items()
+                                  if isinstance(value, (int, float)))
+            self.channel_index = {name: i for i, name in enumerate(self.channels)}
+            self._block = np.empty((self.block_size, len(self.channels)))
+
+        row = self._block[self._block_fill]
+        for i, name in enumerate(self.channels):
+            row[i] = data[name]
+        self._block_fill += 1
+
+        if self._block_fill < self.block_size:
+            return None
+        self._block_fill = 0
+        self.block_count += 1
+        return SampleBlock(self.channels, self.channel_index, self._block.copy())
@@ -0,0 +1,261 @@
+import abc
+import logging
+import threading
+from collections import deque
+
+import numpy as np
+
+from logic.eventlog import get_logger, fields
+
+log = get_logger('alarms')
+
+# Higher number = more severe, used to pick what the status chip shows
+SEVERITY_ORDER = {'info': 0, 'warning': 1, 'critical': 2}
+
+def forward_fill(events, initial):
+    """
+    Turn per-sample set/reset events into a state array
+    events holds 1 (set), 0 (reset) or -1 (no change); samples before the
+    first event keep the `initial` state carried over from the last block.
+    """
+    positions = np.where(events >= 0, np.arange(len(events)), -1)
+    np.maximum.accumulate(positions, out=positions)
+    return np.where(positions >= 0, events[np.maximum(positions, 0)] == 1, initial)
+
+class AlarmEvent:
+    """An alarm being raised or cleared"""
+
+    def __init__(self, rule, active, timestamp, value):
+        self.rule = rule
+        self.active = active
+        self.timestamp = timestamp
+        self.value = value
+
+    @property
+    def message(self):
+        state = "RAISED" if self.active else "CLEARED"
+        return f"{self.rule.label} {state} ({self.rule.channel}={self.value:.2f})"
+
+class AlarmRule(abc.ABC):
+    """
+    Base class for streaming alarm rules
+    - Subclasses provide vectorized raise/clear conditions per block
+    - The gap between raise and clear levels gives hysteresis
+    - on_delay: condition must hold this long before raising (duration rule)
+    - off_delay: condition must be gone this long before clearing (debounce)
+    """
+
+    def __init__(self, name, channel, label=None, severity='warning',
+                 on_delay=0.0, off_delay=0.0):
+        self.name = name
+        self.channel = channel
+        self.label = label or name.upper()
+        self.severity = severity
+        self.on_delay = on_delay
+        self.off_delay = off_delay
+
+        # State carried between blocks
+        self.raw_state = False
+        self.raw_since = -np.inf
+        self.active = False
+
+    @abc.abstractmethod
+    def conditions(self, block, times):
+        """Return (raise_mask, clear_mask, values) for a block"""
+
+    def evaluate(self, block, times):
+        """Evaluate one block, returning the list of state transitions"""
+        raise_mask, clear_mask, values = self.conditions(block, times)
+
+        # Fast path: a settled rule whose block holds no opposing crossing
+        # cannot change state, which is the common case every tick
+        if self.active == self.raw_state:
+            opposing = clear_mask if self.raw_state else raise_mask
+            if not opposing.any():
+                return []
+
+        # Hysteresis: state only changes on a raise or clear crossing
+        raw_events = np.full(len(times), -1, dtype=np.int8)
+        raw_events[clear_mask] = 0
+        raw_events[raise_mask] = 1
+        raw = forward_fill(raw_events, self.raw_state)
+
+        # Time each sample has spent in its current raw state
+        previous = np.concatenate(([self.raw_state], raw[:-1]))
+        change_times = np.where(raw != previous, times, -np.inf)
+        np.maximum.accumulate(change_times, out=change_times)
+        change_times = np.maximum(change_times, self.raw_since)
+        held_for = times - change_times
+
+        # Debounce: only act once the raw state has held long enough
+        out_events = np.full(len(times), -1, dtype=np.int8)
+        out_events[~raw & (held_for >= self.off_delay)] = 0
+        out_events[raw & (held_for >= self.on_delay)] = 1
+        active = forward_fill(out_events, self.active)
+
+        previous_active = np.concatenate(([self.active], active[:-1]))
+        transitions = np.flatnonzero(active != previous_active)
+
+        self.raw_state = bool(raw[-1])
+        self.raw_since = change_times[-1]
+        self.active = bool(active[-1])
+
+        return [AlarmEvent(self, bool(active[i]), float(times[i]), float(values[i]))
+                for i in transitions]
+
+    def reset(self):
+        """Forget carried state"""
+        self.raw_state = False
+        self.raw_since = -np.inf
+        self.active = False
+
+class ThresholdRule(AlarmRule):
+    """
+    Raise when a channel goes above `high` or below `low`
+    Clears once it is back inside by `hysteresis`
+    """
+
+    def __init__(self, name, channel, high=None, low=None, hysteresis=0.0,
+                 use_abs=False, **kwargs):
+        super().__init__(name, channel, **kwargs)
+        self.high = np.inf if high is None else high
+        self.low = -np.inf if low is None else low
+        self.hysteresis = hysteresis
+        self.use_abs = use_abs
+
+    def conditions(self, block, times):
+        values = block[self.channel]
+        if self.use_abs:
+            values = np.abs(values)
+        raise_mask = (values > self.high) | (values < self.low)
+        clear_mask = ((values <= self.high - self.hysteresis)
+                      & (values >= self.low + self.hysteresis))
+        return raise_mask, clear_mask, values
+
+class RateRule(AlarmRule):
+    """
+    Raise when a channel changes faster than `max_rate` units per second
+    """
+
+    def __init__(self, name, channel, max_rate, hysteresis=0.0, **kwargs):
+        super().__init__(name, channel, **kwargs)
+        self.max_rate = max_rate
+        self.hysteresis = hysteresis
+        self.last_value = None
+        self.last_time = None
+
+    def conditions(self, block, times):
+        values = block[self.channel]
+        if self.last_value is None:
+            self.last_value = values[0]
+            self.last_time = times[0]
+
+        dv = np.diff(values, prepend=self.last_value)
+        dt = np.diff(times, prepend=self.last_time)
+        rates = np.abs(np.divide(dv, dt, out=np.zeros_like(dv), where=dt > 0))
+
+        self.last_value = values[-1]
+        self.last_time = times[-1]
+
+        raise_mask = rates > self.max_rate
+        clear_mask = rates <= self.max_rate - self.hysteresis
+        return raise_mask, clear_mask, rates
+
+    def reset(self):
+        super().reset()
+        self.last_value = None
+        self.last_time = None
+
+class AlarmEngine:
+    """
+    Evaluates alarm rules over sample blocks from the acquisition loop
+    Events are queued for the UI and passed to listeners (run log)
+    """
+
+    def __init__(self, rules=None, time_channel='timestamp', history_size=200):
+        self.rules = list(rules or [])
+        self.time_channel = time_channel
+        self.lock = threading.Lock()
+        self.pending = deque(maxlen=history_size)  # Not yet seen by the UI
+        self.history = deque(maxlen=history_size)
+        self.active = {}  # rule name -> raising event
+        self.listeners = [self.log_event]
+
+    def add_rule(self, rule):
+        with self.lock:
+            self.rules.append(rule)
+
+    def add_listener(self, callback):
+        """callback(event) is called from the acquisition thread"""
+        self.listeners.append(callback)
+
+    def process_block(self, block):
+        """Block processor: evaluate every rule over one block"""
+        times = block[self.time_channel]
+        with self.lock:
+            events = []
+            for rule in self.rules:
+                events.extend(rule.evaluate(block, times))
+
+            for event in events:
+                if event.active:
+                    self.active[event.rule.name] = event
+                else:
+                    self.active.pop(event.rule.name, None)
+                self.pending.append(event)
+                self.history.append(event)
+
+        for event in events:
+            for listener in self.listeners:
+                listener(event)
+
+    def drain_events(self):
+        """Pop events not yet collected by the UI"""
+        with self.lock:
+            events = list(self.pending)
+            self.pending.clear()
+        return events
+
+    def get_active_alarms(self):
+        """Active alarms, most severe first"""
+        with self.lock:
+            return sorted(self.active.values(),
+                          key=lambda e: SEVERITY_ORDER.get(e.rule.severity, 0),
+                          reverse=True)
+
+    def reset(self):
+        """Clear all alarm state"""
+        with self.lock:
+            for rule in self.rules:
+                rule.reset()
+            self.active.clear()
+            self.pending.clear()
+
+    def log_event(self, event):
+        """Default listener: write the event to the event log"""
+        level = logging.ERROR if event.rule.severity == 'critical' else logging.WARNING
+        log.log(level, "ALARM [%s] %s", event.rule.severity, event.message,
+                extra=fields(rule=event.rule.name, active=event.active, value=event.value))
+
+def build_default_rules(pressure_range=(1000, 1030), overspeed_mph=40):
+    """
+    Standard tunnel alarms
+    - Stall: |AoA| past the 15 degree linear limit in calculate_lift_drag
+    - Overspeed: airspeed inside the speed gauge's red band (40-60 MPH)
+    - Pressure: static/dynamic pressure outside the gauge range
+    """
+    low, high = pressure_range
+    return [
+        ThresholdRule('stall', 'angle_of_attack', high=15, hysteresis=0.5,
+                      use_abs=True, label="STALL", severity='warning',
+                      on_delay=0.1, off_delay=0.5),
+        ThresholdRule('overspeed', 'airspeed_mph', high=overspeed_mph, hysteresis=2.0,
+                      label="OVERSPEED", severity='critical',
+                      on_delay=0.5, off_delay=1.0),
+        ThresholdRule('static_pressure_range', 'pressure_static', high=high, low=low,
+                      hysteresis=0.5, label="STATIC P RANGE", severity='warning',
+                      on_delay=0.2, off_delay=1.0),
+        ThresholdRule('dynamic_pressure_range', 'pressure_dynamic', high=high, low=low,
+                      hysteresis=0.5, label="DYNAMIC P RANGE", severity='warning',
+                      on_delay=0.2, off_delay=1.0),
+    ]
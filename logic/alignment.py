@@ -0,0 +1,297 @@
+import math
+import random
+import threading
+import time
+
+import numpy as np
+
+from logic.eventlog import get_logger, fields
+
+log = get_logger('alignment')
+
+# Interpolation methods
+LINEAR = 'linear'  # Straight line between the samples either side
+HOLD = 'hold'  # Most recent sample at or before the time (sample-and-hold)
+METHODS = (LINEAR, HOLD)
+
+class SensorStream:
+    """
+    Timestamped samples from one sensor (one or more channels)
+    Samples must arrive in time order; late ones are dropped and counted.
+    History is a bounded buffer: at most `capacity` samples are kept, and
+    samples the aligner has moved past are discarded as it goes.
+    """
+
+    def __init__(self, name, channels, method=LINEAR, capacity=256):
+        if method not in METHODS:
+            raise ValueError(f"Unknown interpolation '{method}', expected one of {METHODS}")
+        self.name = name
+        self.channels = tuple(channels)
+        self.method = method
+        self.capacity = capacity
+        self.times = np.empty(capacity)
+        self.values = np.empty((capacity, len(self.channels)))
+        self.fill = 0
+        self.first_time = None
+        self.sample_count = 0
+        self.late = 0  # Out-of-order samples dropped
+        self.overflow = 0  # Samples pushed out before the aligner reached them
+        self.stale = 0  # Linear points past the newest sample (newest value held)
+
+    def push(self, timestamp, values):
+        """Append one sample; values in channel order"""
+        if self.fill and timestamp <= self.times[self.fill - 1]:
+            self.late += 1
+            return
+        if self.fill == self.capacity:
+            self._drop_oldest(self.capacity // 4)
+        self.times[self.fill] = timestamp
+        self.values[self.fill] = values
+        self.fill += 1
+        if self.first_time is None:
+            self.first_time = timestamp
+        self.sample_count += 1
+
+    def discard_before(self, timestamp):
+        """Drop history no longer needed to interpolate at timestamp or later"""
+        # Keep the last sample at or before timestamp: it brackets the next point
+        keep_from = int(np.searchsorted(self.times[:self.fill], timestamp, side='right')) - 1
+        if keep_from > 0:
+            self._shift(keep_from)
+
+    def resample(self, times):
+        """(len(times), channels) values at times; newest value held past the end"""
+        stored = self.times[:self.fill]
+        if self.method == HOLD:
+            rows = np.maximum(np.searchsorted(stored, times, side='right') - 1, 0)
+            return self.values[rows]
+        self.stale += int(np.count_nonzero(times > stored[-1]))
+        return np.column_stack([np.interp(times, stored, self.values[:self.fill, i])
+                                for i in range(len(self.channels))])
+
+    def _drop_oldest(self, count):
+        self.overflow += count
+        self._shift(count)
+
+    def _shift(self, count):
+        remaining = self.fill - count
+        self.times[:remaining] = self.times[count:self.fill]
+        self.values[:remaining] = self.values[count:self.fill]
+        self.fill = remaining
+
+    def get_status(self):
+        return {
+            'channels': self.channels,
+            'method': self.method,
+            'samples': self.sample_count,
+            'buffered': self.fill,
+            'late': self.late,
+            'overflow': self.overflow,
+            'stale': self.stale,
+        }
+
+class TimeAligner:
+    """
+    Resamples independently timestamped sensor streams onto one timebase
+    Sensors push samples at their own (jittery) rates, timestamped with
+    time.monotonic(). Aligned points lie on a fixed grid of 1/rate_hz
+    steps and trail the clock by `latency` seconds, so every stream has
+    normally delivered the samples either side of a point before it is
+    computed. latency should exceed the longest sample interval of the
+    linear streams plus their delivery delay; points beyond a linear
+    stream's newest sample hold its newest value and are counted as
+    stale. Sample-and-hold streams (e.g. a tachometer) only ever hold, so
+    they may be slower than that. Thread-safe: sensors push from their own
+    threads while the acquisition thread aligns.
+    """
+
+    def __init__(self, rate_hz=100.0, latency=0.05, time_channel='timestamp'):
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.latency = latency
+        self.time_channel = time_channel
+        self.lock = threading.Lock()
+        self.streams = {}
+        self.next_index = None  # Next grid point to produce (its time / period)
+        self.skipped = 0  # Grid points skipped after falling behind
+
+    @property
+    def channels(self):
+        """Aligned channels, in stream order"""
+        return tuple(name for stream in self.streams.values() for name in stream.channels)
+
+    def add_stream(self, name, channels, method=LINEAR, capacity=256):
+        """Register a sensor stream; channels must not overlap other streams'"""
+        with self.lock:
+            taken = set(self.channels).intersection(channels)
+            if taken:
+                raise ValueError(f"Channels {sorted(taken)} already belong to another stream")
+            stream = SensorStream(name, channels, method, capacity)
+            self.streams[name] = stream
+        return stream
+
+    def push(self, name, timestamp, values):
+        """Add a sample to a stream; values is a dict or a sequence in channel order"""
+        stream = self.streams[name]
+        if isinstance(values, dict):
+            values = [values[channel] for channel in stream.channels]
+        with self.lock:
+            stream.push(timestamp, values)
+
+    @property
+    def start_index(self):
+        """First grid point every stream covers (None until all have data)"""
+        firsts = [stream.first_time for stream in self.streams.values()]
+        if not firsts or None in firsts:
+            return None
+        return math.ceil(max(firsts) / self.period)
+
+    def grid_index(self, timestamp):
+        """Last grid point at or before timestamp"""
+        return math.floor(timestamp / self.period)
+
+    def grid_times(self, first_index, count):
+        # Times are computed from indices, never accumulated, so they don't drift
+        return (first_index + np.arange(count)) * self.period
+
+    def due_times(self, now, max_points=None):
+        """Grid points up to now - latency not yet produced (they are consumed)"""
+        last_index = self.grid_index(now - self.latency)
+        with self.lock:
+            if self.next_index is None:
+                self.next_index = max(last_index, self.start_index)
+            count = last_index - self.next_index + 1
+            if count <= 0:
+                return np.empty(0)
+            if max_points is not None and count > max_points:
+                # Fallen behind (paused, or sensors stalled): resume at the horizon
+                self.skipped += count - max_points
+                self.next_index += count - max_points
+                count = max_points
+            first_index = self.next_index
+            self.next_index += count
+        return self.grid_times(first_index, count)
+
+    def note_skipped(self, count):
+        """Count grid points a caller skipped past"""
+        with self.lock:
+            self.skipped += count
+
+    def resample(self, times):
+        """(len(times), len(channels)) aligned values at times"""
+        with self.lock:
+            columns = [stream.resample(times) for stream in self.streams.values()]
+            for stream in self.streams.values():
+                stream.discard_before(times[-1])
+        return np.hstack(columns)
+
+    def align(self, now, max_points=None):
+        """
+        Aligned rows for every grid point that has come due
+        Returns (times, rows); both empty until every stream has data.
+        """
+        if self.start_index is None:
+            return np.empty(0), np.empty((0, len(self.channels)))
+        times = self.due_times(now, max_points)
+        if not len(times):
+            return times, np.empty((0, len(self.channels)))
+        return times, self.resample(times)
+
+    def get_status(self):
+        with self.lock:
+            return {
+                'rate_hz': self.rate_hz,
+                'latency': self.latency,
+                'skipped': self.skipped,
+                'streams': {name: stream.get_status() for name, stream in self.streams.items()},
+            }
+
+class AlignedSource:
+    """
+    Data source for an AcquisitionLoop backed by a TimeAligner
+    Each get_all_data() call advances one grid point, so a loop ticking at
+    the aligner's rate emits every point once, `latency` behind real time.
+    Streamed channels come from the aligner and 'timestamp' is the grid
+    time; everything else (setpoints, run state, runtime) is read from
+    `base`, the device or simulator being controlled.
+    """
+
+    def __init__(self, aligner, base, max_lag_points=10):
+        self.aligner = aligner
+        self.base = base
+        self.max_lag_points = max_lag_points  # Beyond this, skip ahead to the horizon
+        self.current_data = dict(base.current_data)
+        self._index = None  # Grid point of the last sample
+
+    def get_all_data(self):
+        data = dict(self.base.get_all_data())
+        aligner = self.aligner
+        last_index = aligner.grid_index(time.monotonic() - aligner.latency)
+        if self._index is None or last_index - self._index > self.max_lag_points:
+            if self._index is not None:
+                aligner.note_skipped(last_index - self._index - 1)
+            self._index = last_index
+        else:
+            self._index += 1
+        times = aligner.grid_times(self._index, 1)
+        # Until every stream covers the grid, the base readings stand in
+        start = aligner.start_index
+        if start is not None and self._index >= start:
+            data.update(zip(aligner.channels, aligner.resample(times)[0].tolist()))
+        data[aligner.time_channel] = float(times[0])
+        self.current_data = data
+        return data
+
+class SimulatedSensors:
+    """
+    Multi-rate, jittery sensor streams read from a simulator
+    Stands in for real hardware: each group of channels is sampled on its
+    own thread at its own nominal rate with random interval jitter and
+    pushed into the aligner, timestamped with time.monotonic().
+    """
+
+    # (stream, channels, rate_hz, interpolation)
+    DEFAULT_STREAMS = (
+        ('pressure', ('pressure_static', 'pressure_dynamic', 'airspeed_mph', 'airspeed_ms'),
+         50.0, LINEAR),
+        ('balance', ('lift_force', 'drag_force', 'angle_of_attack'), 200.0, LINEAR),
+        ('tachometer', ('fan_output',), 10.0, HOLD),
+    )
+
+    def __init__(self, simulator, aligner, streams=DEFAULT_STREAMS, jitter=0.3, seed=None):
+        self.simulator = simulator
+        self.aligner = aligner
+        self.jitter = jitter  # Interval jitter as a fraction of the period
+        self.random = random.Random(seed)
+        self.streams = []
+        for name, channels, rate_hz, method in streams:
+            aligner.add_stream(name, channels, method)
+            self.streams.append((name, channels, rate_hz))
+        self._threads = []
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop_event.clear()
+        for name, channels, rate_hz in self.streams:
+            thread = threading.Thread(target=self._run, args=(name, channels, rate_hz),
+                                      name=f"sensor-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        log.info("Simulated sensors started",
+                 extra=fields(streams={name: rate for name, _, rate in self.streams}))
+
+    def stop(self):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(1.0)
+        self._threads = []
+
+    def _run(self, name, channels, rate_hz):
+        """Sensor thread body: sample the simulator and push to the aligner"""
+        period = 1.0 / rate_hz
+        while not self._stop_event.is_set():
+            data = self.simulator.get_all_data()
+            self.aligner.push(name, time.monotonic(), [data[channel] for channel in channels])
+            self._stop_event.wait(period * (1.0 + self.random.uniform(-self.jitter, self.jitter)))
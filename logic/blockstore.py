@@ -0,0 +1,250 @@
+import bisect
+import json
+import lzma
+import os
+import struct
+import zlib
+
+import numpy as np
+
+# File layout
+#   header : b'WTB1' u16 version u8 codec u8 reserved u32 block_rows u32 json_len + json
+#   block  : b'BLK0' u32 payload_len u32 rows f64 t_min f64 t_max + encodings + payload
+#   footer : index entries (u64 offset, u32 rows, f64 t_min, f64 t_max)
+#            + b'WTBI' u32 entry_count u64 index_offset
+# The footer is written on close; files without one (crash, still
+# recording) are indexed by scanning block headers instead.
+MAGIC = b'WTB1'
+BLOCK_MAGIC = b'BLK0'
+INDEX_MAGIC = b'WTBI'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHBBII')
+BLOCK_HEADER = struct.Struct('<4sIIdd')
+INDEX_ENTRY = struct.Struct('<QIdd')
+TRAILER = struct.Struct('<4sIQ')
+
+CODECS = {'zlib': 0, 'lzma': 1}
+CODEC_NAMES = {number: name for name, number in CODECS.items()}
+
+# Per-channel encodings
+ENCODING_XOR = 0    # XOR with the previous value's bits (constant/slow channels)
+ENCODING_DELTA = 1  # Integer delta of the bit patterns (monotonic channels)
+
+def encode_channel(values):
+    """
+    Losslessly transform one channel so it compresses well
+    Returns (encoding, bytes). Bits are byte-shuffled so that the slowly
+    changing high bytes of neighbouring samples end up next to each other.
+    """
+    bits = values.view(np.uint64)
+    if len(values) > 1 and np.all(np.diff(values) >= 0):
+        encoding = ENCODING_DELTA
+        encoded = np.empty_like(bits)
+        encoded[0] = bits[0]
+        np.subtract(bits[1:], bits[:-1], out=encoded[1:])
+    else:
+        encoding = ENCODING_XOR
+        encoded = np.empty_like(bits)
+        encoded[0] = bits[0]
+        np.bitwise_xor(bits[1:], bits[:-1], out=encoded[1:])
+    return encoding, encoded.view(np.uint8).reshape(-1, 8).T.tobytes()
+
+def decode_channel(encoding, raw, rows):
+    """Inverse of encode_channel"""
+    encoded = np.frombuffer(raw, dtype=np.uint8).reshape(8, rows).T.copy().view(np.uint64).ravel()
+    if encoding == ENCODING_DELTA:
+        bits = np.cumsum(encoded, dtype=np.uint64)
+    else:
+        bits = np.bitwise_xor.accumulate(encoded)
+    return bits.view(np.float64)
+
+class BlockStoreWriter:
+    """
+    Writes samples as independently compressed, indexed blocks
+    Rows are buffered until block_rows are available, which also batches
+    SD-card writes into one sequential write per block.
+    """
+
+    def __init__(self, path, channels, time_channel='timestamp', block_rows=1024,
+                 codec='zlib', level=6):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec '{codec}', expected one of {tuple(CODECS)}")
+        self.path = path
+        self.channels = tuple(channels)
+        self.time_index = self.channels.index(time_channel) if time_channel in self.channels else None
+        self.block_rows = block_rows
+        self.codec = codec
+        self.level = level
+        self.index = []  # (offset, rows, t_min, t_max)
+        self.rows_written = 0
+        self.bytes_written = 0
+        self._buffer = np.empty((block_rows, len(self.channels)))
+        self._fill = 0
+
+        self.file = open(path, 'wb')
+        header_json = json.dumps({'channels': list(self.channels),
+                                  'time_channel': time_channel}).encode()
+        self.file.write(HEADER.pack(MAGIC, VERSION, CODECS[codec], 0, block_rows, len(header_json)))
+        self.file.write(header_json)
+
+    def write(self, data):
+        """Append rows (n, channels); full blocks are compressed and written"""
+        while len(data):
+            take = min(len(data), self.block_rows - self._fill)
+            self._buffer[self._fill:self._fill + take] = data[:take]
+            self._fill += take
+            data = data[take:]
+            if self._fill == self.block_rows:
+                self._write_block(self._buffer)
+                self._fill = 0
+
+    def _compress(self, payload):
+        if self.codec == 'lzma':
+            return lzma.compress(payload, preset=self.level)
+        return zlib.compress(payload, self.level)
+
+    def _write_block(self, rows):
+        if self.time_index is not None:
+            times = rows[:, self.time_index]
+            t_min, t_max = float(times.min()), float(times.max())
+        else:
+            t_min, t_max = float(self.rows_written), float(self.rows_written + len(rows) - 1)
+
+        encodings = bytearray()
+        parts = []
+        for i in range(rows.shape[1]):
+            encoding, raw = encode_channel(np.ascontiguousarray(rows[:, i]))
+            encodings.append(encoding)
+            parts.append(raw)
+        payload = self._compress(b''.join(parts))
+
+        offset = self.file.tell()
+        self.file.write(BLOCK_HEADER.pack(BLOCK_MAGIC, len(payload), len(rows), t_min, t_max))
+        self.file.write(bytes(encodings))
+        self.file.write(payload)
+        self.index.append((offset, len(rows), t_min, t_max))
+        self.rows_written += len(rows)
+        self.bytes_written = self.file.tell()
+
+    def flush(self):
+        """Write any buffered partial block"""
+        if self._fill:
+            self._write_block(self._buffer[:self._fill].copy())
+            self._fill = 0
+        self.file.flush()
+
+    def close(self):
+        """Flush and write the block index footer"""
+        self.flush()
+        index_offset = self.file.tell()
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.write(TRAILER.pack(INDEX_MAGIC, len(self.index), index_offset))
+        self.file.close()
+
+class BlockStoreReader:
+    """
+    Random-access reader for block store files
+    Only the blocks overlapping a requested time range are decompressed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, codec, _, block_rows, json_len = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a block store file")
+            header = json.loads(f.read(json_len))
+            self.data_start = f.tell()
+        self.version = version
+        self.codec = CODEC_NAMES[codec]
+        self.block_rows = block_rows
+        self.channels = tuple(header['channels'])
+        self.time_channel = header.get('time_channel')
+        self.index = self._read_index()
+        self.block_t_min = [entry[2] for entry in self.index]
+
+    @property
+    def sample_count(self):
+        return sum(entry[1] for entry in self.index)
+
+    def _read_index(self):
+        """Read the footer index, or rebuild it by scanning block headers"""
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as f:
+            if size >= self.data_start + TRAILER.size:
+                f.seek(size - TRAILER.size)
+                magic, count, index_offset = TRAILER.unpack(f.read(TRAILER.size))
+                if magic == INDEX_MAGIC:
+                    f.seek(index_offset)
+                    return [INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size)) for _ in range(count)]
+
+            # No footer: walk the blocks, stopping at a truncated one
+            index = []
+            offset = self.data_start
+            width = len(self.channels)
+            while offset + BLOCK_HEADER.size <= size:
+                f.seek(offset)
+                magic, payload_len, rows, t_min, t_max = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+                end = offset + BLOCK_HEADER.size + width + payload_len
+                if magic != BLOCK_MAGIC or end > size:
+                    break
+                index.append((offset, rows, t_min, t_max))
+                offset = end
+            return index
+
+    def _decompress(self, payload):
+        if self.codec == 'lzma':
+            return lzma.decompress(payload)
+        return zlib.decompress(payload)
+
+    def read_block(self, number, f=None):
+        """Decode one block into a (rows, channels) array"""
+        offset, rows, _, _ = self.index[number]
+        width = len(self.channels)
+        own_file = f is None
+        if own_file:
+            f = open(self.path, 'rb')
+        try:
+            f.seek(offset)
+            _, payload_len, _, _, _ = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+            encodings = f.read(width)
+            raw = self._decompress(f.read(payload_len))
+        finally:
+            if own_file:
+                f.close()
+
+        block = np.empty((rows, width))
+        stride = rows * 8
+        for i in range(width):
+            block[:, i] = decode_channel(encodings[i], raw[i * stride:(i + 1) * stride], rows)
+        return block
+
+    def iter_blocks(self, first=0, last=None):
+        """Yield decoded blocks first..last (inclusive), one at a time"""
+        last = len(self.index) - 1 if last is None else last
+        with open(self.path, 'rb') as f:
+            for number in range(first, last + 1):
+                yield self.read_block(number, f)
+
+    def read_range(self, t_start, t_end):
+        """All rows with t_start <= time <= t_end, decoding only overlapping blocks"""
+        if not self.index:
+            return np.empty((0, len(self.channels)))
+        first = max(bisect.bisect_right(self.block_t_min, t_start) - 1, 0)
+        last = bisect.bisect_right(self.block_t_min, t_end) - 1
+        if last < first:
+            return np.empty((0, len(self.channels)))
+
+        time_index = self.channels.index(self.time_channel) if self.time_channel in self.channels else None
+        parts = []
+        row_offset = sum(entry[1] for entry in self.index[:first])
+        for block in self.iter_blocks(first, last):
+            if time_index is not None:
+                times = block[:, time_index]
+            else:
+                times = np.arange(row_offset, row_offset + len(block), dtype=np.float64)
+            row_offset += len(block)
+            parts.append(block[(times >= t_start) & (times <= t_end)])
+        return np.concatenate(parts)
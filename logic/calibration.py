@@ -0,0 +1,286 @@
+import glob
+import json
+import os
+import threading
+
+import numpy as np
+
+from logic.eventlog import get_logger, fields
+
+log = get_logger('calibration')
+
+DEFAULT_CALIBRATION_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                       'calibration')
+TARE_PREFIX = 'tare'  # Tare files share the directory but aren't calibrations
+
+class SensorCalibration:
+    """
+    Correction for one channel, applied to scalars or whole NumPy columns
+    - curve: 'linear' (offset, span), 'polynomial' (coefficients, highest
+      power first) or 'piecewise' (raw/value breakpoints, linear between)
+    - temperature compensation: zero shift (units/°C) and span change
+      (fraction/°C) relative to reference_temperature
+    The tare offset from the zero routine is subtracted last.
+    """
+
+    CURVES = ('linear', 'polynomial', 'piecewise')
+
+    def __init__(self, channel, curve='linear', offset=0.0, span=1.0, coefficients=None,
+                 raw=None, value=None, temperature_channel=None, reference_temperature=20.0,
+                 zero_tempco=0.0, span_tempco=0.0, sensor="", calibrated=""):
+        if curve not in self.CURVES:
+            raise ValueError(f"Unknown calibration curve '{curve}' for {channel}, "
+                             f"expected one of {self.CURVES}")
+        self.channel = channel
+        self.curve = curve
+        self.offset = offset
+        self.span = span
+        self.coefficients = np.asarray(coefficients if coefficients is not None else [1.0, 0.0],
+                                       dtype=np.float64)
+        if curve == 'piecewise':
+            if raw is None or value is None or len(raw) != len(value) or len(raw) < 2:
+                raise ValueError(f"Piecewise calibration for {channel} needs matching "
+                                 f"raw/value lists of at least two points")
+            order = np.argsort(raw)
+            self.raw = np.asarray(raw, dtype=np.float64)[order]
+            self.value = np.asarray(value, dtype=np.float64)[order]
+        self.temperature_channel = temperature_channel
+        self.reference_temperature = reference_temperature
+        self.zero_tempco = zero_tempco
+        self.span_tempco = span_tempco
+        self.sensor = sensor  # Transducer serial/model, for the record
+        self.calibrated = calibrated  # Date of the calibration certificate
+        self.tare = 0.0
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+    def to_dict(self):
+        values = {'channel': self.channel, 'curve': self.curve, 'sensor': self.sensor,
+                  'calibrated': self.calibrated}
+        if self.curve == 'linear':
+            values.update(offset=self.offset, span=self.span)
+        elif self.curve == 'polynomial':
+            values['coefficients'] = self.coefficients.tolist()
+        else:
+            values.update(raw=self.raw.tolist(), value=self.value.tolist())
+        if self.temperature_channel:
+            values.update(temperature_channel=self.temperature_channel,
+                          reference_temperature=self.reference_temperature,
+                          zero_tempco=self.zero_tempco, span_tempco=self.span_tempco)
+        return values
+
+    def apply(self, raw, temperature=None, tare=True):
+        """Calibrated value(s) for raw reading(s)"""
+        if self.curve == 'linear':
+            value = (raw - self.offset) * self.span
+        elif self.curve == 'polynomial':
+            value = np.polyval(self.coefficients, raw)
+        else:
+            value = np.interp(raw, self.raw, self.value)
+        if temperature is not None and (self.zero_tempco or self.span_tempco):
+            delta = temperature - self.reference_temperature
+            value = (value - self.zero_tempco * delta) / (1.0 + self.span_tempco * delta)
+        if tare:
+            value = value - self.tare
+        return value
+
+def load_calibrations(path):
+    """
+    SensorCalibrations from a JSON file or a directory of them
+    A file holds one calibration object or a list of them.
+    """
+    if os.path.isdir(path):
+        paths = sorted(p for p in glob.glob(os.path.join(path, '*.json'))
+                       if not os.path.basename(p).startswith(TARE_PREFIX))
+    elif os.path.exists(path):
+        paths = [path]
+    else:
+        return []
+
+    calibrations = []
+    for file_path in paths:
+        with open(file_path) as f:
+            entries = json.load(f)
+        for entry in entries if isinstance(entries, list) else [entries]:
+            calibrations.append(SensorCalibration.from_dict(entry))
+    return calibrations
+
+class CalibrationStage:
+    """
+    Applies sensor calibrations to acquisition samples
+    AcquisitionLoop runs apply_block() over each block of raw samples
+    before any block processor sees it, one vectorized pass per channel.
+    apply_sample() applies the same corrections to a single sample dict;
+    the loop uses it only for the latest sample, when tasks or the UI
+    read it, so every consumer gets calibrated values.
+    """
+
+    def __init__(self, calibrations=(), tare_path=None):
+        self.lock = threading.RLock()
+        self.calibrations = {}
+        self.tare_path = tare_path
+        self.listeners = []  # Called with each new set of tare offsets
+        for calibration in calibrations:
+            self.calibrations[calibration.channel] = calibration
+        self._plan = tuple(self.calibrations.values())
+        if tare_path and os.path.exists(tare_path):
+            self.load_tare(tare_path)
+
+    @classmethod
+    def from_directory(cls, path, tare_name=f"{TARE_PREFIX}.json"):
+        """Stage with every calibration file in path and the saved tare_name"""
+        calibrations = load_calibrations(path)
+        if calibrations:
+            log.info("Loaded %d sensor calibration(s) from %s", len(calibrations), path,
+                     extra=fields(channels=[c.channel for c in calibrations]))
+        return cls(calibrations, tare_path=os.path.join(path, tare_name))
+
+    def set_calibration(self, calibration):
+        """Add or replace the calibration of one channel"""
+        with self.lock:
+            previous = self.calibrations.get(calibration.channel)
+            if previous is not None:
+                calibration.tare = previous.tare
+            self.calibrations[calibration.channel] = calibration
+            self._plan = tuple(self.calibrations.values())
+
+    def ensure_channel(self, channel):
+        """Calibration for channel, adding an identity one so it can be tared"""
+        if channel not in self.calibrations:
+            self.set_calibration(SensorCalibration(channel))
+        return self.calibrations[channel]
+
+    def apply_sample(self, data):
+        """Calibrate one sample dict in place"""
+        for calibration in self._plan:
+            raw = data.get(calibration.channel)
+            if raw is None:
+                continue
+            temperature = data.get(calibration.temperature_channel)
+            data[calibration.channel] = float(calibration.apply(raw, temperature))
+        return data
+
+    def apply_block(self, block, tare=True):
+        """Calibrate a SampleBlock of raw readings in place (vectorized per channel)"""
+        for calibration in self._plan:
+            if calibration.channel not in block:
+                continue
+            temperature = None
+            if calibration.temperature_channel and calibration.temperature_channel in block:
+                temperature = block[calibration.temperature_channel]
+            column = block.index[calibration.channel]
+            block.data[:, column] = calibration.apply(block.data[:, column], temperature, tare)
+        return block
+
+    def set_tare(self, offsets):
+        """Apply and persist tare offsets {channel: value}"""
+        with self.lock:
+            for channel, offset in offsets.items():
+                self.ensure_channel(channel).tare = float(offset)
+        if self.tare_path:
+            self.save_tare(self.tare_path)
+        for listener in self.listeners:
+            listener(dict(offsets))
+
+    def add_listener(self, callback):
+        """Call callback(offsets) after every set_tare()"""
+        self.listeners.append(callback)
+
+    def get_tare(self):
+        """Non-zero tare offsets by channel"""
+        with self.lock:
+            return {channel: calibration.tare
+                    for channel, calibration in self.calibrations.items() if calibration.tare}
+
+    def save_tare(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.get_tare(), f, indent=2)
+
+    def load_tare(self, path):
+        with open(path) as f:
+            offsets = json.load(f)
+        with self.lock:
+            for channel, offset in offsets.items():
+                self.ensure_channel(channel).tare = float(offset)
+
+class TareRoutine:
+    """
+    On-device zero: average a window with the fan at 0 and store offsets
+    Runs as a telemetry subscriber on calibrated (but not yet re-tared)
+    blocks. Balance channels are zeroed; channels with a reference are
+    offset to read the same as it (e.g. dynamic pressure matches static
+    pressure with no flow). The window is abandoned if the fan is
+    commanded above zero.
+    """
+
+    DEFAULT_TARGETS = {
+        'lift_force': None,
+        'drag_force': None,
+        'pressure_dynamic': 'pressure_static',
+    }
+
+    def __init__(self, stage, seconds=3.0, rate_hz=100.0, targets=None, fan_channel='fan_speed'):
+        self.stage = stage
+        self.samples_needed = max(1, int(seconds * rate_hz))
+        self.targets = dict(targets or self.DEFAULT_TARGETS)
+        self.fan_channel = fan_channel
+        self.lock = threading.Lock()
+        self.state = 'idle'  # idle, running, done, failed
+        self.message = ""
+        self._sums = None
+        self._count = 0
+
+    def start(self, fan_speed):
+        """Begin averaging; refused (False) unless the fan is commanded to 0"""
+        if fan_speed > 0:
+            with self.lock:
+                self.state = 'failed'
+                self.message = "Set the fan to 0 before zeroing"
+            return False
+        with self.lock:
+            self._sums = dict.fromkeys(self.targets, 0.0)
+            self._count = 0
+            self.state = 'running'
+            self.message = "Averaging with fan at 0"
+        return True
+
+    def get_state(self):
+        with self.lock:
+            return self.state, self.message
+
+    def process_block(self, block):
+        """Telemetry callback: accumulate while running"""
+        if self.state != 'running':
+            return
+        if self.fan_channel in block and np.any(block[self.fan_channel] > 0):
+            with self.lock:
+                self.state = 'failed'
+                self.message = "Tare abandoned - fan must stay at 0"
+            return
+
+        tare = self.stage.get_tare()
+        values = {}
+        for channel, reference in self.targets.items():
+            if channel not in block:
+                continue
+            # Undo the current tare so repeated tares don't accumulate
+            column = block[channel] + tare.get(channel, 0.0)
+            if reference:
+                column = column - block[reference]
+            values[channel] = float(column.sum())
+
+        with self.lock:
+            for channel, total in values.items():
+                self._sums[channel] += total
+            self._count += len(block)
+            if self._count < self.samples_needed:
+                return
+            offsets = {channel: total / self._count for channel, total in self._sums.items()}
+            self.state = 'done'
+            self.message = "Tare stored: " + ", ".join(
+                f"{channel} {offset:+.3f}" for channel, offset in offsets.items())
+        self.stage.set_tare(offsets)
+        log.info("Tare complete over %d samples", self._count, extra=fields(**offsets))
@@ -0,0 +1,321 @@
+import queue
+import threading
+
+import numpy as np
+
+from logic.acquisition import SampleBlock
+from logic.recorder import RunRecorder, DEFAULT_RUNS_DIR
+from logic.eventlog import get_logger, fields
+
+log = get_logger('capture')
+
+# Capture modes, as on an oscilloscope
+SINGLE = 'single'  # Disarm after one capture
+AUTO = 'auto'  # Re-arm after each capture
+MODES = (SINGLE, AUTO)
+
+class LevelTrigger:
+    """Fires on the first sample at or above (or below) a level"""
+
+    def __init__(self, channel, level, above=True):
+        self.channel = channel
+        self.level = level
+        self.above = above
+
+    def describe(self):
+        return f"{self.channel} {'>=' if self.above else '<='} {self.level:g}"
+
+    def reset(self, until=None):
+        pass
+
+    def find(self, block, times):
+        """Index of the first triggering sample in the block, or None"""
+        values = block[self.channel]
+        hits = np.flatnonzero(values >= self.level if self.above else values <= self.level)
+        return int(hits[0]) if len(hits) else None
+
+class EdgeTrigger:
+    """Fires where a channel crosses a level ('rising', 'falling' or 'either')"""
+
+    SLOPES = ('rising', 'falling', 'either')
+
+    def __init__(self, channel, level, slope='rising'):
+        if slope not in self.SLOPES:
+            raise ValueError(f"Unknown slope '{slope}', expected one of {self.SLOPES}")
+        self.channel = channel
+        self.level = level
+        self.slope = slope
+        self.previous = None  # Last value of the previous block
+
+    def describe(self):
+        return f"{self.channel} {self.slope} through {self.level:g}"
+
+    def reset(self, until=None):
+        self.previous = None
+
+    def find(self, block, times):
+        values = block[self.channel]
+        previous = np.concatenate(([values[0] if self.previous is None else self.previous],
+                                   values[:-1]))
+        self.previous = values[-1]
+        above = values >= self.level
+        was_above = previous >= self.level
+        if self.slope == 'rising':
+            crossed = above & ~was_above
+        elif self.slope == 'falling':
+            crossed = ~above & was_above
+        else:
+            crossed = above != was_above
+        hits = np.flatnonzero(crossed)
+        return int(hits[0]) if len(hits) else None
+
+class StepTrigger:
+    """Fires when a channel jumps by at least min_change between samples (setpoint steps)"""
+
+    def __init__(self, channel, min_change):
+        self.channel = channel
+        self.min_change = min_change
+        self.previous = None
+
+    def describe(self):
+        return f"{self.channel} step >= {self.min_change:g}"
+
+    def reset(self, until=None):
+        self.previous = None
+
+    def find(self, block, times):
+        values = block[self.channel]
+        start = values[0] if self.previous is None else self.previous
+        self.previous = values[-1]
+        hits = np.flatnonzero(np.abs(np.diff(values, prepend=start)) >= self.min_change)
+        return int(hits[0]) if len(hits) else None
+
+class AlarmTrigger:
+    """
+    Fires on the sample where an alarm rule is raised
+    Fed by AlarmEngine listeners (on_alarm); the alarm engine must see a
+    block before the capture does. A raise later than the block being
+    searched is kept for the block it belongs to, so the capture may lag
+    behind the alarm engine (e.g. draining a telemetry queue). A raise
+    earlier than the block (before arming, or in a block the capture
+    never saw) is dropped.
+    """
+
+    def __init__(self, rule_name):
+        self.rule_name = rule_name
+        self.lock = threading.Lock()
+        self.raised = []  # Timestamps of raises not yet matched to a block
+
+    def describe(self):
+        return f"alarm {self.rule_name}"
+
+    def reset(self, until=None):
+        """Forget raises (only those at or before `until` when given)"""
+        with self.lock:
+            self.raised = [] if until is None else [t for t in self.raised if t > until]
+
+    def on_alarm(self, event):
+        if event.active and event.rule.name == self.rule_name:
+            with self.lock:
+                self.raised.append(event.timestamp)
+
+    def find(self, block, times):
+        with self.lock:
+            while self.raised and self.raised[0] < times[0]:
+                self.raised.pop(0)
+            if not self.raised or self.raised[0] > times[-1]:
+                return None
+            raised = self.raised.pop(0)
+        return int(np.searchsorted(times, raised))
+
+class TriggeredCapture:
+    """
+    Oscilloscope-style capture around a trigger
+    A pre-trigger ring holds the last max_pre_seconds of every channel at
+    the full acquisition rate. When the armed trigger fires, the ring's
+    last pre_seconds plus the following post_seconds become one capture,
+    which a background thread writes to the run store as a regular run
+    (tagged 'capture' in its metadata). Memory is bounded by the ring,
+    one capture in progress and max_pending captures awaiting the writer.
+    Runs as a telemetry subscriber, inline or from its own queue.
+    """
+
+    def __init__(self, runs_dir=DEFAULT_RUNS_DIR, rate_hz=100.0, max_pre_seconds=10.0,
+                 time_channel='timestamp', max_pending=4, tags=None):
+        self.rate_hz = rate_hz
+        self.ring_capacity = int(max_pre_seconds * rate_hz)
+        self.time_channel = time_channel
+        self.tags = dict(tags or {})  # Added to every capture's metadata, e.g. tunnel
+        self.lock = threading.Lock()
+        self.recorder = RunRecorder(runs_dir)
+        self.trigger = None
+        self.mode = SINGLE
+        self.pre_samples = 0
+        self.post_samples = 0
+        self.capture_count = 0
+        self.dropped = 0
+        self.last_run_id = None
+
+        # Allocated on the first block once channels are known
+        self.channels = None
+        self.index = None
+        self._ring = None
+        self._ring_pos = 0
+        self._ring_fill = 0
+
+        # Capture in progress
+        self._buffer = None
+        self._fill = 0
+        self._trigger_row = 0
+        self._trigger_time = None
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._write_loop, name="capture-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def state(self):
+        """'disarmed', 'armed' or 'capturing'"""
+        if self._buffer is not None:
+            return 'capturing'
+        return 'armed' if self.trigger is not None else 'disarmed'
+
+    def arm(self, trigger, pre_seconds=2.0, post_seconds=3.0, mode=SINGLE):
+        """Wait for trigger and capture pre_seconds before it and post_seconds after"""
+        if mode not in MODES:
+            raise ValueError(f"Unknown capture mode '{mode}', expected one of {MODES}")
+        pre_samples = int(pre_seconds * self.rate_hz)
+        if pre_samples > self.ring_capacity:
+            raise ValueError(f"Pre-trigger window {pre_seconds}s exceeds the "
+                             f"{self.ring_capacity / self.rate_hz:g}s ring")
+        with self.lock:
+            trigger.reset()
+            self.trigger = trigger
+            self.mode = mode
+            self.pre_samples = pre_samples
+            self.post_samples = max(1, int(post_seconds * self.rate_hz))
+            self._buffer = None
+        log.info("Capture armed on %s (%gs pre, %gs post, %s)", trigger.describe(),
+                 pre_seconds, post_seconds, mode)
+
+    def disarm(self):
+        """Stop waiting for the trigger; a capture in progress is abandoned"""
+        with self.lock:
+            self.trigger = None
+            self._buffer = None
+
+    def on_alarm(self, event):
+        """AlarmEngine listener: forward raises to an armed alarm trigger"""
+        trigger = self.trigger
+        if isinstance(trigger, AlarmTrigger):
+            trigger.on_alarm(event)
+
+    def process_block(self, block):
+        """Telemetry callback: fill the ring, look for the trigger, collect post-trigger data"""
+        with self.lock:
+            if self.channels is None:
+                self.channels = block.channels
+                self.index = block.index
+                self._ring = np.zeros((self.ring_capacity, len(block.channels)))
+
+            data = block.data
+            start = self._collect(data) if self._buffer is not None else 0
+            # In AUTO mode the rows after a finished capture may hold the next trigger
+            while self._buffer is None and self.trigger is not None and start < len(data):
+                rest = block if start == 0 else SampleBlock(block.channels, block.index,
+                                                            data[start:])
+                position = self.trigger.find(rest, rest[self.time_channel])
+                if position is None:
+                    break
+                self._start_capture(data, start + position)
+                start += position + self._collect(data[start + position:])
+            self._append_to_ring(data)
+
+    def _start_capture(self, data, position):
+        """Begin a capture whose trigger is row `position` of the current block"""
+        # Pre-trigger rows: the ring's newest samples, then this block up to the trigger
+        from_block = min(position, self.pre_samples)
+        from_ring = min(self.pre_samples - from_block, self._ring_fill)
+        self._buffer = np.empty((from_ring + from_block + self.post_samples, len(self.channels)))
+        if from_ring:
+            rows = (self._ring_pos - from_ring + np.arange(from_ring)) % self.ring_capacity
+            self._buffer[:from_ring] = self._ring[rows]
+        self._buffer[from_ring:from_ring + from_block] = data[position - from_block:position]
+        self._fill = self._trigger_row = from_ring + from_block
+        self._trigger_time = float(data[position, self.index[self.time_channel]])
+
+    def _collect(self, data):
+        """Append post-trigger rows, finishing the capture when full; returns rows taken"""
+        take = min(len(data), len(self._buffer) - self._fill)
+        self._buffer[self._fill:self._fill + take] = data[:take]
+        self._fill += take
+        if self._fill < len(self._buffer):
+            return take
+
+        capture = {
+            'data': self._buffer,
+            'trigger': self.trigger.describe(),
+            'trigger_time': self._trigger_time,
+            'pre_samples': self._trigger_row,
+            'post_samples': self.post_samples,
+        }
+        self._buffer = None
+        self.capture_count += 1
+        if self.mode == AUTO:
+            # Raises queued for rows after this capture still count
+            self.trigger.reset(until=float(data[take - 1, self.index[self.time_channel]]))
+        else:
+            self.trigger = None
+        try:
+            self._queue.put_nowait(capture)
+        except queue.Full:
+            self.dropped += 1
+            log.warning("Capture writer behind; capture on %s dropped", capture['trigger'])
+        return take
+
+    def _append_to_ring(self, data):
+        rows = data[-self.ring_capacity:]
+        positions = (self._ring_pos + np.arange(len(rows))) % self.ring_capacity
+        self._ring[positions] = rows
+        self._ring_pos = (self._ring_pos + len(rows)) % self.ring_capacity
+        self._ring_fill = min(self._ring_fill + len(rows), self.ring_capacity)
+
+    def _write_loop(self):
+        """Writer thread: store each finished capture as a run"""
+        while True:
+            capture = self._queue.get()
+            if capture is None:
+                break
+            try:
+                self._write_capture(capture)
+            except Exception as e:
+                log.error("Writing capture on %s failed: %s", capture['trigger'], e)
+
+    def _write_capture(self, capture):
+        data = capture.pop('data')
+        wall = self.index.get('wall_time')
+        started = ended = None
+        if wall is not None:
+            started, ended = float(data[0, wall]), float(data[-1, wall])
+        self.recorder.start(dict(self.tags, capture=capture), started=started)
+        self.recorder.process_block(SampleBlock(self.channels, self.index, data))
+        self.last_run_id = self.recorder.stop(ended=ended)
+        log.info("Capture on %s saved as run %s", capture['trigger'], self.last_run_id,
+                 extra=fields(run_id=self.last_run_id, samples=len(data)))
+
+    def get_status(self):
+        return {
+            'state': self.state,
+            'trigger': self.trigger.describe() if self.trigger is not None else None,
+            'mode': self.mode,
+            'captures': self.capture_count,
+            'pending': self._queue.qsize(),
+            'dropped': self.dropped,
+            'last_run_id': self.last_run_id,
+        }
+
+    def close(self):
+        """Finish writing pending captures and stop the writer thread"""
+        self.disarm()
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,196 @@
+import json
+import os
+import sqlite3
+import threading
+
+from logic.eventlog import get_logger
+from logic.recorder import RunReader, list_runs, summarize_run
+
+log = get_logger('catalog')
+
+# (column, channel, statistic) pairs precomputed from each run's summary
+SUMMARY_COLUMNS = [
+    ('fan_min', 'fan_speed', 'min'),
+    ('fan_max', 'fan_speed', 'max'),
+    ('aoa_min', 'angle_of_attack', 'min'),
+    ('aoa_max', 'angle_of_attack', 'max'),
+    ('airspeed_max', 'airspeed_mph', 'max'),
+    ('airspeed_mean', 'airspeed_mph', 'mean'),
+    ('lift_min', 'lift_force', 'min'),
+    ('lift_max', 'lift_force', 'max'),
+    ('drag_max', 'drag_force', 'max'),
+]
+
+# Columns searched often enough to deserve an index
+INDEXED_COLUMNS = ('started', 'fan_min', 'fan_max', 'aoa_min', 'aoa_max',
+                   'lift_max', 'drag_max')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    started REAL,
+    ended REAL,
+    duration REAL,
+    sample_count INTEGER,
+    {summary_columns},
+    metadata TEXT
+)
+""".format(summary_columns=",\n    ".join(f"{name} REAL" for name, _, _ in SUMMARY_COLUMNS))
+
+class RunCatalog:
+    """
+    SQLite index of recorded runs
+    - WAL journal so the UI can query while a run is being added
+    - Per-run metadata plus precomputed summary columns, indexed for search
+    Queries only touch the database, never the raw run files.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self._sync_thread = None
+        self._stop = threading.Event()
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(SCHEMA)
+            for column in INDEXED_COLUMNS:
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_runs_{column} ON runs({column})")
+
+    def close(self):
+        # A background sync stops after its current run
+        self._stop.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+            self._sync_thread = None
+        with self.lock:
+            self.connection.close()
+
+    @property
+    def is_syncing(self):
+        return self._sync_thread is not None and self._sync_thread.is_alive()
+
+    def add_run(self, run_dir, metadata):
+        """Insert or replace one run (usable as a RunRecorder listener)"""
+        summary = metadata.get('summary') or {}
+        started = metadata.get('started')
+        ended = metadata.get('ended')
+        row = {
+            'run_id': metadata['run_id'],
+            'path': os.path.abspath(run_dir),
+            'started': started,
+            'ended': ended,
+            'duration': (ended - started) if started and ended else None,
+            'sample_count': metadata.get('sample_count', 0),
+            'metadata': json.dumps(metadata.get('user', {})),
+        }
+        for column, channel, statistic in SUMMARY_COLUMNS:
+            row[column] = summary.get(channel, {}).get(statistic)
+
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{name}" for name in row)
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO runs ({columns}) VALUES ({placeholders})", row)
+
+    def remove_run(self, run_id):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def sync(self, runs_dir):
+        """
+        Add runs found on disk that are not catalogued yet
+        Runs recorded with a summary only need their meta.json read; older
+        runs without one are summarized once by streaming their data.
+        """
+        with self.lock:
+            known = {row[0] for row in self.connection.execute("SELECT run_id FROM runs")}
+
+        added = 0
+        for run_dir in list_runs(runs_dir):
+            if self._stop.is_set():
+                break
+            if os.path.basename(run_dir) in known:
+                continue
+            try:
+                reader = RunReader(run_dir)
+                metadata = dict(reader.metadata)
+                if metadata.get('ended') is None:
+                    continue  # Still recording
+                if not metadata.get('summary'):
+                    metadata['summary'] = summarize_run(reader)
+                self.add_run(run_dir, metadata)
+                added += 1
+            except (OSError, ValueError, KeyError) as e:
+                log.warning("Skipping unreadable run %s: %s", run_dir, e)
+        if added:
+            log.info("Run catalog: indexed %d new run(s)", added)
+        return added
+
+    def sync_in_background(self, runs_dir):
+        """
+        sync() on a worker thread, so summarizing legacy runs never holds
+        up startup; runs appear in searches as they are indexed
+        """
+        if self.is_syncing:
+            return False
+        self._sync_thread = threading.Thread(target=self._sync_worker, args=(runs_dir,),
+                                             name="catalog-sync", daemon=True)
+        self._sync_thread.start()
+        return True
+
+    def _sync_worker(self, runs_dir):
+        try:
+            self.sync(runs_dir)
+        except sqlite3.Error as e:
+            log.error("Run catalog sync failed: %s", e)
+
+    def search(self, aoa_min=None, aoa_max=None, min_peak_lift=None, max_peak_drag=None,
+               fan_min=None, fan_max=None, started_after=None, started_before=None,
+               order_by='started', descending=True, limit=200):
+        """
+        Find runs by their precomputed summaries
+        aoa_min/aoa_max and fan_min/fan_max select runs whose whole range
+        lies inside the given bounds, e.g. aoa_min=10, aoa_max=15.
+        """
+        clauses = []
+        params = []
+        for column, op, value in (('aoa_min', '>=', aoa_min),
+                                  ('aoa_max', '<=', aoa_max),
+                                  ('lift_max', '>', min_peak_lift),
+                                  ('drag_max', '<=', max_peak_drag),
+                                  ('fan_min', '>=', fan_min),
+                                  ('fan_max', '<=', fan_max),
+                                  ('started', '>=', started_after),
+                                  ('started', '<', started_before)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+
+        valid_orders = {'started', 'duration', 'lift_max', 'drag_max', 'airspeed_max'}
+        if order_by not in valid_orders:
+            raise ValueError(f"Cannot order runs by '{order_by}'")
+
+        query = "SELECT * FROM runs"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'} LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            return [dict(row) for row in self.connection.execute(query, params)]
+
+    def get_run(self, run_id):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def count(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
@@ -0,0 +1,181 @@
+import threading
+import time
+
+from logic.eventlog import get_logger
+
+log = get_logger('commands')
+
+class CommandAck:
+    """Acknowledgement that a command reached its actuator"""
+
+    def __init__(self, actuator, value, latency, coalesced):
+        self.actuator = actuator
+        self.value = value
+        self.latency = latency  # Seconds from submit to applied
+        self.coalesced = coalesced  # Earlier values this one replaced
+
+class Actuator:
+    """One command target with its own rate limit and statistics"""
+
+    def __init__(self, name, apply, min_interval=0.0, minimum=None, maximum=None):
+        self.name = name
+        self.apply = apply
+        self.min_interval = min_interval
+        self.minimum = minimum
+        self.maximum = maximum
+        self.next_allowed = 0.0
+        self.pending = None  # (value, submitted_at, coalesced)
+        self.inflight = None
+        self.submitted = 0
+        self.applied = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.last_latency = None
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def clamp(self, value):
+        if self.minimum is not None:
+            value = max(self.minimum, value)
+        if self.maximum is not None:
+            value = min(self.maximum, value)
+        return value
+
+class CommandQueue:
+    """
+    Asynchronous setpoint pipeline between the UI and actuators
+    - One pending slot per actuator: a newer setpoint replaces an unsent one
+    - Writes to each actuator are at least min_interval apart
+    - Every applied command is acknowledged with its submit-to-apply latency
+    Commands are applied on a worker thread so a slow bus never blocks
+    the UI; adjust() works from the latest requested value so rapid taps
+    accumulate even before they reach the actuator.
+    """
+
+    def __init__(self):
+        self.actuators = {}
+        self.condition = threading.Condition()
+        self.listeners = []
+        self._running = False
+        self._thread = None
+
+    def register(self, name, apply, min_interval=0.0, minimum=None, maximum=None):
+        """apply(value) writes one setpoint; called on the worker thread"""
+        with self.condition:
+            self.actuators[name] = Actuator(name, apply, min_interval, minimum, maximum)
+
+    def add_listener(self, callback):
+        """callback(CommandAck) is called on the worker thread after each apply"""
+        self.listeners.append(callback)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="commands", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker after flushing commands that are due now"""
+        with self.condition:
+            self._running = False
+            self.condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def submit(self, name, value):
+        """Request a new absolute setpoint, replacing any unsent one"""
+        with self.condition:
+            actuator = self.actuators[name]
+            value = actuator.clamp(value)
+            coalesced = 0
+            if actuator.pending is not None:
+                coalesced = actuator.pending[2] + 1
+                actuator.coalesced += 1
+            actuator.pending = (value, time.perf_counter(), coalesced)
+            actuator.submitted += 1
+            self.condition.notify()
+        return value
+
+    def adjust(self, name, delta, current):
+        """Submit target + delta, where target is the latest requested value or current"""
+        target = self.get_target(name)
+        return self.submit(name, (current if target is None else target) + delta)
+
+    def cancel(self, name):
+        """Drop an unsent command"""
+        with self.condition:
+            self.actuators[name].pending = None
+
+    def get_target(self, name):
+        """Value queued or being applied, None once the actuator has caught up"""
+        with self.condition:
+            actuator = self.actuators[name]
+            if actuator.pending is not None:
+                return actuator.pending[0]
+            return actuator.inflight
+
+    def get_stats(self, name):
+        with self.condition:
+            actuator = self.actuators[name]
+            return {
+                'submitted': actuator.submitted,
+                'applied': actuator.applied,
+                'coalesced': actuator.coalesced,
+                'failed': actuator.failed,
+                'last_latency': actuator.last_latency,
+                'mean_latency': actuator.total_latency / actuator.applied if actuator.applied else None,
+                'max_latency': actuator.max_latency,
+            }
+
+    def _next_due(self, now):
+        """(actuator, wait) for the earliest pending command"""
+        due, wait = None, None
+        for actuator in self.actuators.values():
+            if actuator.pending is None:
+                continue
+            delay = max(actuator.next_allowed - now, 0.0)
+            if wait is None or delay < wait:
+                due, wait = actuator, delay
+        return due, wait
+
+    def _run(self):
+        """Worker thread: apply due commands, sleeping until the next one"""
+        while True:
+            with self.condition:
+                while True:
+                    due, wait = self._next_due(time.perf_counter())
+                    if due is not None and wait == 0.0:
+                        break
+                    if not self._running:
+                        return
+                    self.condition.wait(wait)
+                value, submitted_at, coalesced = due.pending
+                due.pending = None
+                due.inflight = value
+
+            try:
+                due.apply(value)
+                ok = True
+            except Exception as e:
+                ok = False
+                log.error("Command %s=%s failed: %s", due.name, value, e)
+            now = time.perf_counter()
+            latency = now - submitted_at
+
+            with self.condition:
+                due.inflight = None
+                due.next_allowed = now + due.min_interval
+                if ok:
+                    due.applied += 1
+                    due.last_latency = latency
+                    due.total_latency += latency
+                    due.max_latency = max(due.max_latency, latency)
+                else:
+                    due.failed += 1
+
+            if ok:
+                ack = CommandAck(due.name, value, latency, coalesced)
+                for listener in self.listeners:
+                    listener(ack)
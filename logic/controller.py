@@ -0,0 +1,244 @@
+import threading
+
+from logic.eventlog import get_logger, fields
+
+log = get_logger('controller')
+
+MPH_TO_MS = 0.44704
+
+class PIDController:
+    """
+    PID controller with anti-windup and feed-forward
+    - Derivative acts on the measurement (no kick on setpoint steps)
+    - Integrator only accumulates while the output is not saturated,
+      or when the error would pull it back out of saturation
+    - The integral is stored already scaled by ki so retuning is bumpless
+    """
+
+    def __init__(self, kp=1.0, ki=0.0, kd=0.0, output_min=0.0, output_max=100.0,
+                 derivative_filter=0.3):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_min = output_min
+        self.output_max = output_max
+        self.derivative_filter = derivative_filter  # 0-1, lower = smoother
+        self.reset()
+
+    def reset(self):
+        """Clear integrator and derivative state"""
+        self.integral = 0.0
+        self.derivative = 0.0
+        self.last_measurement = None
+        self.last_output = 0.0
+
+    def set_tuning(self, kp=None, ki=None, kd=None):
+        """Change gains on the fly"""
+        if kp is not None:
+            self.kp = kp
+        if ki is not None:
+            self.ki = ki
+        if kd is not None:
+            self.kd = kd
+
+    def get_tuning(self):
+        """Get current gains and limits"""
+        return {
+            'kp': self.kp,
+            'ki': self.ki,
+            'kd': self.kd,
+            'output_min': self.output_min,
+            'output_max': self.output_max
+        }
+
+    def clamp(self, value):
+        return max(self.output_min, min(self.output_max, value))
+
+    def update(self, setpoint, measurement, dt, feed_forward=0.0):
+        """Compute a new output for one control period"""
+        if dt <= 0:
+            return self.last_output
+
+        error = setpoint - measurement
+
+        # Filtered derivative on measurement
+        if self.last_measurement is not None:
+            raw = -(measurement - self.last_measurement) / dt
+            self.derivative += self.derivative_filter * (raw - self.derivative)
+        self.last_measurement = measurement
+
+        proportional = self.kp * error
+        derivative = self.kd * self.derivative
+        candidate = self.integral + self.ki * error * dt
+
+        unsaturated = feed_forward + proportional + candidate + derivative
+        output = self.clamp(unsaturated)
+
+        # Conditional integration (anti-windup)
+        if (unsaturated == output
+                or (unsaturated > self.output_max and error < 0)
+                or (unsaturated < self.output_min and error > 0)):
+            self.integral = candidate
+            output = self.clamp(feed_forward + proportional + self.integral + derivative)
+
+        self.last_output = output
+        return output
+
+class StepResponseTracker:
+    """
+    Measures the response to the latest setpoint step:
+    rise time (10-90%), overshoot, settling time and steady-state error
+    """
+
+    def __init__(self, settle_fraction=0.05, settle_min=0.5):
+        self.settle_fraction = settle_fraction
+        self.settle_min = settle_min  # Absolute band floor (noise allowance)
+        self.active = False
+        self.metrics = {}
+
+    def begin(self, initial, setpoint, now):
+        """Start tracking a new step"""
+        self.initial = initial
+        self.setpoint = setpoint
+        self.step = setpoint - initial
+        self.start_time = now
+        self.t10 = None
+        self.t90 = None
+        self.peak = initial
+        self.last_outside = now
+        self.active = abs(self.step) > 1e-9
+        self.metrics = {
+            'step_size': self.step,
+            'rise_time': None,
+            'overshoot_pct': 0.0,
+            'settling_time': None,
+            'steady_state_error': None
+        }
+
+    def update(self, measurement, now):
+        """Feed one measurement"""
+        if not self.active:
+            return
+
+        # Progress along the step, 0 at start and 1 at setpoint
+        progress = (measurement - self.initial) / self.step
+        elapsed = now - self.start_time
+
+        if self.t10 is None and progress >= 0.1:
+            self.t10 = elapsed
+        if self.t90 is None and progress >= 0.9:
+            self.t90 = elapsed
+            self.metrics['rise_time'] = self.t90 - (self.t10 or 0.0)
+
+        if progress > (self.peak - self.initial) / self.step:
+            self.peak = measurement
+        self.metrics['overshoot_pct'] = max(0.0, ((self.peak - self.initial) / self.step - 1) * 100)
+
+        band = max(self.settle_fraction * abs(self.step), self.settle_min)
+        error = self.setpoint - measurement
+        if abs(error) > band:
+            self.last_outside = now
+            self.metrics['settling_time'] = None
+        else:
+            self.metrics['settling_time'] = self.last_outside - self.start_time
+        self.metrics['steady_state_error'] = error
+
+    def get_metrics(self):
+        return dict(self.metrics)
+
+class AirspeedHold:
+    """
+    Closed-loop airspeed hold
+    Drives the simulator fan speed to hit an airspeed setpoint.
+    Meant to run as an AcquisitionLoop task at its own rate.
+    """
+
+    def __init__(self, simulator, rate_hz=50.0, kp=2.0, ki=6.0, kd=0.05,
+                 max_airspeed_mph=60.0, measurement_filter=0.3):
+        self.simulator = simulator
+        self.rate_hz = rate_hz
+        self.max_airspeed_mph = max_airspeed_mph
+        self.pid = PIDController(kp, ki, kd, output_min=0.0, output_max=100.0)
+        self.tracker = StepResponseTracker()
+        self.lock = threading.Lock()
+
+        # Feed-forward: simulator maps 100% fan to max_airspeed_mph
+        self.percent_per_ms = 100.0 / (max_airspeed_mph * MPH_TO_MS)
+        self.measurement_filter = measurement_filter
+
+        self.enabled = False
+        self.setpoint_ms = 0.0
+        self.filtered_ms = None
+        self.clock = 0.0
+
+    @property
+    def setpoint_mph(self):
+        return self.setpoint_ms / MPH_TO_MS
+
+    def engage(self, setpoint, unit='ms'):
+        """Enable airspeed hold at the given setpoint"""
+        with self.lock:
+            self.pid.reset()
+            self.enabled = True
+            self._set_setpoint(setpoint, unit)
+        log.info("Airspeed hold engaged at %.1f MPH", self.setpoint_mph,
+                 extra=fields(setpoint_mph=self.setpoint_mph))
+
+    def disengage(self):
+        """Return to manual fan control"""
+        with self.lock:
+            self.enabled = False
+            self.pid.reset()
+        log.info("Airspeed hold disengaged")
+
+    def set_setpoint(self, value, unit='ms'):
+        """Set a new setpoint in m/s ('ms') or MPH ('mph')"""
+        with self.lock:
+            self._set_setpoint(value, unit)
+
+    def adjust_setpoint(self, delta, unit='ms'):
+        """Nudge the setpoint by delta"""
+        with self.lock:
+            current = self.setpoint_mph if unit == 'mph' else self.setpoint_ms
+            self._set_setpoint(current + delta, unit)
+
+    def _set_setpoint(self, value, unit):
+        value_ms = value * MPH_TO_MS if unit == 'mph' else value
+        self.setpoint_ms = max(0.0, min(value_ms, 100.0 / self.percent_per_ms))
+        initial = self.filtered_ms if self.filtered_ms is not None else 0.0
+        self.tracker.begin(initial, self.setpoint_ms, self.clock)
+
+    def update(self, data, dt):
+        """Acquisition task: one control step"""
+        with self.lock:
+            self.clock += dt
+            measurement = data['airspeed_ms']
+            if self.filtered_ms is None:
+                self.filtered_ms = measurement
+            else:
+                self.filtered_ms += self.measurement_filter * (measurement - self.filtered_ms)
+
+            if not self.enabled:
+                return
+            if not data.get('is_running'):
+                self.pid.reset()
+                return
+
+            self.tracker.update(self.filtered_ms, self.clock)
+            feed_forward = self.setpoint_ms * self.percent_per_ms
+            output = self.pid.update(self.setpoint_ms, self.filtered_ms, dt, feed_forward)
+
+        self.simulator.set_fan_speed(output, quiet=True)
+
+    def get_status(self):
+        """Get setpoint, tuning and step-response metrics"""
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'setpoint_ms': self.setpoint_ms,
+                'setpoint_mph': self.setpoint_mph,
+                'airspeed_ms': self.filtered_ms,
+                'output': self.pid.last_output,
+                'tuning': self.pid.get_tuning(),
+                'step_response': self.tracker.get_metrics()
+            }
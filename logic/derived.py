@@ -0,0 +1,173 @@
+import threading
+
+import numpy as np
+
+from logic.acquisition import SampleBlock
+
+# Reference values matching WindTunnelSimulator.calculate_lift_drag
+AIR_DENSITY = 1.225  # kg/m³ at sea level
+WING_AREA = 0.1  # m²
+CHORD = 0.1  # m, reference chord for Reynolds number
+AIR_VISCOSITY = 1.81e-5  # Pa·s at 15 °C
+
+def safe_ratio(numerator, denominator):
+    """numerator / denominator, 0 where the denominator is 0 (scalars or arrays)"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out if out.ndim else float(out)
+
+class DerivedChannel:
+    """
+    A channel computed from other channels
+    func receives the input values positionally and must work on both
+    floats (live samples) and NumPy arrays (recorded blocks).
+    """
+
+    def __init__(self, name, inputs, func, unit="", label=""):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.func = func
+        self.unit = unit
+        self.label = label or name
+
+class DerivedChannelGraph:
+    """
+    Lazily evaluated derived channels over acquisition samples
+    - Channels declare their inputs: base channels or earlier derived ones
+    - Only subscribed channels, plus what they depend on, are computed
+    - Live results are memoized per sample, keyed by its sequence channel
+    - evaluate_block() computes whole columns at once for recorded data
+    """
+
+    def __init__(self, channels=(), sequence_channel='timestamp'):
+        self.channels = {}
+        self.sequence_channel = sequence_channel
+        self.lock = threading.Lock()
+        self.subscribers = {}  # name -> subscription count
+        self._plan = ()  # Subscribed channels and dependencies, inputs first
+        self._memo_key = None
+        self._memo = {}
+        for channel in channels:
+            self.register(channel)
+
+    def register(self, channel):
+        """Add a channel; derived inputs must already be registered"""
+        with self.lock:
+            if channel.name in self.channels:
+                raise ValueError(f"Derived channel '{channel.name}' already registered")
+            self.channels[channel.name] = channel
+        return channel
+
+    def subscribe(self, *names):
+        """Start computing these channels for live samples"""
+        with self.lock:
+            for name in names:
+                if name not in self.channels:
+                    raise KeyError(f"Unknown derived channel '{name}'")
+                self.subscribers[name] = self.subscribers.get(name, 0) + 1
+            self._replan()
+
+    def unsubscribe(self, *names):
+        """Drop a subscription; channels nobody needs stop being computed"""
+        with self.lock:
+            for name in names:
+                count = self.subscribers.get(name, 0) - 1
+                if count > 0:
+                    self.subscribers[name] = count
+                else:
+                    self.subscribers.pop(name, None)
+            self._replan()
+
+    @property
+    def active(self):
+        """Names of the channels currently computed for live samples"""
+        return tuple(channel.name for channel in self._plan)
+
+    def resolve(self, names):
+        """Derived channels needed for names, in evaluation order"""
+        order = []
+        seen = set()
+
+        def visit(name):
+            if name in seen or name not in self.channels:
+                return
+            seen.add(name)
+            channel = self.channels[name]
+            for dependency in channel.inputs:
+                visit(dependency)
+            order.append(channel)
+
+        for name in names:
+            if name not in self.channels:
+                raise KeyError(f"Unknown derived channel '{name}'")
+            visit(name)
+        return tuple(order)
+
+    def available(self, base_channels):
+        """Registered channels computable from the given base channels"""
+        known = set(base_channels)
+        names = []
+        for name, channel in self.channels.items():
+            if all(dependency in known for dependency in channel.inputs):
+                known.add(name)
+                names.append(name)
+        return names
+
+    def _replan(self):
+        self._plan = self.resolve(self.subscribers)
+        self._memo_key = None
+
+    def evaluate(self, sample):
+        """Values of the subscribed channels (and their inputs) for one sample dict"""
+        key = sample.get(self.sequence_channel)
+        if key is not None and key == self._memo_key:
+            return self._memo
+
+        plan = self._plan
+        values = {}
+        for channel in plan:
+            values[channel.name] = channel.func(*[
+                values[name] if name in values else sample[name]
+                for name in channel.inputs])
+        self._memo_key, self._memo = key, values
+        return values
+
+    def evaluate_block(self, block, names=None):
+        """
+        Columns for names (default: the subscribed channels) over a block
+        block is anything indexed by channel name, e.g. a SampleBlock.
+        """
+        plan = self._plan if names is None else self.resolve(names)
+        columns = {}
+        for channel in plan:
+            columns[channel.name] = np.broadcast_to(channel.func(*[
+                columns[name] if name in columns else block[name]
+                for name in channel.inputs]), (len(block),))
+        if names is None:
+            return columns
+        return {name: columns[name] for name in names}
+
+    def append_columns(self, channels, rows, names):
+        """rows (n, len(channels)) with the named derived columns appended"""
+        index = {name: i for i, name in enumerate(channels)}
+        columns = self.evaluate_block(SampleBlock(channels, index, rows), names)
+        return np.column_stack([rows] + [columns[name] for name in names])
+
+def build_default_channels():
+    """Aerodynamic channels derived from the simulator's base fields"""
+    return [
+        DerivedChannel('airspeed_kmh', ('airspeed_ms',),
+                       lambda v: v * 3.6, unit="km/h", label="Airspeed"),
+        DerivedChannel('dynamic_pressure_pa', ('airspeed_ms',),
+                       lambda v: 0.5 * AIR_DENSITY * v * v, unit="Pa", label="q"),
+        DerivedChannel('lift_coefficient', ('lift_force', 'dynamic_pressure_pa'),
+                       lambda lift, q: safe_ratio(lift, q * WING_AREA), label="Cl"),
+        DerivedChannel('drag_coefficient', ('drag_force', 'dynamic_pressure_pa'),
+                       lambda drag, q: safe_ratio(drag, q * WING_AREA), label="Cd"),
+        DerivedChannel('lift_drag_ratio', ('lift_force', 'drag_force'),
+                       safe_ratio, label="L/D"),
+        DerivedChannel('reynolds_number', ('airspeed_ms',),
+                       lambda v: AIR_DENSITY * v * CHORD / AIR_VISCOSITY, label="Re"),
+    ]
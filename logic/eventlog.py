@@ -0,0 +1,160 @@
+import collections
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+# Parent of every application logger (see get_logger)
+LOGGER_NAME = 'windtunnel'
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+def get_logger(name):
+    """Logger for one module, e.g. get_logger('simulator')"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+def fields(**values):
+    """extra= for structured fields: log.info("...", extra=fields(fan_speed=50))"""
+    return {'fields': values}
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per message template
+    A call site may log `burst` records at once and `rate` per second
+    after that; the rest are dropped and their count is attached to the
+    next record that gets through (record.suppressed).
+    """
+
+    def __init__(self, rate=5.0, burst=10):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}  # (logger, template) -> [tokens, last_time, suppressed]
+        self.suppressed = 0
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True  # Never hide errors
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [float(self.burst), now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] = tokens - 1.0
+            record.suppressed, bucket[2] = bucket[2], 0
+        return True
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when full"""
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class EventRing(logging.Handler):
+    """Bounded in-memory ring of recent events for viewing on the device"""
+
+    def __init__(self, capacity=500):
+        super().__init__()
+        self.events = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.events.append({
+            'time': record.created,
+            'level': record.levelname,
+            'source': record.name.rpartition('.')[2],
+            'message': record.getMessage(),
+            'fields': getattr(record, 'fields', {}),
+            'suppressed': getattr(record, 'suppressed', 0),
+        })
+
+    def recent(self, count=None, min_level=logging.NOTSET):
+        """Newest events last; min_level filters by numeric level"""
+        events = [event for event in list(self.events)
+                  if logging.getLevelName(event['level']) >= min_level]
+        return events[-count:] if count else events
+
+class EventLog:
+    """
+    Non-blocking structured event log
+    Application loggers hand records to a bounded queue (QueueHandler);
+    a background QueueListener thread formats and writes them to stderr,
+    an optional rotating file and an in-memory ring. Logging calls never
+    block the caller: repeated messages are rate limited per call site
+    and records are dropped (and counted) if the writer falls behind.
+    """
+
+    def __init__(self, level=logging.INFO, capacity=500, max_pending=1000,
+                 rate=5.0, burst=10, stream=sys.stderr, path=None):
+        self.level = level
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.ring = EventRing(capacity)
+        handlers = [self.ring]
+        formatter = logging.Formatter(LOG_FORMAT)
+        if stream is not None:
+            stream_handler = logging.StreamHandler(stream)
+            stream_handler.setFormatter(formatter)
+            handlers.append(stream_handler)
+        if path:
+            file_handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=1024 * 1024, backupCount=3)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        self.handlers = handlers
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers)
+        self.rate_limit = RateLimitFilter(rate, burst)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.handler.addFilter(self.rate_limit)
+        self.logger = logging.getLogger(LOGGER_NAME)
+        self.is_active = False
+
+    def start(self):
+        """Attach to the application loggers and start the writer thread"""
+        if self.is_active:
+            return
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(self.level)
+        # Kivy hangs its own (synchronous) handlers off the root logger
+        self.logger.propagate = False
+        self.listener.start()
+        self.is_active = True
+
+    def stop(self):
+        """Flush pending records and stop the writer thread"""
+        if not self.is_active:
+            return
+        self.logger.removeHandler(self.handler)
+        self.logger.propagate = True
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+        self.is_active = False
+
+    def recent(self, count=None, min_level=logging.NOTSET):
+        """Most recent events from the in-memory ring"""
+        return self.ring.recent(count, min_level)
+
+    def get_stats(self):
+        return {
+            'pending': self.queue.qsize(),
+            'dropped': self.handler.dropped,
+            'suppressed': self.rate_limit.suppressed,
+            'buffered': len(self.ring.events),
+        }
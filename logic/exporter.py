@@ -0,0 +1,304 @@
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from logic.eventlog import get_logger, fields
+
+log = get_logger('exporter')
+
+EXPORT_FORMATS = ('csv', 'parquet', 'hdf5')
+
+class CsvChunkWriter:
+    """Plain CSV with a header row (stdlib only)"""
+
+    extension = '.csv'
+
+    def open(self, path, channels):
+        self.file = open(path, 'w', newline='')
+        self.file.write(','.join(channels) + '\n')
+
+    def write(self, chunk):
+        np.savetxt(self.file, chunk, delimiter=',', fmt='%.15g')
+
+    def close(self):
+        self.file.close()
+
+class ParquetChunkWriter:
+    """Parquet via pyarrow, one row group per chunk"""
+
+    extension = '.parquet'
+
+    def open(self, path, channels):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+        self.pa = pa
+        self.channels = list(channels)
+        schema = pa.schema([(name, pa.float64()) for name in self.channels])
+        self.writer = pq.ParquetWriter(path, schema, compression='snappy')
+
+    def write(self, chunk):
+        columns = [self.pa.array(chunk[:, i]) for i in range(chunk.shape[1])]
+        self.writer.write_table(self.pa.Table.from_arrays(columns, names=self.channels))
+
+    def close(self):
+        self.writer.close()
+
+class Hdf5ChunkWriter:
+    """HDF5 table via pandas/PyTables, readable with pandas.read_hdf(path, 'telemetry')"""
+
+    extension = '.h5'
+    key = 'telemetry'
+
+    def open(self, path, channels):
+        try:
+            import pandas as pd
+            self.store = pd.HDFStore(path, mode='w', complevel=5, complib='zlib')
+        except ImportError:
+            raise ImportError("HDF5 export needs pandas and tables: pip install pandas tables")
+        self.pd = pd
+        self.channels = list(channels)
+
+    def write(self, chunk):
+        frame = self.pd.DataFrame(chunk, columns=self.channels)
+        self.store.append(self.key, frame, format='table', index=False)
+
+    def close(self):
+        self.store.close()
+
+WRITERS = {
+    'csv': CsvChunkWriter,
+    'parquet': ParquetChunkWriter,
+    'hdf5': Hdf5ChunkWriter,
+}
+
+def make_writer(fmt):
+    """Create the chunk writer for an export format"""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {EXPORT_FORMATS}")
+    return WRITERS[fmt]()
+
+class RunExporter:
+    """
+    Exports a recorded run on a background thread in fixed-size chunks
+    Progress (0-1) and status can be polled from the UI thread.
+    """
+
+    def __init__(self, chunk_rows=10000):
+        self.chunk_rows = chunk_rows
+        self.lock = threading.Lock()
+        self.progress = 0.0
+        self.status = 'idle'  # idle, running, done, failed, cancelled
+        self.message = ""
+        self.output_path = None
+        self._thread = None
+        self._cancel = threading.Event()
+
+    @property
+    def is_busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def export(self, reader, path, fmt='csv', on_done=None, derived=None):
+        """
+        Start exporting a RunReader to path; returns False if already busy
+        With a DerivedChannelGraph, every derived channel computable from
+        the run's channels is appended as extra columns.
+        """
+        if self.is_busy:
+            return False
+        writer = make_writer(fmt)
+        if not path.endswith(writer.extension):
+            path += writer.extension
+
+        self._cancel.clear()
+        self._set_state(0.0, 'running', f"Exporting {reader.run_id}")
+        self.output_path = path
+        self._thread = threading.Thread(target=self._run, args=(reader, writer, path, on_done, derived),
+                                        name="exporter", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        self._cancel.set()
+
+    def get_state(self):
+        with self.lock:
+            return self.progress, self.status, self.message
+
+    def _set_state(self, progress, status, message):
+        with self.lock:
+            self.progress = progress
+            self.status = status
+            self.message = message
+
+    def _run(self, reader, writer, path, on_done, derived=None):
+        """Worker thread body"""
+        started = time.time()
+        total = max(reader.sample_count, 1)
+        written = 0
+        derived_names = derived.available(reader.channels) if derived else []
+        try:
+            writer.open(path, list(reader.channels) + derived_names)
+            try:
+                for chunk in reader.iter_chunks(self.chunk_rows):
+                    if self._cancel.is_set():
+                        break
+                    if derived_names:
+                        chunk = derived.append_columns(reader.channels, chunk, derived_names)
+                    writer.write(chunk)
+                    written += len(chunk)
+                    self._set_state(min(written / total, 1.0), 'running',
+                                    f"Exported {written}/{total} samples")
+            finally:
+                writer.close()
+        except Exception as e:
+            self._set_state(self.progress, 'failed', f"Export failed: {e}")
+            log.error("Export of %s failed: %s", reader.run_id, e)
+        else:
+            if self._cancel.is_set():
+                self._set_state(self.progress, 'cancelled', "Export cancelled")
+            else:
+                self._set_state(1.0, 'done', f"Exported {written} samples")
+                log.info("Exported %s to %s (%d samples, %.1fs)",
+                         reader.run_id, path, written, time.time() - started)
+        if on_done:
+            on_done(self)
+
+class LiveExporter:
+    """
+    Streams a live session straight to an export file
+    Runs as a telemetry callback (see LiveExportControl): samples are
+    packed into fixed-size chunks that a background thread writes out.
+    The hand-off queue is bounded; if the writer falls behind, chunks are
+    dropped and counted rather than stalling acquisition.
+    """
+
+    def __init__(self, path, fmt='csv', chunk_rows=1000, max_pending=8):
+        self.writer = make_writer(fmt)
+        self.path = path if path.endswith(self.writer.extension) else path + self.writer.extension
+        self.chunk_rows = chunk_rows
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.samples_written = 0
+        self.chunks_dropped = 0
+        self.error = None
+        self.lock = threading.Lock()  # Publishing thread vs close()
+        self.closed = False
+        self._chunk = None
+        self._fill = 0
+        self._channels = None
+        self._thread = None
+
+    def process_block(self, block):
+        """Telemetry callback: copy samples into the current chunk"""
+        with self.lock:
+            if not self.closed:
+                self._append(block)
+
+    def _append(self, block):
+        if self._chunk is None:
+            self._channels = block.channels
+            self._chunk = np.empty((self.chunk_rows, len(block.channels)))
+            self._thread = threading.Thread(target=self._run, name="live-exporter", daemon=True)
+            self._thread.start()
+
+        data = block.data
+        while len(data):
+            take = min(len(data), self.chunk_rows - self._fill)
+            self._chunk[self._fill:self._fill + take] = data[:take]
+            self._fill += take
+            data = data[take:]
+            if self._fill == self.chunk_rows:
+                self._hand_off(self._chunk)
+                self._chunk = np.empty_like(self._chunk)
+                self._fill = 0
+
+    def close(self, timeout=5.0):
+        """Flush the partial chunk and wait (up to timeout) for the writer to finish"""
+        with self.lock:
+            self.closed = True
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            if self._fill:
+                self._hand_off(self._chunk[:self._fill])
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+        if thread.is_alive():
+            log.warning("Live export to %s still writing after %.0fs", self.path, timeout)
+
+    def _hand_off(self, chunk):
+        try:
+            self.queue.put_nowait(chunk)
+        except queue.Full:
+            self.chunks_dropped += 1
+
+    def _run(self):
+        """Writer thread body"""
+        try:
+            self.writer.open(self.path, self._channels)
+        except Exception as e:
+            self.error = e
+            log.error("Live export to %s failed: %s", self.path, e)
+            # Keep draining so the acquisition side never blocks
+            while self.queue.get() is not None:
+                pass
+            return
+        try:
+            while True:
+                chunk = self.queue.get()
+                if chunk is None:
+                    break
+                self.writer.write(chunk)
+                self.samples_written += len(chunk)
+        finally:
+            self.writer.close()
+
+class LiveExportControl:
+    """
+    Starts and stops streaming a tunnel's telemetry to an export file
+    Each live session gets its own LiveExporter, subscribed to every
+    channel of the telemetry bus and named after the tunnel and start time.
+    """
+
+    def __init__(self, telemetry, export_dir, prefix="live"):
+        self.telemetry = telemetry
+        self.export_dir = export_dir
+        self.prefix = prefix
+        self.exporter = None
+        self._subscription = None
+
+    @property
+    def is_active(self):
+        return self.exporter is not None
+
+    def start(self, fmt='csv'):
+        """Begin a live session; returns its LiveExporter (None if one is running)"""
+        if self.exporter is not None:
+            return None
+        os.makedirs(self.export_dir, exist_ok=True)
+        path = os.path.join(self.export_dir, f"{self.prefix}-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.exporter = LiveExporter(path, fmt)
+        self._subscription = self.telemetry.subscribe('live_export',
+                                                      callback=self.exporter.process_block)
+        log.info("Live export to %s started", self.exporter.path)
+        return self.exporter
+
+    def stop(self):
+        """End the live session; returns the closed LiveExporter (None if none ran)"""
+        exporter, self.exporter = self.exporter, None
+        if exporter is None:
+            return None
+        self.telemetry.unsubscribe(self._subscription)
+        self._subscription = None
+        exporter.close()
+        log.info("Live export to %s stopped (%d samples)", exporter.path, exporter.samples_written,
+                 extra=fields(chunks_dropped=exporter.chunks_dropped))
+        return exporter
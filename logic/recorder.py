@@ -0,0 +1,279 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from logic.blockstore import BlockStoreWriter, BlockStoreReader
+from logic.eventlog import get_logger, fields
+
+log = get_logger('recorder')
+
+# Recorded runs live next to the application unless told otherwise
+DEFAULT_RUNS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'runs')
+
+META_FILE = 'meta.json'
+DATA_FILE = 'data.wtb'  # Block-compressed store (see logic/blockstore.py)
+RAW_DATA_FILE = 'data.f64'  # Uncompressed rows from older recordings
+
+class ChannelSummary:
+    """
+    Per-channel min/max/mean accumulated block by block
+    Stored in meta.json so catalogs never need to rescan the data file
+    """
+
+    def __init__(self):
+        self.channels = None
+        self.count = 0
+
+    def update(self, channels, data):
+        if len(data) == 0:
+            return
+        if self.channels is None:
+            self.channels = tuple(channels)
+            self.minimum = data.min(axis=0)
+            self.maximum = data.max(axis=0)
+            self.total = data.sum(axis=0)
+        else:
+            np.minimum(self.minimum, data.min(axis=0), out=self.minimum)
+            np.maximum(self.maximum, data.max(axis=0), out=self.maximum)
+            self.total += data.sum(axis=0)
+        self.count += len(data)
+
+    def to_dict(self):
+        if self.channels is None:
+            return {}
+        return {name: {'min': float(self.minimum[i]),
+                       'max': float(self.maximum[i]),
+                       'mean': float(self.total[i] / self.count)}
+                for i, name in enumerate(self.channels)}
+
+class RunRecorder:
+    """
+    Records acquisition sample blocks to disk
+    Each run is a directory holding meta.json plus a block-compressed store.
+    Runs as an AcquisitionLoop block processor; compression and writes
+    happen on a background writer thread. At most max_pending blocks wait
+    for the writer: if storage stalls, further blocks are dropped and
+    counted (dropped_samples in meta.json) rather than held in memory.
+    """
+
+    def __init__(self, runs_dir=DEFAULT_RUNS_DIR, block_rows=1024, codec='zlib', max_pending=512):
+        self.runs_dir = runs_dir
+        self.block_rows = block_rows
+        self.codec = codec
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.run_id = None
+        self.run_dir = None
+        self.metadata = None
+        self.sample_count = 0
+        self.dropped_samples = 0
+        self.summary = None
+        self.listeners = []
+        self._writer = None
+        self._queue = None
+        self._thread = None
+
+    def add_listener(self, callback):
+        """callback(run_dir, metadata) is called after each run is saved"""
+        self.listeners.append(callback)
+
+    @property
+    def is_recording(self):
+        return self.run_id is not None
+
+    def start(self, metadata=None, started=None):
+        """Begin a new run, returning its run ID (started: wall time, default now)"""
+        with self.lock:
+            if self.is_recording:
+                return self.run_id
+            run_id = time.strftime('%Y%m%d-%H%M%S')
+            run_dir = os.path.join(self.runs_dir, run_id)
+            suffix = 1
+            while os.path.exists(run_dir):
+                suffix += 1
+                run_dir = os.path.join(self.runs_dir, f"{run_id}-{suffix}")
+            os.makedirs(run_dir)
+
+            self.run_id = os.path.basename(run_dir)
+            self.run_dir = run_dir
+            self.sample_count = 0
+            self.dropped_samples = 0
+            self.summary = ChannelSummary()
+            self.metadata = {
+                'run_id': self.run_id,
+                'started': time.time() if started is None else started,
+                'ended': None,
+                # Sample 'timestamp' is monotonic seconds; wall = wall_anchor + (t - monotonic_anchor)
+                'clock': {'timestamp': 'monotonic',
+                          'wall_anchor': time.time(),
+                          'monotonic_anchor': time.monotonic()},
+                'channels': None,
+                'sample_count': 0,
+                'summary': {},
+                'format': 'wtb1',
+                'codec': self.codec,
+                'user': dict(metadata or {})
+            }
+            self._write_metadata(run_dir, self.metadata)
+        log.info("Recording run %s", self.run_id, extra=fields(run_id=self.run_id))
+        return self.run_id
+
+    def stop(self, ended=None):
+        """Finish the current run, returning its run ID (ended: wall time, default now)"""
+        ended = time.time() if ended is None else ended
+        with self.lock:
+            if not self.is_recording:
+                return None
+            run_id = self.run_id
+            run_dir = self.run_dir
+            metadata = self.metadata
+            writer, blocks, thread = self._writer, self._queue, self._thread
+            self._writer = self._queue = self._thread = None
+            metadata['ended'] = ended
+            metadata['sample_count'] = self.sample_count
+            metadata['dropped_samples'] = self.dropped_samples
+            metadata['summary'] = self.summary.to_dict()
+            self.run_id = None
+
+        # Drain the writer backlog without the lock, so acquisition (and a
+        # new run) aren't held up behind a slow card
+        if thread is not None:
+            blocks.put(None)
+            thread.join()
+        if writer is not None:
+            metadata['stored_bytes'] = writer.bytes_written
+        self._write_metadata(run_dir, metadata)
+        metadata = dict(metadata)
+        log.info("Run %s saved (%d samples)", run_id, metadata['sample_count'],
+                 extra=fields(run_id=run_id, sample_count=metadata['sample_count'],
+                              dropped_samples=metadata['dropped_samples']))
+
+        for listener in self.listeners:
+            try:
+                listener(run_dir, metadata)
+            except Exception as e:
+                log.error("Run listener failed for %s: %s", run_id, e)
+        return run_id
+
+    def process_block(self, block):
+        """Block processor: append a block to the current run"""
+        with self.lock:
+            if not self.is_recording:
+                return
+            if self._writer is None:
+                self.metadata['channels'] = list(block.channels)
+                self._write_metadata(self.run_dir, self.metadata)
+                self._writer = BlockStoreWriter(os.path.join(self.run_dir, DATA_FILE),
+                                                block.channels, block_rows=self.block_rows,
+                                                codec=self.codec)
+                self._queue = queue.Queue(maxsize=self.max_pending)
+                self._thread = threading.Thread(target=self._write_loop, args=(self._writer, self._queue),
+                                                name="recorder", daemon=True)
+                self._thread.start()
+            try:
+                self._queue.put_nowait(block.data)
+            except queue.Full:
+                self.dropped_samples += len(block)
+                if self.dropped_samples == len(block):
+                    log.warning("Run %s: writer fell behind, dropping blocks", self.run_id)
+                return
+            self.summary.update(block.channels, block.data)
+            self.sample_count += len(block)
+
+    def _write_loop(self, writer, blocks):
+        """Writer thread: compress and store blocks until the stop sentinel"""
+        try:
+            while True:
+                data = blocks.get()
+                if data is None:
+                    break
+                writer.write(data)
+        finally:
+            writer.close()
+
+    def _write_metadata(self, run_dir, metadata):
+        path = os.path.join(run_dir, META_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+class RunReader:
+    """
+    Reads a recorded run in fixed-size chunks with bounded memory
+    Handles both block-compressed and older raw recordings.
+    """
+
+    def __init__(self, run_dir):
+        self.run_dir = run_dir
+        with open(os.path.join(run_dir, META_FILE)) as f:
+            self.metadata = json.load(f)
+        self.channels = tuple(self.metadata['channels'] or ())
+        self.index = {name: i for i, name in enumerate(self.channels)}
+        self.data_path = os.path.join(run_dir, DATA_FILE)
+        self.store = None
+        if os.path.exists(self.data_path):
+            self.store = BlockStoreReader(self.data_path)
+        else:
+            self.data_path = os.path.join(run_dir, RAW_DATA_FILE)
+
+    @property
+    def run_id(self):
+        return self.metadata['run_id']
+
+    @property
+    def sample_count(self):
+        """Samples on disk (also valid while the run is still recording)"""
+        if self.store is not None:
+            return self.store.sample_count
+        if not self.channels or not os.path.exists(self.data_path):
+            return 0
+        return os.path.getsize(self.data_path) // (8 * len(self.channels))
+
+    def iter_chunks(self, chunk_rows=10000):
+        """Yield (n, channels) float64 arrays of at most chunk_rows rows"""
+        if self.store is not None:
+            for block in self.store.iter_blocks():
+                for start in range(0, len(block), chunk_rows):
+                    yield block[start:start + chunk_rows]
+            return
+        if not self.channels or not os.path.exists(self.data_path):
+            return
+        row_count = self.sample_count
+        width = len(self.channels)
+        with open(self.data_path, 'rb') as f:
+            remaining = row_count
+            while remaining > 0:
+                rows = min(chunk_rows, remaining)
+                chunk = np.fromfile(f, dtype=np.float64, count=rows * width)
+                if len(chunk) < rows * width:
+                    break
+                remaining -= rows
+                yield chunk.reshape(rows, width)
+
+    def read_range(self, t_start, t_end):
+        """Rows with t_start <= timestamp <= t_end"""
+        if self.store is not None:
+            return self.store.read_range(t_start, t_end)
+        time_index = self.index['timestamp']
+        parts = [chunk[(chunk[:, time_index] >= t_start) & (chunk[:, time_index] <= t_end)]
+                 for chunk in self.iter_chunks()]
+        return np.concatenate(parts) if parts else np.empty((0, len(self.channels)))
+
+def summarize_run(reader, chunk_rows=10000):
+    """Compute a ChannelSummary dict by streaming a run (for old runs)"""
+    summary = ChannelSummary()
+    for chunk in reader.iter_chunks(chunk_rows):
+        summary.update(reader.channels, chunk)
+    return summary.to_dict()
+
+def list_runs(runs_dir=DEFAULT_RUNS_DIR):
+    """Run directories under runs_dir, newest first"""
+    if not os.path.isdir(runs_dir):
+        return []
+    runs = [os.path.join(runs_dir, name) for name in os.listdir(runs_dir)
+            if os.path.exists(os.path.join(runs_dir, name, META_FILE))]
+    return sorted(runs, reverse=True)
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from logic.recorder import RunReader, DEFAULT_RUNS_DIR
+from logic.derived import DerivedChannelGraph, build_default_channels
+from logic.acqprocess import main_script_hidden
+from logic.eventlog import get_logger, fields
+
+log = get_logger('reports')
+
+# Generated reports are cached next to the runs they describe
+DEFAULT_REPORTS_DIR = os.path.join(DEFAULT_RUNS_DIR, 'reports')
+
+REPORT_FORMATS = ('png', 'pdf')
+
+# Channels a run needs for a polar
+POLAR_CHANNELS = ('angle_of_attack', 'airspeed_ms', 'lift_force', 'drag_force')
+
+# Summary table columns: (key, heading, format)
+TABLE_COLUMNS = [
+    ('angle_of_attack', "AoA (°)", "{:.1f}"),
+    ('samples', "Samples", "{:d}"),
+    ('airspeed_ms', "V (m/s)", "{:.1f}"),
+    ('lift_force', "Lift (N)", "{:.2f}"),
+    ('drag_force', "Drag (N)", "{:.2f}"),
+    ('lift_coefficient', "Cl", "{:.3f}"),
+    ('drag_coefficient', "Cd", "{:.3f}"),
+    ('lift_drag_ratio', "L/D", "{:.1f}"),
+]
+
+def compute_polar(reader, bin_deg=1.0, min_airspeed_ms=2.0, chunk_rows=10000, progress=None):
+    """
+    Per angle-of-attack bin means of a recorded sweep
+    Samples below min_airspeed_ms (fan off or spinning up) are left out.
+    Returns a dict of equal-length arrays, one entry per occupied bin,
+    sorted by angle. progress(fraction) is called as chunks are read.
+    """
+    missing = [name for name in POLAR_CHANNELS if name not in reader.index]
+    if missing:
+        raise ValueError(f"Run {reader.run_id} has no {', '.join(missing)} channel")
+    derived = DerivedChannelGraph(build_default_channels())
+    names = ['lift_coefficient', 'drag_coefficient']
+    columns = list(POLAR_CHANNELS) + names
+    index = [reader.index[name] for name in POLAR_CHANNELS]
+
+    sums = {}  # bin -> per-column sums
+    counts = {}
+    total = max(reader.sample_count, 1)
+    done = 0
+    for chunk in reader.iter_chunks(chunk_rows):
+        done += len(chunk)
+        rows = derived.append_columns(reader.channels, chunk, names)
+        rows = rows[:, index + [len(reader.channels), len(reader.channels) + 1]]
+        rows = rows[rows[:, 1] >= min_airspeed_ms]
+        if len(rows):
+            bins, inverse = np.unique(np.round(rows[:, 0] / bin_deg).astype(int),
+                                      return_inverse=True)
+            chunk_sums = np.zeros((len(bins), rows.shape[1]))
+            np.add.at(chunk_sums, inverse, rows)
+            chunk_counts = np.bincount(inverse, minlength=len(bins))
+            for i, key in enumerate(bins):
+                sums[key] = sums.get(key, 0.0) + chunk_sums[i]
+                counts[key] = counts.get(key, 0) + int(chunk_counts[i])
+        if progress:
+            progress(min(done / total, 1.0))
+
+    keys = sorted(sums)
+    means = np.array([sums[key] / counts[key] for key in keys]).reshape(len(keys), len(columns))
+    polar = {name: means[:, i] for i, name in enumerate(columns)}
+    polar['samples'] = np.array([counts[key] for key in keys], dtype=int)
+    polar['lift_drag_ratio'] = np.asarray(derived.channels['lift_drag_ratio'].func(
+        polar['lift_force'], polar['drag_force']))
+    return polar
+
+def render_report(polar, path, fmt, title):
+    """Lay out the polar, Cl-vs-AoA plot and summary table and save as fmt"""
+    try:
+        import matplotlib
+    except ImportError:
+        raise ImportError("Reports need matplotlib: pip install matplotlib")
+    matplotlib.use('Agg')  # Off-screen; this process never opens a window
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(11.7, 8.3))  # A4 landscape
+    figure.suptitle(title)
+    grid = figure.add_gridspec(2, 2, width_ratios=(1, 1.2), hspace=0.35)
+
+    drag_polar = figure.add_subplot(grid[0, 0])
+    drag_polar.plot(polar['drag_coefficient'], polar['lift_coefficient'], 'o-')
+    drag_polar.set_xlabel("Cd")
+    drag_polar.set_ylabel("Cl")
+    drag_polar.set_title("Lift/drag polar")
+    drag_polar.grid(True, alpha=0.3)
+
+    lift_curve = figure.add_subplot(grid[1, 0])
+    lift_curve.plot(polar['angle_of_attack'], polar['lift_coefficient'], 'o-')
+    lift_curve.set_xlabel("Angle of attack (°)")
+    lift_curve.set_ylabel("Cl")
+    lift_curve.set_title("Lift curve")
+    lift_curve.grid(True, alpha=0.3)
+
+    table = figure.add_subplot(grid[:, 1])
+    table.axis('off')
+    cells = [[fmt_string.format(polar[key][i].item()) for key, _, fmt_string in TABLE_COLUMNS]
+             for i in range(len(polar['samples']))]
+    if cells:
+        # Rows are squeezed to fit the page, so a wide sweep needs smaller text
+        cell_table = table.table(cellText=cells, colLabels=[heading for _, heading, _ in TABLE_COLUMNS],
+                                 bbox=[0, 0, 1, 1])
+        cell_table.auto_set_font_size(False)
+        cell_table.set_fontsize(min(9, 300 / (len(cells) + 1)))
+    else:
+        table.text(0.5, 0.5, "No samples above the minimum airspeed", ha='center')
+
+    # Write beside the cache entry, then move it in, so a half-written
+    # file is never mistaken for a cached report
+    temporary = path + '.tmp'
+    figure.savefig(temporary, format=fmt, dpi=100)
+    os.replace(temporary, path)
+
+def report_worker(run_dir, path, fmt, options, updates):
+    """Report process body: read the run, render, report back over updates"""
+    if hasattr(os, 'nice'):
+        os.nice(10)  # Yield the CPU to the GUI process on a single-board machine
+    try:
+        reader = RunReader(run_dir)
+        polar = compute_polar(reader, progress=lambda fraction: updates.put(
+            ('progress', 0.8 * fraction, "Reading run")), **options)
+        updates.put(('progress', 0.8, "Rendering"))
+        render_report(polar, path, fmt, f"Run {reader.run_id}")
+    except Exception as e:
+        updates.put(('failed', None, f"Report failed: {e}"))
+    else:
+        updates.put(('done', path, f"Report saved: {os.path.basename(path)}"))
+
+class ReportGenerator:
+    """
+    Builds polar reports (PNG or PDF) from recorded runs in a worker process
+    matplotlib is only ever imported in the worker, so the GUI process
+    pays nothing for it at startup or while a report renders. Reports are
+    cached by run ID, sample count and options; asking again returns the
+    cached file. Progress (0-1) and status can be polled from the UI
+    thread, as with RunExporter. One report is generated at a time.
+    """
+
+    def __init__(self, reports_dir=DEFAULT_REPORTS_DIR, bin_deg=1.0, min_airspeed_ms=2.0):
+        self.reports_dir = reports_dir
+        self.options = {'bin_deg': bin_deg, 'min_airspeed_ms': min_airspeed_ms}
+        self.context = multiprocessing.get_context('spawn')
+        self.lock = threading.Lock()
+        self.progress = 0.0
+        self.status = 'idle'  # idle, running, done, failed, cancelled
+        self.message = ""
+        self.output_path = None
+        self._thread = None
+        self._process = None
+        self._cancel = threading.Event()
+
+    @property
+    def is_busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def report_path(self, reader, fmt='png'):
+        """Cache file for a run's report with the current options"""
+        # The sample count keeps a report taken mid-recording from being reused
+        key = json.dumps({'samples': reader.sample_count, **self.options}, sort_keys=True)
+        digest = hashlib.sha1(key.encode()).hexdigest()[:10]
+        return os.path.join(self.reports_dir, f"{reader.run_id}-{digest}.{fmt}")
+
+    def generate(self, run_dir, fmt='png', on_done=None):
+        """Start a report for the run in run_dir; returns False if already busy"""
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format '{fmt}', expected one of {REPORT_FORMATS}")
+        if self.is_busy:
+            return False
+        reader = RunReader(run_dir)
+        path = self.report_path(reader, fmt)
+        self.output_path = path
+        self._cancel.clear()
+        if os.path.exists(path):
+            self._set_state(1.0, 'done', f"Report ready: {os.path.basename(path)}")
+            if on_done:
+                on_done(self)
+            return True
+
+        self._set_state(0.0, 'running', f"Building report for {reader.run_id}")
+        self._thread = threading.Thread(target=self._run, args=(run_dir, path, fmt, on_done),
+                                        name="report-monitor", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        self._cancel.set()
+
+    def get_state(self):
+        with self.lock:
+            return self.progress, self.status, self.message
+
+    def _set_state(self, progress, status, message):
+        with self.lock:
+            self.progress = progress
+            self.status = status
+            self.message = message
+
+    def _run(self, run_dir, path, fmt, on_done):
+        """Monitor thread: start the worker and relay its updates"""
+        started = time.time()
+        os.makedirs(self.reports_dir, exist_ok=True)
+        updates = self.context.Queue()
+        process = self.context.Process(target=report_worker,
+                                       args=(run_dir, path, fmt, self.options, updates),
+                                       name="report-worker", daemon=True)
+        # Starting a spawn process takes a moment; it happens here, not on the UI thread
+        with main_script_hidden():
+            process.start()
+        self._process = process
+        status = 'running'
+        while status == 'running':
+            if self._cancel.is_set():
+                process.terminate()
+                self._set_state(self.progress, 'cancelled', "Report cancelled")
+                status = 'cancelled'
+                break
+            try:
+                status, value, message = updates.get(timeout=0.2)
+            except queue.Empty:
+                if not process.is_alive():
+                    status = 'failed'
+                    self._set_state(self.progress, status,
+                                    f"Report worker exited with code {process.exitcode}")
+                continue
+            if status == 'progress':
+                self._set_state(value, 'running', message)
+                status = 'running'
+            elif status == 'done':
+                self._set_state(1.0, status, message)
+            else:
+                self._set_state(self.progress, status, message)
+        process.join(timeout=5.0)
+        self._process = None
+        if status == 'done':
+            log.info("Report for %s built in %.1fs", os.path.basename(run_dir),
+                     time.time() - started, extra=fields(path=path))
+        elif status == 'failed':
+            log.error("Report for %s failed: %s", os.path.basename(run_dir), self.message)
+        if on_done:
+            on_done(self)
@@ -0,0 +1,141 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# int64 header slots ahead of the sample ring
+SEQ = 0  # Seqlock counter: odd while the writer is mid-update
+TOTAL = 1  # Samples written since the ring was created
+CAPACITY = 2
+WIDTH = 3
+HEARTBEAT_NS = 4  # Writer's time.monotonic_ns() at its last status update
+WRITER_PID = 5
+OVERRUNS = 6
+JITTER_COUNT = 7
+JITTER_RMS_NS = 8
+JITTER_MAX_NS = 9
+INTERVAL_MIN_NS = 10
+INTERVAL_MAX_NS = 11
+HEADER_SLOTS = 16
+
+# Seqlock retries before a read gives up until the next poll
+MAX_READ_ATTEMPTS = 1000
+
+class SharedSampleRing:
+    """
+    Fixed-width float64 sample ring in shared memory, one writer process
+    An int64 header is followed by a (capacity, width) ring. The writer
+    bumps the sequence counter to odd before touching the ring and back to
+    even afterwards (a seqlock), so readers never take a lock: they copy
+    what they need and retry if the counter moved underneath them.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner  # Creator unlinks the segment on close
+        self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        self.capacity = int(self.header[CAPACITY])
+        self.width = int(self.header[WIDTH])
+        self.data = np.ndarray((self.capacity, self.width), dtype=np.float64,
+                               buffer=shm.buf, offset=HEADER_SLOTS * 8)
+        self.retries = 0
+
+    @classmethod
+    def create(cls, name, width, capacity):
+        """Allocate a new ring (GUI process)"""
+        shm = shared_memory.SharedMemory(name=name, create=True,
+                                         size=(HEADER_SLOTS + capacity * width) * 8)
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[CAPACITY] = capacity
+        header[WIDTH] = width
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Map an existing ring (acquisition process)"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def total(self):
+        return int(self.header[TOTAL])
+
+    def write(self, row):
+        """Append one sample (writer only)"""
+        header = self.header
+        total = int(header[TOTAL])
+        header[SEQ] += 1
+        self.data[total % self.capacity] = row
+        header[TOTAL] = total + 1
+        header[SEQ] += 1
+
+    def recover(self):
+        """Finish the sequence of a writer that died mid-update (no writer may be running)"""
+        if self.header[SEQ] & 1:
+            self.header[SEQ] += 1
+
+    def set_status(self, values):
+        """Writer status slots, e.g. {OVERRUNS: 3}; each is a single int64 store"""
+        for slot, value in values.items():
+            self.header[slot] = int(value)
+
+    def status(self, slot):
+        return int(self.header[slot])
+
+    def read_since(self, since):
+        """
+        Copy of the samples written after sample number `since`
+        Returns (rows, total, lost): rows is (n, width), total is the
+        `since` to pass next time, lost counts samples overwritten before
+        they could be read. Rows are copied straight from the zero-copy
+        view as at most two contiguous slices, then validated against the
+        seqlock.
+        """
+        for attempt in range(MAX_READ_ATTEMPTS):
+            data, seq = self.view()
+            if seq & 1:
+                self.retries += 1
+                continue
+            total = int(self.header[TOTAL])
+            start = max(since, total - self.capacity)
+            count = total - start
+            rows = np.empty((count, self.width))
+            first = start % self.capacity
+            head = min(count, self.capacity - first)
+            rows[:head] = data[first:first + head]
+            rows[head:] = data[:count - head]
+            if self.unchanged(seq):
+                return rows, total, start - since
+            self.retries += 1
+        # Writer stuck mid-update (or died there); try again next poll
+        return np.empty((0, self.width)), since, 0
+
+    def latest(self):
+        """Copy of the most recent sample, or None before the first write"""
+        rows, total, _ = self.read_since(max(self.total - 1, 0))
+        return rows[-1] if len(rows) else None
+
+    def view(self):
+        """
+        Zero-copy (data, seq) for readers that validate afterwards
+        The data is only consistent if unchanged(seq) is still True once
+        the caller is done with it.
+        """
+        return self.data, int(self.header[SEQ])
+
+    def unchanged(self, seq):
+        return not seq & 1 and int(self.header[SEQ]) == seq
+
+    def close(self):
+        """Drop the mapping; the creator also removes the segment"""
+        self.header = self.data = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -2,6 +2,10 @@ import math
 import random
 import time
 
+from logic.eventlog import get_logger, fields
+
+log = get_logger('simulator')
+
 class WindTunnelSimulator:
     """
     Enhanced wind tunnel simulator with comprehensive data including:
@@ -14,13 +18,15 @@ class WindTunnelSimulator:
     """
     
     def __init__(self):
-        self.start_time = time.time()
+        self.start_ns = time.monotonic_ns()
+        self.mark_clock_anchor()
         self.is_running = False
         self.fan_speed = 50  # Fan speed percentage (0-100)
         self.angle_of_attack = 0  # Degrees (-20 to +20)
         
         # Base values for simulation
         self.base_pressure = 1013.25  # hPa
+        self.base_temperature = 20.0  # °C
         self.base_airspeed = 0  # Will be calculated from fan speed
         
         # Simulation state
@@ -29,21 +35,25 @@ class WindTunnelSimulator:
             'airspeed_ms': 0,
             'pressure_static': self.base_pressure,
             'pressure_dynamic': self.base_pressure,
+            'air_temperature': self.base_temperature,
             'angle_of_attack': 0,
             'lift_force': 0,
             'drag_force': 0,
             'fan_output': 0,
+            'fan_speed': self.fan_speed,
             'timestamp': 0,
+            'wall_time': 0,
             'runtime': 0
         }
         
-        print("Enhanced wind tunnel simulator initialized")
-        print("Features: Fan control, Lift/Drag, Angle of Attack, MPH display")
+        log.info("Wind tunnel simulator initialized (fan, lift/drag, AoA, MPH)")
     
-    def set_fan_speed(self, speed):
+    def set_fan_speed(self, speed, quiet=False):
         """Set fan speed (0-100%)"""
         self.fan_speed = max(0, min(100, speed))
-        print(f"Fan speed set to {self.fan_speed}%")
+        if not quiet:
+            log.info("Fan speed set to %.0f%%", self.fan_speed,
+                     extra=fields(fan_speed=self.fan_speed))
     
     def adjust_fan_speed(self, delta):
         """Adjust fan speed by delta amount"""
@@ -52,25 +62,37 @@ class WindTunnelSimulator:
     def set_angle_of_attack(self, angle):
         """Set angle of attack (-20 to +20 degrees)"""
         self.angle_of_attack = max(-20, min(20, angle))
-        print(f"Angle of attack set to {self.angle_of_attack}°")
-    
+        log.info("Angle of attack set to %s°", self.angle_of_attack,
+                 extra=fields(angle_of_attack=self.angle_of_attack))
+    
+    def mark_clock_anchor(self):
+        """
+        Pair the wall clock with the monotonic clock
+        Sample times come from the monotonic clock, which never steps
+        (NTP, DST); wall_time is derived from this anchor so it stays
+        just as smooth within a run.
+        """
+        self.wall_anchor = time.time()
+        self.monotonic_anchor_ns = time.monotonic_ns()
+
     def start_simulation(self):
         """Start the simulation"""
         self.is_running = True
-        self.start_time = time.time()
-        print("Simulation started")
+        self.start_ns = time.monotonic_ns()
+        self.mark_clock_anchor()
+        log.info("Simulation started", extra=fields(wall_anchor=self.wall_anchor))
     
     def stop_simulation(self):
         """Stop the simulation"""
         self.is_running = False
-        print("Simulation stopped")
+        log.info("Simulation stopped")
     
     def reset_simulation(self):
         """Reset simulation to initial state"""
-        self.start_time = time.time()
+        self.start_ns = time.monotonic_ns()
         self.fan_speed = 50
         self.angle_of_attack = 0
-        print("Simulation reset to initial state")
+        log.info("Simulation reset to initial state")
     
     def calculate_airspeed(self):
         """Calculate airspeed based on fan speed"""
@@ -139,8 +161,9 @@ class WindTunnelSimulator:
     
     def get_all_data(self):
         """Get all current simulation data"""
-        current_time = time.time()
-        runtime = current_time - self.start_time
+        now_ns = time.monotonic_ns()
+        runtime = (now_ns - self.start_ns) * 1e-9
+        wall_time = self.wall_anchor + (now_ns - self.monotonic_anchor_ns) * 1e-9
         
         # Calculate all values
         airspeed_mph = self.calculate_airspeed()
@@ -149,6 +172,10 @@ class WindTunnelSimulator:
         static_pressure, dynamic_pressure = self.calculate_pressure(airspeed_mph)
         lift_force, drag_force = self.calculate_lift_drag(airspeed_mph, self.angle_of_attack)
         
+        # Test-section air warms a little with fan power
+        air_temperature = self.base_temperature + 0.03 * self.fan_speed * self.is_running
+        air_temperature += random.uniform(-0.05, 0.05)
+
         # Fan output percentage (with some variation)
         fan_output = self.fan_speed
         if self.is_running:
@@ -161,11 +188,14 @@ class WindTunnelSimulator:
             'airspeed_ms': airspeed_ms,
             'pressure_static': static_pressure,
             'pressure_dynamic': dynamic_pressure,
+            'air_temperature': air_temperature,
             'angle_of_attack': self.angle_of_attack,
             'lift_force': lift_force,
             'drag_force': drag_force,
             'fan_output': fan_output,
-            'timestamp': current_time,
+            'fan_speed': self.fan_speed,
+            'timestamp': now_ns * 1e-9,  # Monotonic seconds
+            'wall_time': wall_time,
             'runtime': runtime,
             'is_running': self.is_running
         })
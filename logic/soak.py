@@ -0,0 +1,98 @@
+import gc
+import os
+import resource
+import time
+
+from logic.eventlog import get_logger, fields
+
+log = get_logger('soak')
+
+# Growth allowed between the first and last post-warmup windows before a
+# metric counts as leaking: (relative, absolute)
+DEFAULT_LIMITS = {
+    'rss_bytes': (0.10, 8 * 1024 * 1024),
+    'objects': (0.05, 2000),
+    'clock_events': (0.0, 2),
+    'canvas_instructions': (0.02, 50),
+}
+
+def read_rss_bytes():
+    """Resident set size of this process (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def count_objects():
+    """Live objects tracked by the garbage collector, after a full collection"""
+    gc.collect()
+    return len(gc.get_objects())
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+class SoakMonitor:
+    """
+    Tracks resource metrics over a soak test and flags unbounded growth
+    Samples are dicts of metric -> value. The first `warmup` samples are
+    ignored (caches, lazily built screens); after that the median of the
+    first and last `window` samples are compared, so steady-state noise
+    doesn't trip the check but a steady climb does.
+    """
+
+    def __init__(self, warmup=5, window=5, limits=None):
+        self.warmup = warmup
+        self.window = window
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.samples = []
+        self.started = time.monotonic()
+
+    def record(self, **metrics):
+        """Store one sample, stamped with seconds since the soak started"""
+        sample = dict(metrics, elapsed=time.monotonic() - self.started)
+        self.samples.append(sample)
+        log.debug("Soak sample %d", len(self.samples), extra=fields(**sample))
+        return sample
+
+    @property
+    def min_samples(self):
+        """Samples needed before growth can be judged"""
+        return self.warmup + 2 * self.window
+
+    def get_growth(self):
+        """metric -> (first, last) window medians, once enough samples exist"""
+        steady = self.samples[self.warmup:]
+        if len(steady) < 2 * self.window:
+            return {}
+        growth = {}
+        for metric in self.limits:
+            values = [sample[metric] for sample in steady if metric in sample]
+            if len(values) >= 2 * self.window:
+                growth[metric] = (median(values[:self.window]), median(values[-self.window:]))
+        return growth
+
+    def failures(self):
+        """Descriptions of every metric that grew past its limit"""
+        failed = []
+        for metric, (first, last) in self.get_growth().items():
+            relative, absolute = self.limits[metric]
+            if last > first * (1 + relative) + absolute:
+                failed.append(f"{metric} grew from {first:,.0f} to {last:,.0f}")
+        return failed
+
+    def get_report(self):
+        steady = self.samples[self.warmup:]
+        return {
+            'samples': len(self.samples),
+            'elapsed': self.samples[-1]['elapsed'] if self.samples else 0.0,
+            'growth': {metric: {'first': first, 'last': last}
+                       for metric, (first, last) in self.get_growth().items()},
+            'failures': self.failures(),
+            'enough_samples': len(self.samples) >= self.min_samples,
+            'history': self.samples,
+        }
@@ -0,0 +1,166 @@
+import threading
+
+import numpy as np
+
+from logic.acquisition import SampleBlock
+
+# Channel published for each analysed channel, e.g. lift_force_dominant_hz
+DOMINANT_SUFFIX = '_dominant_hz'
+
+# rfft writes into a preallocated output from NumPy 2.0 on
+RFFT_HAS_OUT = np.lib.NumpyVersion(np.__version__) >= '2.0.0'
+
+class SpectrumAnalyzer:
+    """
+    Streaming Welch power spectral density of selected channels
+    - Hann-windowed segments with overlap, taken from a ring buffer
+    - The last `averages` segment periodograms are averaged (Welch)
+    - Window, scaling and all work arrays are allocated once
+    Runs as an AcquisitionLoop block stage (annotate_block): the dominant
+    frequency of each channel is appended to every block as a
+    <channel>_dominant_hz channel, so alarms, recording, export and
+    derived channels can use it. Each completed hop costs one rfft of
+    `segment` samples per channel, however large the block.
+    """
+
+    def __init__(self, rate_hz=100.0, channels=('lift_force', 'drag_force'),
+                 segment=256, overlap=0.5, averages=8, running_channel='is_running'):
+        if not 0 <= overlap < 1:
+            raise ValueError("overlap must be in [0, 1)")
+        self.rate_hz = rate_hz
+        self.channels = tuple(channels)
+        self.dominant_channels = tuple(name + DOMINANT_SUFFIX for name in self.channels)
+        self.segment = segment
+        self.hop = max(1, int(round(segment * (1 - overlap))))
+        self.averages = averages
+        self.running_channel = running_channel
+        self.lock = threading.Lock()
+
+        self.window = np.hanning(segment)
+        # One-sided PSD scaling (units^2/Hz); DC and Nyquist are not doubled
+        self.scale = np.full(segment // 2 + 1, 2.0 / (rate_hz * np.sum(self.window ** 2)))
+        self.scale[0] /= 2
+        if segment % 2 == 0:
+            self.scale[-1] /= 2
+        self.frequencies = np.fft.rfftfreq(segment, 1.0 / rate_hz)
+
+        n = len(self.channels)
+        self.ring = np.zeros((n, segment))
+        self.work = np.empty(segment)
+        self.spectrum = np.empty(segment // 2 + 1, dtype=complex)
+        self.power = np.empty(segment // 2 + 1)
+        self.scratch = np.empty(segment // 2 + 1)
+        self.periodograms = np.zeros((n, averages, segment // 2 + 1))
+        self._annotated = None  # (input channels, output channels, index), built once
+        self.reset()
+
+    def reset(self):
+        """Discard buffered samples and spectra"""
+        with self.lock:
+            self.ring_pos = 0
+            self.ring_fill = 0
+            self.since_hop = 0
+            self.periodogram_pos = 0
+            self.periodogram_count = 0
+            self.segments = 0
+            self.periodograms.fill(0.0)
+            self.dominant = {name: None for name in self.channels}
+
+    def process_block(self, block):
+        """Block processor: buffer samples, analysing each completed hop"""
+        if not all(name in block for name in self.channels):
+            return
+        columns = [block[name] for name in self.channels]
+        if self.running_channel in block:
+            running = block[self.running_channel] > 0
+            if not running.all():
+                columns = [column[running] for column in columns]
+        total = len(columns[0])
+
+        with self.lock:
+            start = 0
+            while start < total:
+                take = min(total - start, self.hop - self.since_hop)
+                self._append(columns, start, take)
+                start += take
+                self.since_hop += take
+                if self.since_hop == self.hop:
+                    self.since_hop = 0
+                    if self.ring_fill == self.segment:
+                        self._analyse()
+
+    def annotate_block(self, block):
+        """
+        Block stage: analyse the block, then return it with the dominant
+        frequency of each channel appended (0 until the first segment)
+        """
+        self.process_block(block)
+        with self.lock:
+            values = [self.dominant[name] or 0.0 for name in self.channels]
+        if self._annotated is None or self._annotated[0] is not block.channels:
+            channels = tuple(block.channels) + self.dominant_channels
+            self._annotated = (block.channels, channels,
+                               {name: i for i, name in enumerate(channels)})
+        _, channels, index = self._annotated
+        width = len(block.channels)
+        data = np.empty((len(block), len(channels)))
+        data[:, :width] = block.data
+        data[:, width:] = values
+        return SampleBlock(channels, index, data)
+
+    def _append(self, columns, start, count):
+        """Copy count samples per channel into the ring (wrapping)"""
+        first = min(count, self.segment - self.ring_pos)
+        for i, column in enumerate(columns):
+            self.ring[i, self.ring_pos:self.ring_pos + first] = column[start:start + first]
+            if count > first:
+                self.ring[i, :count - first] = column[start + first:start + count]
+        self.ring_pos = (self.ring_pos + count) % self.segment
+        self.ring_fill = min(self.ring_fill + count, self.segment)
+
+    def _analyse(self):
+        """One windowed periodogram per channel from the newest segment"""
+        tail = self.segment - self.ring_pos
+        slot = self.periodogram_pos
+        for i in range(len(self.channels)):
+            # Oldest-first copy of the ring, mean removed, windowed
+            self.work[:tail] = self.ring[i, self.ring_pos:]
+            self.work[tail:] = self.ring[i, :self.ring_pos]
+            self.work -= self.work.mean()
+            self.work *= self.window
+
+            if RFFT_HAS_OUT:
+                spectrum = np.fft.rfft(self.work, out=self.spectrum)
+            else:
+                spectrum = np.fft.rfft(self.work)
+            np.multiply(spectrum.real, spectrum.real, out=self.power)
+            np.multiply(spectrum.imag, spectrum.imag, out=self.scratch)
+            np.add(self.power, self.scratch, out=self.power)
+            np.multiply(self.power, self.scale, out=self.periodograms[i, slot])
+
+        self.periodogram_pos = (slot + 1) % self.averages
+        self.periodogram_count = min(self.periodogram_count + 1, self.averages)
+        self.segments += 1
+
+        for i, name in enumerate(self.channels):
+            psd = self.periodograms[i, :self.periodogram_count].mean(axis=0)
+            # Skip the DC bin: the mean has been removed anyway
+            self.dominant[name] = float(self.frequencies[1 + np.argmax(psd[1:])])
+
+    def get_spectrum(self, channel):
+        """(frequencies, Welch PSD) for a channel, or None before the first segment"""
+        with self.lock:
+            if self.periodogram_count == 0:
+                return None
+            i = self.channels.index(channel)
+            psd = self.periodograms[i, :self.periodogram_count].mean(axis=0)
+        return self.frequencies, psd
+
+    def get_dominant(self, channel):
+        """Frequency (Hz) of the strongest non-DC component, or None"""
+        with self.lock:
+            return self.dominant.get(channel)
+
+    @property
+    def resolution_hz(self):
+        return self.rate_hz / self.segment
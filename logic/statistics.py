@@ -0,0 +1,123 @@
+import threading
+
+import numpy as np
+
+class ChannelStatistics:
+    """
+    O(1)-memory running statistics for every acquisition channel
+    - Whole-run count, mean, variance (Welford/Chan merge), min, max, RMS
+    - Windowed stats over the last N seconds from a fixed-size ring buffer
+    Runs as an AcquisitionLoop block processor; all channels are updated
+    together with one vectorized pass per block.
+    """
+
+    def __init__(self, rate_hz=100.0, window_seconds=10.0, time_channel='timestamp',
+                 running_channel='is_running'):
+        self.window_seconds = window_seconds
+        self.capacity = int(rate_hz * window_seconds) + 1
+        self.time_channel = time_channel
+        self.running_channel = running_channel
+        self.lock = threading.Lock()
+
+        # Allocated on the first block once channels are known
+        self.channels = None
+        self.index = None
+        self.reset()
+
+    def reset(self):
+        """Start a fresh set of statistics (e.g. on a new run)"""
+        with self.lock:
+            self.count = 0
+            if self.channels is not None:
+                self._allocate(self.channels, self.index)
+
+    def _allocate(self, channels, index):
+        n = len(channels)
+        self.channels = channels
+        self.index = index
+        self.count = 0
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.sum_sq = np.zeros(n)
+        self.minimum = np.full(n, np.inf)
+        self.maximum = np.full(n, -np.inf)
+        self.ring = np.zeros((self.capacity, n))
+        self.ring_pos = 0
+        self.ring_fill = 0
+
+    def process_block(self, block):
+        """Block processor: fold one block into the statistics"""
+        data = block.data
+        if self.running_channel in block:
+            data = data[block[self.running_channel] > 0]
+        if len(data) == 0:
+            return
+
+        with self.lock:
+            if self.channels is None:
+                self._allocate(block.channels, block.index)
+
+            # Merge block moments into the running ones (Chan et al.)
+            n_b = len(data)
+            mean_b = data.mean(axis=0)
+            m2_b = ((data - mean_b) ** 2).sum(axis=0)
+            n_a = self.count
+            total = n_a + n_b
+            delta = mean_b - self.mean
+            self.mean += delta * (n_b / total)
+            self.m2 += m2_b + delta ** 2 * (n_a * n_b / total)
+            self.count = total
+
+            self.sum_sq += (data ** 2).sum(axis=0)
+            np.minimum(self.minimum, data.min(axis=0), out=self.minimum)
+            np.maximum(self.maximum, data.max(axis=0), out=self.maximum)
+
+            # Ring buffer for windowed stats (wraps at capacity)
+            if n_b >= self.capacity:
+                data = data[-self.capacity:]
+                n_b = len(data)
+            end = self.ring_pos + n_b
+            if end <= self.capacity:
+                self.ring[self.ring_pos:end] = data
+            else:
+                split = self.capacity - self.ring_pos
+                self.ring[self.ring_pos:] = data[:split]
+                self.ring[:end - self.capacity] = data[split:]
+            self.ring_pos = end % self.capacity
+            self.ring_fill = min(self.ring_fill + n_b, self.capacity)
+
+    def get_summary(self, channel):
+        """Whole-run statistics for one channel"""
+        with self.lock:
+            if self.channels is None or self.count == 0:
+                return None
+            i = self.index[channel]
+            variance = self.m2[i] / (self.count - 1) if self.count > 1 else 0.0
+            return {
+                'count': self.count,
+                'mean': float(self.mean[i]),
+                'std': float(np.sqrt(variance)),
+                'variance': float(variance),
+                'min': float(self.minimum[i]),
+                'max': float(self.maximum[i]),
+                'rms': float(np.sqrt(self.sum_sq[i] / self.count))
+            }
+
+    def get_window_summary(self, channel, seconds=None):
+        """Statistics over the last `seconds` (default: full window)"""
+        seconds = self.window_seconds if seconds is None else seconds
+        with self.lock:
+            if self.channels is None or self.ring_fill == 0:
+                return None
+            values = self.ring[:self.ring_fill, self.index[channel]]
+            times = self.ring[:self.ring_fill, self.index[self.time_channel]]
+            values = values[times >= times.max() - seconds]
+
+        return {
+            'count': len(values),
+            'mean': float(values.mean()),
+            'std': float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'rms': float(np.sqrt((values ** 2).mean()))
+        }
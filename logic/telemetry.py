@@ -0,0 +1,225 @@
+import threading
+from collections import deque
+
+from logic.acquisition import SampleBlock
+from logic.eventlog import get_logger
+
+log = get_logger('telemetry')
+
+# What a full subscriber queue does with a new block
+DROP_OLDEST = 'drop_oldest'  # Keep the freshest data (displays, streams)
+DROP_NEWEST = 'drop_newest'  # Keep a contiguous history (loggers, analysis)
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+class Subscription:
+    """
+    One consumer of the telemetry bus
+    Receives SampleBlocks restricted to its channels and decimated to
+    every Nth sample. With a callback the block is handed over inline on
+    the publishing thread; otherwise it lands in a bounded queue the
+    consumer drains at its own pace. With a handler the subscription
+    drains its own queue on a thread of its own (between start() and
+    stop()), so slow consumers such as loggers never hold up sampling.
+    """
+
+    def __init__(self, name, channels=None, decimation=1, callback=None,
+                 maxsize=16, policy=DROP_OLDEST, handler=None):
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy '{policy}', expected one of {DROP_POLICIES}")
+        self.name = name
+        self.channels = tuple(channels) if channels else None
+        self.decimation = max(1, int(decimation))
+        if callback is not None and handler is not None:
+            raise ValueError(f"Subscriber '{name}' takes a callback or a handler, not both")
+        self.callback = callback
+        self.handler = handler
+        self.maxsize = maxsize
+        self.policy = policy
+        self.condition = threading.Condition()
+        self.queue = deque()
+        self._phase = 0  # Offset of the next kept sample within the next block
+        self._columns = None  # Column indices, resolved on the first block
+        self._index = None
+        self._thread = None
+        self._stopping = False
+
+        # Counters
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def select(self, block):
+        """This subscriber's view of a block, or None if no samples are kept"""
+        count = len(block)
+        rows = slice(self._phase, None, self.decimation)
+        self._phase = (self._phase - count) % self.decimation
+        if self.channels is None:
+            if self.decimation == 1:
+                return block
+            data = block.data[rows]
+            channels, index = block.channels, block.index
+        else:
+            if self._columns is None:
+                missing = [name for name in self.channels if name not in block]
+                if missing:
+                    raise KeyError(f"Subscriber '{self.name}' wants unknown channels {missing}")
+                self._columns = [block.index[name] for name in self.channels]
+                self._index = {name: i for i, name in enumerate(self.channels)}
+            data = block.data[rows][:, self._columns]
+            channels, index = self.channels, self._index
+        if len(data) == 0:
+            return None
+        return SampleBlock(channels, index, data)
+
+    def deliver(self, block):
+        """Hand a selected block to the callback or the queue"""
+        self.published += 1
+        if self.callback is not None:
+            self.callback(block)
+            self.delivered += 1
+            return
+        with self.condition:
+            if len(self.queue) >= self.maxsize:
+                self.dropped += 1
+                if self.policy == DROP_NEWEST:
+                    return
+                self.queue.popleft()
+            self.queue.append(block)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        """Next queued block, waiting up to timeout seconds (None if none arrived)"""
+        with self.condition:
+            if not self.queue and timeout:
+                self.condition.wait(timeout)
+            if not self.queue:
+                return None
+            self.delivered += 1
+            return self.queue.popleft()
+
+    def drain(self):
+        """All queued blocks, oldest first"""
+        with self.condition:
+            blocks = list(self.queue)
+            self.queue.clear()
+            self.delivered += len(blocks)
+        return blocks
+
+    def start(self):
+        """Start the thread feeding queued blocks to the handler"""
+        if self.handler is None or self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._drain_loop, name=f"telemetry-{self.name}",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Hand what is still queued to the handler, then stop its thread"""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        with self.condition:
+            self._stopping = True
+            self.condition.notify()
+        thread.join(timeout)
+        if thread.is_alive():
+            log.warning("Telemetry subscriber '%s' still busy after %.0fs", self.name, timeout)
+
+    def _drain_loop(self):
+        """Handler thread body"""
+        while True:
+            with self.condition:
+                while not self.queue and not self._stopping:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                block = self.queue.popleft()
+                self.delivered += 1
+            try:
+                self.handler(block)
+            except Exception as e:
+                self.errors += 1
+                log.error("Telemetry subscriber '%s' failed: %s", self.name, e)
+
+    def get_stats(self):
+        return {
+            'channels': self.channels,
+            'decimation': self.decimation,
+            'policy': None if self.callback else self.policy,
+            'threaded': self.handler is not None,
+            'published': self.published,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queued': len(self.queue),
+        }
+
+class TelemetryBus:
+    """
+    In-process publish/subscribe for acquisition blocks
+    The acquisition loop publishes each block once (publish is an
+    AcquisitionLoop block processor); every consumer subscribes for the
+    channels and rate it needs, so adding consumers never adds reads of
+    the data source. Handler threads run between start() and stop().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = []
+        self.block_count = 0
+        self.running = False
+
+    def subscribe(self, name, channels=None, decimation=1, callback=None,
+                  maxsize=16, policy=DROP_OLDEST, handler=None):
+        """Register a consumer; returns its Subscription"""
+        subscription = Subscription(name, channels, decimation, callback, maxsize, policy,
+                                    handler)
+        with self.lock:
+            self.subscriptions.append(subscription)
+            if self.running:
+                subscription.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            if subscription in self.subscriptions:
+                self.subscriptions.remove(subscription)
+        subscription.stop()
+
+    def start(self):
+        """Start every handler subscription's thread"""
+        with self.lock:
+            self.running = True
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.start()
+
+    def stop(self):
+        """Let handler subscriptions finish their queues and stop their threads"""
+        with self.lock:
+            self.running = False
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.stop()
+
+    def publish(self, block):
+        """Block processor: fan one block out to every subscriber"""
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+            self.block_count += 1
+        for subscription in subscriptions:
+            try:
+                selected = subscription.select(block)
+                if selected is not None:
+                    subscription.deliver(selected)
+            except Exception as e:
+                subscription.errors += 1
+                log.error("Telemetry subscriber '%s' failed: %s", subscription.name, e)
+
+    def get_stats(self):
+        """Per-subscriber counters, keyed by subscriber name"""
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        return {subscription.name: subscription.get_stats() for subscription in subscriptions}
@@ -0,0 +1,172 @@
+import os
+
+from logic.simulator import WindTunnelSimulator
+from logic.acquisition import AcquisitionLoop
+from logic.acqprocess import (AcquisitionProcess, ProcessPipeline, RemoteAirspeedHold,
+                              RemoteSpectrum)
+from logic.alignment import TimeAligner, AlignedSource, SimulatedSensors
+from logic.controller import AirspeedHold
+from logic.alarms import AlarmEngine, build_default_rules
+from logic.statistics import ChannelStatistics
+from logic.spectrum import SpectrumAnalyzer
+from logic.commands import CommandQueue
+from logic.capture import TriggeredCapture
+from logic.calibration import CalibrationStage, TareRoutine, DEFAULT_CALIBRATION_DIR
+from logic.derived import DerivedChannelGraph, build_default_channels
+from logic.telemetry import TelemetryBus, DROP_NEWEST
+from logic.recorder import RunRecorder, DEFAULT_RUNS_DIR
+from logic.exporter import LiveExportControl
+
+class Tunnel:
+    """
+    One wind tunnel rig hosted by the application
+    Owns its data source (optionally multi-rate sensor streams aligned
+    onto one timebase), acquisition thread, sensor calibration,
+    telemetry bus and per-rig processing chain (airspeed hold, alarms,
+    statistics, spectrum, command queue, recorder, triggered capture,
+    live export) plus its derived-channel graph. With use_process the
+    source, calibration, airspeed hold and spectrum run in an acquisition
+    process and the objects here mirror them. Several tunnels can run
+    side by side in one process; they share the calibration and runs
+    directories, keeping a tare file each and tagging runs with the
+    tunnel name.
+    """
+
+    def __init__(self, name, source=None, rate_hz=100.0, runs_dir=DEFAULT_RUNS_DIR,
+                 use_process=False, calibration_dir=DEFAULT_CALIBRATION_DIR, multirate=False):
+        self.name = name
+        self.aligner = None  # TimeAligner when sensors stream at their own rates
+        self.sensors = None
+
+        if multirate and use_process:
+            raise ValueError("Multi-rate sensor alignment runs in-process; "
+                             "it cannot be combined with a separate acquisition process")
+
+        # Raw readings are corrected (curves, temperature, tare) as they're sampled
+        slug = name.lower().replace(' ', '-')
+        self.calibration = CalibrationStage.from_directory(calibration_dir,
+                                                           tare_name=f"tare-{slug}.json")
+
+        if use_process:
+            # Source sampled, calibrated, held at airspeed and analysed in its
+            # own process into shared memory; the simulator, airspeed hold and
+            # spectrum here are proxies forwarding control calls to it
+            pipeline = ProcessPipeline(calibration_dir, f"tare-{slug}.json", rate_hz=rate_hz)
+            self.acquisition = AcquisitionProcess(WindTunnelSimulator, rate_hz=rate_hz,
+                                                  name=f"acquisition-{name}", pipeline=pipeline)
+            self.simulator = self.acquisition.source
+            self.calibration.add_listener(
+                lambda offsets: self.acquisition.send('calibration.set_tare', offsets))
+            self.airspeed_hold = RemoteAirspeedHold(self.acquisition,
+                                                    rate_hz=pipeline.hold_rate_hz)
+            self.spectrum = RemoteSpectrum(self.acquisition, rate_hz=rate_hz,
+                                           channels=pipeline.spectrum_channels,
+                                           segment=pipeline.segment)
+        else:
+            # Acquisition loop samples the source on its own thread so the
+            # airspeed hold controller keeps its rate while the UI redraws
+            self.simulator = source if source is not None else WindTunnelSimulator()
+            sampled = self.simulator
+            if multirate:
+                # Pressure, balance and tachometer arrive at their own jittery
+                # rates; the loop samples them resampled onto its own timebase
+                self.aligner = TimeAligner(rate_hz=rate_hz)
+                self.sensors = SimulatedSensors(self.simulator, self.aligner)
+                sampled = AlignedSource(self.aligner, self.simulator)
+            self.acquisition = AcquisitionLoop(sampled, rate_hz=rate_hz,
+                                               name=f"acquisition-{name}")
+            self.acquisition.set_calibration(self.calibration)
+
+            self.airspeed_hold = AirspeedHold(self.simulator, rate_hz=50.0)
+            self.acquisition.add_task(self.airspeed_hold.update,
+                                      self.airspeed_hold.rate_hz, name='airspeed_hold')
+
+            # Welch spectra of the force channels (buffeting, vortex shedding);
+            # a block stage, so lift_force_dominant_hz/drag_force_dominant_hz
+            # reach every subscriber and the latest sample
+            self.spectrum = SpectrumAnalyzer(rate_hz=rate_hz,
+                                             channels=('lift_force', 'drag_force'))
+            self.acquisition.add_block_stage(self.spectrum.annotate_block,
+                                             self.spectrum.dominant_channels)
+
+        # Each sample block is published once; consumers subscribe to it
+        self.telemetry = TelemetryBus()
+        self.acquisition.add_block_processor(self.telemetry.publish)
+
+        # Stall/overspeed/pressure alarms, evaluated per sample block
+        self.alarm_engine = AlarmEngine(build_default_rules())
+        self.telemetry.subscribe('alarms', callback=self.alarm_engine.process_block)
+
+        # Per-channel run statistics (last 10 s windowed)
+        self.statistics = ChannelStatistics(rate_hz=rate_hz, window_seconds=10.0)
+        self.telemetry.subscribe('statistics', callback=self.statistics.process_block)
+
+        # Setpoint changes from the UI are coalesced and rate-limited
+        # before they reach the fan (a serial bus on real hardware)
+        self.commands = CommandQueue()
+        self.commands.register('fan_speed',
+                               lambda value: self.simulator.set_fan_speed(value, quiet=True),
+                               min_interval=0.1, minimum=0, maximum=100)
+        self.commands.register('airspeed_setpoint',
+                               lambda value: self.airspeed_hold.set_setpoint(value, unit='mph'),
+                               minimum=0, maximum=self.airspeed_hold.max_airspeed_mph)
+
+        # Zero routine for the balance and pressure channels (fan at 0)
+        self.tare = TareRoutine(self.calibration, rate_hz=rate_hz)
+        self.telemetry.subscribe('tare', callback=self.tare.process_block)
+
+        # Cl, Cd, L/D, Reynolds number... computed only for subscribers
+        self.derived = DerivedChannelGraph(build_default_channels())
+
+        # Run recording and triggered capture (with a pre-trigger ring) are
+        # fed from queues on threads of their own, so a slow card never
+        # stalls sampling; when they fall behind, the newest blocks are
+        # dropped and counted. Alarm triggers reach the capture before it
+        # sees the block: the alarm engine runs inline.
+        self.recorder = RunRecorder(runs_dir)
+        self.telemetry.subscribe('recorder', handler=self.recorder.process_block,
+                                 maxsize=256, policy=DROP_NEWEST)
+        self.capture = TriggeredCapture(runs_dir, rate_hz=rate_hz, tags={'tunnel': name})
+        self.alarm_engine.add_listener(self.capture.on_alarm)
+        self.telemetry.subscribe('capture', handler=self.capture.process_block,
+                                 maxsize=64, policy=DROP_NEWEST)
+
+        # Live session streamed straight to a CSV/Parquet/HDF5 file on demand
+        self.live_export = LiveExportControl(self.telemetry, os.path.join(runs_dir, 'live'),
+                                             prefix=f"live-{slug}")
+
+    def start(self):
+        if self.sensors:
+            self.sensors.start()
+        self.telemetry.start()
+        self.acquisition.start()
+        self.commands.start()
+
+    def stop(self):
+        self.commands.stop()
+        self.acquisition.stop()
+        if self.sensors:
+            self.sensors.stop()
+        self.telemetry.stop()
+        self.live_export.stop()
+        self.recorder.stop()
+        self.capture.close()
+        self.simulator.stop_simulation()
+
+    def get_latest(self):
+        """Latest sample from the acquisition loop, or poll the source"""
+        if self.acquisition.is_active:
+            return self.acquisition.get_latest()
+        return self.simulator.get_all_data()
+
+    @property
+    def has_alarm(self):
+        return bool(self.alarm_engine.get_active_alarms())
+
+def build_tunnels(count, rate_hz=100.0, runs_dir=DEFAULT_RUNS_DIR, use_process=False,
+                  calibration_dir=DEFAULT_CALIBRATION_DIR, multirate=False):
+    """count simulated tunnels named 'Tunnel 1'..'Tunnel N'"""
+    return [Tunnel(f"Tunnel {i + 1}", rate_hz=rate_hz, runs_dir=runs_dir,
+                   use_process=use_process, calibration_dir=calibration_dir,
+                   multirate=multirate)
+            for i in range(count)]
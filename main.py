@@ -19,8 +19,18 @@ from kivy.logger import Logger
 
 # Import our screens
 from gui.modescreen import MaterialModeScreen
-from gui.dashboard import MaterialDashboardScreen
-from logic.simulator import WindTunnelSimulator
+from gui.dashboard import MaterialDashboardScreen, GaugePool
+from gui.runbrowser import MaterialRunBrowserScreen
+from gui.overview import MaterialOverviewScreen
+from gui.governor import FrameRateGovernor
+from gui.soak import SoakTest
+from gui.layout import LayoutSource
+from logic.tunnels import build_tunnels
+from logic.calibration import DEFAULT_CALIBRATION_DIR
+from logic.exporter import RunExporter
+from logic.reports import ReportGenerator
+from logic.catalog import RunCatalog
+from logic.eventlog import EventLog
 
 class ModernWindTunnelApp(MDApp):
     """
@@ -40,8 +50,48 @@ class ModernWindTunnelApp(MDApp):
         Window.minimum_width = 800
         Window.minimum_height = 480
         
-        # Initialize simulator
-        self.simulator = WindTunnelSimulator()
+        # Structured event log, written off the UI thread; recent events
+        # are viewable on the dashboard (WINDTUNNEL_LOG adds a log file)
+        self.event_log = EventLog(path=os.environ.get('WINDTUNNEL_LOG'))
+        self.event_log.start()
+        
+        # One or more tunnels, each with its own data source, acquisition
+        # thread and processing chain (WINDTUNNEL_COUNT, default 1)
+        # WINDTUNNEL_PROCESS=1 samples each tunnel in its own process;
+        # WINDTUNNEL_CALIBRATION points at the sensor calibration files;
+        # WINDTUNNEL_MULTIRATE=1 simulates sensors streaming at their own
+        # rates, resampled onto the acquisition timebase
+        tunnel_count = max(1, int(os.environ.get('WINDTUNNEL_COUNT', '1')))
+        use_process = os.environ.get('WINDTUNNEL_PROCESS', '0') == '1'
+        calibration_dir = os.environ.get('WINDTUNNEL_CALIBRATION', DEFAULT_CALIBRATION_DIR)
+        multirate = os.environ.get('WINDTUNNEL_MULTIRATE', '0') == '1'
+        self.tunnels = build_tunnels(tunnel_count, rate_hz=100.0, use_process=use_process,
+                                     calibration_dir=calibration_dir, multirate=multirate)
+        self.dashboards = {}
+        
+        # Background export, polar reports (built in a worker process) and
+        # a searchable index of recorded runs, shared by every tunnel's
+        # recorder and triggered capture
+        self.exporter = RunExporter()
+        runs_dir = self.tunnels[0].recorder.runs_dir
+        self.reports = ReportGenerator(os.path.join(runs_dir, 'reports'))
+        self.catalog = RunCatalog(os.path.join(runs_dir, 'catalog.sqlite3'))
+        for tunnel in self.tunnels:
+            tunnel.recorder.add_listener(self.catalog.add_run)
+            tunnel.capture.recorder.add_listener(self.catalog.add_run)
+        
+        # Dashboard gauge panels, declared as data (WINDTUNNEL_LAYOUT points
+        # at a JSON layout) and built from gauges pooled across dashboards
+        self.layout_source = LayoutSource(os.environ.get('WINDTUNNEL_LAYOUT'))
+        self.gauge_pool = GaugePool()
+        
+        # Drops the frame rate while nothing on screen is changing
+        self.governor = FrameRateGovernor([tunnel.simulator for tunnel in self.tunnels])
+        
+        # WINDTUNNEL_SOAK=<cycles> runs the accelerated soak test and exits
+        # (WINDTUNNEL_SOAK_REPORT writes its metrics history as JSON)
+        self.soak_cycles = int(os.environ.get('WINDTUNNEL_SOAK', '0'))
+        self.soak_failed = False
         
         print("🚀 Modern Wind Tunnel Controller - Material Design")
         print("📱 Optimized for 7\" touchscreen (800×480)")
@@ -57,15 +107,31 @@ class ModernWindTunnelApp(MDApp):
             screen_manager = MDScreenManager()
             
             # Create mode selection screen
-            mode_screen = MaterialModeScreen(name='mode_screen')
+            multi_tunnel = len(self.tunnels) > 1
+            mode_screen = MaterialModeScreen(
+                simulation_screen='overview' if multi_tunnel else 'dashboard',
+                name='mode_screen'
+            )
             screen_manager.add_widget(mode_screen)
             
-            # Create dashboard screen
-            dashboard_screen = MaterialDashboardScreen(
-                simulator=self.simulator,
-                name='dashboard'
+            if multi_tunnel:
+                # Overview of every tunnel; dashboards are built on first tap
+                overview_screen = MaterialOverviewScreen(
+                    self.tunnels,
+                    on_select=self.open_tunnel,
+                    governor=self.governor,
+                    name='overview'
+                )
+                screen_manager.add_widget(overview_screen)
+            else:
+                screen_manager.add_widget(self.create_dashboard(0))
+            
+            # Create run browser screen
+            browser_screen = MaterialRunBrowserScreen(
+                catalog=self.catalog,
+                name='run_browser'
             )
-            screen_manager.add_widget(dashboard_screen)
+            screen_manager.add_widget(browser_screen)
             
             print("✅ Material Design interface built successfully")
             print("🎯 Ready for professional wind tunnel control")
@@ -79,8 +145,51 @@ class ModernWindTunnelApp(MDApp):
             Logger.exception("Failed to build interface")
             return None
     
+    def create_dashboard(self, index):
+        """Full dashboard for one tunnel"""
+        tunnel = self.tunnels[index]
+        multi_tunnel = len(self.tunnels) > 1
+        return MaterialDashboardScreen(
+            simulator=tunnel.simulator,
+            acquisition=tunnel.acquisition,
+            airspeed_hold=tunnel.airspeed_hold,
+            alarm_engine=tunnel.alarm_engine,
+            statistics=tunnel.statistics,
+            recorder=tunnel.recorder,
+            exporter=self.exporter,
+            reports=self.reports,
+            governor=self.governor,
+            event_log=self.event_log,
+            commands=tunnel.commands,
+            spectrum=tunnel.spectrum,
+            derived=tunnel.derived,
+            tare=tunnel.tare,
+            capture=tunnel.capture,
+            live_export=tunnel.live_export,
+            layout=self.layout_source,
+            gauge_pool=self.gauge_pool,
+            tunnel_name=tunnel.name if multi_tunnel else None,
+            back_screen='overview' if multi_tunnel else 'mode_screen',
+            name=f'dashboard_{index}' if multi_tunnel else 'dashboard'
+        )
+    
+    def open_tunnel(self, index):
+        """Show a tunnel's dashboard, creating it on first use"""
+        if index not in self.dashboards:
+            self.dashboards[index] = self.create_dashboard(index)
+            self.root.add_widget(self.dashboards[index])
+        self.root.current = self.dashboards[index].name
+    
     def on_start(self):
         """Called when application starts"""
+        for tunnel in self.tunnels:
+            tunnel.start()
+        self.catalog.sync_in_background(self.tunnels[0].recorder.runs_dir)
+        self.governor.start()
+        if self.soak_cycles:
+            SoakTest(self, cycles=self.soak_cycles,
+                     report_path=os.environ.get('WINDTUNNEL_SOAK_REPORT')).start()
+        
         print("🌟 === Material Design Wind Tunnel Controller Started ===")
         print("💫 Experience professional Material Design interface")
         print("📐 Perfect for 800×480 touchscreen • Optimized layouts")
@@ -89,8 +198,18 @@ class ModernWindTunnelApp(MDApp):
     def on_stop(self):
         """Called when application stops"""
         # Clean shutdown
-        if hasattr(self, 'simulator'):
-            self.simulator.stop_simulation()
+        if hasattr(self, 'governor'):
+            self.governor.stop()
+        for tunnel in getattr(self, 'tunnels', []):
+            tunnel.stop()
+        if hasattr(self, 'exporter'):
+            self.exporter.cancel()
+        if hasattr(self, 'reports'):
+            self.reports.cancel()
+        if hasattr(self, 'catalog'):
+            self.catalog.close()
+        if hasattr(self, 'event_log'):
+            self.event_log.stop()
         
         print("🛑 === Material Design Controller Stopped ===")
         print("🙏 Thank you for using our professional control system!")
@@ -101,6 +220,8 @@ def main():
         # Create and run the app
         app = ModernWindTunnelApp()
         app.run()
+        if app.soak_failed:
+            sys.exit(1)
         
     except KeyboardInterrupt:
         print("\n⚠️  Application interrupted by user")